@@ -6,7 +6,7 @@ import os, io, zipfile, uuid, time, tempfile, logging
 
 from converters.multi_format_converter import MultiFormatConverter, get_supported_formats
 from utils.file_utils import ensure_dirs
-from converters.batch_processor import BatchProcessor, JobStatus, get_batch_processor
+from converters.batch_processor import BatchProcessor, JobStatus, QueueFullError, get_batch_processor
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
@@ -48,6 +48,7 @@ def root():
             "web_convert": "/convert",
             "batch_convert": "/api/batch-convert",
             "progress": "/api/progress",
+            "cancel": "/api/cancel",
             "download": "/api/download"
         },
         "usage": {
@@ -172,6 +173,14 @@ def batch_convert():
         
         return jsonify({'job_id': job_id, 'message': '배치 변환이 시작되었습니다.'})
         
+    except QueueFullError as e:
+        # 대기열이 가득 차면 거절하고 다시 시도할 시점을 알려줌
+        response = jsonify({'error': str(e), 'retry_after': e.retry_after})
+        response.status_code = 429
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         logger.error(f"배치 변환 오류: {str(e)}")
         return jsonify({'error': f'배치 변환 중 오류가 발생했습니다: {str(e)}'}), 500
@@ -185,6 +194,12 @@ def get_progress(job_id):
         logger.error(f"진행률 확인 오류: {str(e)}")
         return jsonify({'error': f'진행률 확인 중 오류가 발생했습니다: {str(e)}'}), 500
 
+@app.route('/api/cancel/<job_id>', methods=['POST'])
+def cancel_batch_job(job_id):
+    if not batch_processor.cancel_job(job_id):
+        return jsonify({'error': '작업을 찾을 수 없거나 취소할 수 없습니다.'}), 404
+    return jsonify({'message': '작업이 취소되었습니다.'})
+
 @app.route('/api/download/<job_id>')
 def download_batch_result(job_id):
     try:
@@ -1,5 +1,18 @@
 """
 Batch processing module for handling multiple image conversions
+
+Files from every batch job go through one shared, bounded scheduler:
+- a fixed pool of worker threads (BATCH_WORKERS) converts files in parallel,
+  so one large batch uses every worker and ten batches do not mean ten threads
+- jobs take turns file by file (round-robin), so a large batch cannot starve small ones
+- at most BATCH_MAX_QUEUED_FILES files may wait; beyond that start_batch_job raises
+  QueueFullError with a retry_after estimate (the API answers 429 + Retry-After)
+- cancel_job drops a job's waiting files; files already converting finish but are discarded
+- an unexpected error (e.g. writing the result ZIP) fails only that job; the worker keeps running
+
+Environment variables
+    BATCH_WORKERS: number of worker threads (default: CPU count, max 4)
+    BATCH_MAX_QUEUED_FILES: files allowed to wait across all jobs (default: 200)
 """
 
 import os
@@ -9,16 +22,38 @@ import uuid
 import zipfile
 import tempfile
 import shutil
+from collections import deque
 from enum import Enum
 from typing import Dict, List, Optional, Callable
 from dataclasses import dataclass, field
 from .multi_format_converter import MultiFormatConverter
 
+def _env_int(key: str, default: int) -> int:
+    try:
+        v = int(os.environ.get(key, "0"))
+    except ValueError:
+        v = 0
+    return v if v > 0 else default
+
+
+BATCH_WORKERS = _env_int("BATCH_WORKERS", min(4, os.cpu_count() or 1))
+BATCH_MAX_QUEUED_FILES = _env_int("BATCH_MAX_QUEUED_FILES", 200)
+
+
+class QueueFullError(Exception):
+    """Raised when a new batch would exceed the shared queue capacity"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class JobStatus(Enum):
     PENDING = "pending"
     PROCESSING = "processing"
     COMPLETED = "completed"
     FAILED = "failed"
+    CANCELLED = "cancelled"
 
 @dataclass
 class BatchJob:
@@ -37,13 +72,26 @@ class BatchJob:
     resize_factor: float = 1.0
     preserve_transparency: bool = False
     result_zip_path: Optional[str] = None
+    pending: deque = field(default_factory=deque)  # files not yet handed to a worker
+    in_flight: int = 0                             # files being converted right now
+    outputs: List[str] = field(default_factory=list)
 
 class BatchProcessor:
-    def __init__(self):
+    def __init__(self, max_workers: int = None, max_queued_files: int = None):
         self.jobs: Dict[str, BatchJob] = {}
         self.lock = threading.Lock()
         self.converter = MultiFormatConverter()
         self.temp_dir = tempfile.mkdtemp(prefix='batch_convert_')
+
+        # Shared scheduler state (all guarded by self.lock)
+        self.max_workers = max_workers or BATCH_WORKERS
+        self.max_queued_files = max_queued_files or BATCH_MAX_QUEUED_FILES
+        self._ready = deque()          # job ids with waiting files, in round-robin order
+        self._queued_files = 0         # waiting files across all jobs
+        self._avg_file_seconds = 1.0   # moving average used for Retry-After
+        self._work_available = threading.Condition(self.lock)
+        self._workers: List[threading.Thread] = []
+        self._running = True
     
     def create_job(self, files: List[str]) -> str:
         """Create a new batch job"""
@@ -64,35 +112,31 @@ class BatchProcessor:
         with self.lock:
             return self.jobs.get(job_id)
     
-    def update_job_progress(self, job_id: str, completed_file: str = None, failed_file: str = None, error: str = None):
-        """Update job progress"""
+    def update_job_progress(self, job_id: str, completed_file: str = None, failed_file: str = None, error: str = None) -> bool:
+        """Update job progress; returns True once every file of the job has been accounted for"""
         with self.lock:
-            job = self.jobs.get(job_id)
-            if not job:
-                return
-            
-            if completed_file:
-                job.completed_files.append(completed_file)
-            
-            if failed_file:
-                job.failed_files.append(failed_file)
-                if error:
-                    job.error_message = error
-            
-            job.progress = len(job.completed_files) + len(job.failed_files)
-            job.updated_at = time.time()
-            
-            # Update status
-            if job.progress >= job.total_files:
-                if len(job.failed_files) == 0:
-                    job.status = JobStatus.COMPLETED
-                elif len(job.completed_files) == 0:
-                    job.status = JobStatus.FAILED
-                else:
-                    job.status = JobStatus.COMPLETED  # Partial success
-            elif job.progress > 0:
-                job.status = JobStatus.PROCESSING
-    
+            return self._record_progress(job_id, completed_file, failed_file, error)
+
+    def _record_progress(self, job_id: str, completed_file: str = None, failed_file: str = None, error: str = None) -> bool:
+        job = self.jobs.get(job_id)
+        if not job:
+            return False
+
+        if completed_file:
+            job.completed_files.append(completed_file)
+
+        if failed_file:
+            job.failed_files.append(failed_file)
+            if error:
+                job.error_message = error
+
+        job.progress = len(job.completed_files) + len(job.failed_files)
+        job.updated_at = time.time()
+
+        if job.status in (JobStatus.PENDING, JobStatus.PROCESSING) and job.progress > 0:
+            job.status = JobStatus.PROCESSING
+        return job.progress >= job.total_files
+
     def start_job(self, job_id: str):
         """Mark job as started"""
         with self.lock:
@@ -109,23 +153,54 @@ class BatchProcessor:
         with self.lock:
             jobs_to_remove = []
             for job_id, job in self.jobs.items():
-                if current_time - job.created_at > max_age_seconds:
+                # Jobs that still have files waiting or converting are kept
+                if current_time - job.created_at > max_age_seconds and not job.pending and not job.in_flight:
                     jobs_to_remove.append(job_id)
             
             for job_id in jobs_to_remove:
                 del self.jobs[job_id]
 
+    def _retry_after(self, extra_files: int) -> int:
+        """Seconds until roughly extra_files more files would fit in the queue (caller holds self.lock)"""
+        overflow = self._queued_files + extra_files - self.max_queued_files
+        seconds = overflow * self._avg_file_seconds / self.max_workers
+        return int(max(1, min(300, round(seconds))))
+
+    def _ensure_workers(self):
+        """Start the worker threads on first use (caller holds self.lock)"""
+        if self._workers:
+            return
+        for i in range(self.max_workers):
+            worker = threading.Thread(target=self._worker, name=f"BatchWorker-{i}", daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
     def start_batch_job(self, files, output_format='webp', quality='medium', resize_factor=1.0, preserve_transparency=False):
-        """Start a new batch conversion job"""
+        """Queue a new batch conversion job (raises QueueFullError when the shared queue is full)"""
+        files = list(files)
+        with self.lock:
+            if len(files) > self.max_queued_files:
+                raise ValueError(f'한 번에 최대 {self.max_queued_files}개 파일까지 변환할 수 있습니다.')
+            if self._queued_files + len(files) > self.max_queued_files:
+                raise QueueFullError('변환 대기열이 가득 찼습니다. 잠시 후 다시 시도해 주세요.',
+                                     self._retry_after(len(files)))
+            # Reserve the slots now so concurrent requests cannot all pass the check while saving
+            self._queued_files += len(files)
+
         # Save uploaded files to temp directory
         temp_files = []
         job_temp_dir = os.path.join(self.temp_dir, str(uuid.uuid4()))
-        os.makedirs(job_temp_dir, exist_ok=True)
-        
-        for file in files:
-            temp_path = os.path.join(job_temp_dir, file.filename)
-            file.save(temp_path)
-            temp_files.append(temp_path)
+        try:
+            os.makedirs(job_temp_dir, exist_ok=True)
+            for file in files:
+                temp_path = os.path.join(job_temp_dir, file.filename)
+                file.save(temp_path)
+                temp_files.append(temp_path)
+        except Exception:
+            with self.lock:
+                self._queued_files -= len(files)
+            shutil.rmtree(job_temp_dir, ignore_errors=True)
+            raise
         
         # Create job
         job_id = str(uuid.uuid4())
@@ -136,65 +211,162 @@ class BatchProcessor:
             output_format=output_format,
             quality=quality,
             resize_factor=resize_factor,
-            preserve_transparency=preserve_transparency
+            preserve_transparency=preserve_transparency,
+            pending=deque(temp_files)
         )
         
+        # Hand the files to the shared scheduler (their slots were reserved above)
         with self.lock:
             self.jobs[job_id] = job
-        
-        # Start processing in background thread
-        thread = threading.Thread(target=self._process_batch_job, args=(job_id,))
-        thread.daemon = True
-        thread.start()
+            if job.pending:
+                self._ready.append(job_id)
+                self._ensure_workers()
+                self._work_available.notify(len(job.pending))
         
         return job_id
-    
-    def _process_batch_job(self, job_id):
-        """Process batch job in background"""
-        job = self.get_job(job_id)
-        if not job:
-            return
-        
-        self.start_job(job_id)
-        
-        # Create output directory for this job
-        output_dir = os.path.join(self.temp_dir, f'output_{job_id}')
-        os.makedirs(output_dir, exist_ok=True)
-        
-        converted_files = []
-        
-        for file_path in job.files:
+
+    def _next_file(self):
+        """Block until a file is available; returns (job, file_path) or None on shutdown"""
+        with self.lock:
+            while self._running:
+                if self._ready:
+                    job_id = self._ready.popleft()
+                    job = self.jobs.get(job_id)
+                    if not job or not job.pending:
+                        continue
+                    file_path = job.pending.popleft()
+                    self._queued_files -= 1
+                    job.in_flight += 1
+                    if job.pending:
+                        self._ready.append(job_id)  # round-robin: back of the line
+                    if job.status == JobStatus.PENDING:
+                        job.status = JobStatus.PROCESSING
+                        job.updated_at = time.time()
+                    return job, file_path
+                self._work_available.wait()
+            return None
+
+    def _worker(self):
+        """Worker thread main loop: convert one file at a time from any job"""
+        while True:
+            item = self._next_file()
+            if item is None:
+                return
+            job, file_path = item
             try:
-                # Convert file
-                output_path = self.converter.convert_image(
-                    input_path=file_path,
-                    output_format=job.output_format,
-                    quality=job.quality,
-                    resize_factor=job.resize_factor,
-                    preserve_transparency=job.preserve_transparency,
-                    output_dir=output_dir
-                )
-                
-                if output_path and os.path.exists(output_path):
-                    converted_files.append(output_path)
-                    self.update_job_progress(job_id, completed_file=os.path.basename(file_path))
-                else:
-                    self.update_job_progress(job_id, failed_file=os.path.basename(file_path), error="변환 실패")
-                    
+                self._process_file(job, file_path)
             except Exception as e:
-                self.update_job_progress(job_id, failed_file=os.path.basename(file_path), error=str(e))
-        
-        # Create ZIP file with converted images
-        if converted_files:
-            zip_path = os.path.join(self.temp_dir, f'batch_result_{job_id}.zip')
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for file_path in converted_files:
-                    zipf.write(file_path, os.path.basename(file_path))
-            
-            # Update job with zip path
-            with self.lock:
-                if job_id in self.jobs:
-                    self.jobs[job_id].result_zip_path = zip_path
+                # Keep the worker alive; the job cannot be finished reliably, so fail it
+                print(f"Worker error: {e}")
+                self._fail_job(job, str(e))
+
+    def _fail_job(self, job: BatchJob, message: str):
+        """Mark a job failed and drop its waiting files"""
+        with self.lock:
+            if job.status not in (JobStatus.PENDING, JobStatus.PROCESSING):
+                return
+            self._queued_files -= len(job.pending)
+            job.pending.clear()
+            try:
+                self._ready.remove(job.job_id)
+            except ValueError:
+                pass
+            job.status = JobStatus.FAILED
+            job.error_message = message
+            job.updated_at = time.time()
+
+    def _process_file(self, job: BatchJob, file_path: str):
+        output_dir = os.path.join(self.temp_dir, f'output_{job.job_id}')
+        name = os.path.basename(file_path)
+        started = time.perf_counter()
+        output_path, error = None, None
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+            # convert_image returns a list of output paths (empty on failure)
+            outputs = self.converter.convert_image(
+                input_path=file_path,
+                output_format=job.output_format,
+                quality=job.quality,
+                resize_factor=job.resize_factor,
+                preserve_transparency=job.preserve_transparency,
+                output_dir=output_dir
+            )
+            output_path = next((p for p in outputs or [] if os.path.exists(p)), None)
+            if output_path is None:
+                error = "변환 실패"
+        except Exception as e:
+            error = str(e)
+
+        with self.lock:
+            elapsed = time.perf_counter() - started
+            self._avg_file_seconds = 0.8 * self._avg_file_seconds + 0.2 * elapsed
+            job.in_flight -= 1
+            if job.status == JobStatus.CANCELLED:
+                return
+            if output_path:
+                job.outputs.append(output_path)
+                done = self._record_progress(job.job_id, completed_file=name)
+            else:
+                done = self._record_progress(job.job_id, failed_file=name, error=error)
+        if done:
+            self._finish_job(job)
+
+    def _finish_job(self, job: BatchJob):
+        """Zip the converted files, then publish the final status"""
+        zip_path = None
+        if job.outputs:
+            zip_path = os.path.join(self.temp_dir, f'batch_result_{job.job_id}.zip')
+            try:
+                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                    for file_path in job.outputs:
+                        zipf.write(file_path, os.path.basename(file_path))
+            except Exception as e:
+                try:
+                    os.remove(zip_path)
+                except OSError:
+                    pass
+                self._fail_job(job, f'ZIP 생성 실패: {e}')
+                return
+
+        with self.lock:
+            if job.status == JobStatus.CANCELLED:
+                return
+            job.result_zip_path = zip_path
+            # Partial success still counts as completed
+            job.status = JobStatus.COMPLETED if job.completed_files else JobStatus.FAILED
+            job.updated_at = time.time()
+
+    def cancel_job(self, job_id: str) -> bool:
+        """Cancel a queued or running job; files already converting are discarded"""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if not job or job.status not in (JobStatus.PENDING, JobStatus.PROCESSING):
+                return False
+            self._queued_files -= len(job.pending)
+            job.pending.clear()
+            try:
+                self._ready.remove(job_id)
+            except ValueError:
+                pass
+            job.status = JobStatus.CANCELLED
+            job.updated_at = time.time()
+            return True
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """Jobs served before this job's next file (0 = next), None when it has no waiting files"""
+        with self.lock:
+            try:
+                return self._ready.index(job_id)
+            except ValueError:
+                return None
+
+    def shutdown(self):
+        """Stop the worker threads after their current file"""
+        with self.lock:
+            self._running = False
+            self._work_available.notify_all()
+        for worker in self._workers:
+            worker.join(timeout=5.0)
     
     def get_job_status(self, job_id):
         """Get job status for API response"""
@@ -211,6 +383,8 @@ class BatchProcessor:
             'total_files': job.total_files,
             'completed_files': len(job.completed_files),
             'failed_files': len(job.failed_files),
+            'queued_files': len(job.pending),
+            'queue_position': self.queue_position(job_id),
             'error_message': job.error_message
         }
     
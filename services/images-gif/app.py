@@ -104,15 +104,6 @@ def vite_client():
     # Vite 개발 서버용 더미 응답
     return "", 404
 
-def _zip_paths(paths):
-    zip_buffer = io.BytesIO()
-    with zipfile.ZipFile(zip_buffer, 'w', zipfile.ZIP_DEFLATED) as zip_file:
-        for path in paths:
-            if os.path.exists(path):
-                zip_file.write(path, os.path.basename(path))
-    zip_buffer.seek(0)
-    return zip_buffer
-
 def _flag(v, default=False):
     if v is None:
         return default
@@ -337,7 +328,9 @@ def api_extract_frames():
                 zip_filename = f"frames_{file_id}.zip"
                 zip_path = os.path.join(OUTPUT_DIR, zip_filename)
                 
-                with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                # PNG/JPEG 등 이미 압축된 프레임은 무압축 저장 (deflate해도 줄지 않고 CPU만 소모)
+                compression = zipfile.ZIP_STORED if output_format in ("PNG", "JPG", "JPEG", "WEBP", "GIF") else zipfile.ZIP_DEFLATED
+                with zipfile.ZipFile(zip_path, 'w', compression) as zipf:
                     for frame_path in extracted_files:
                         if os.path.exists(frame_path):
                             zipf.write(frame_path, os.path.basename(frame_path))
@@ -195,7 +195,8 @@ class BatchProcessor:
             zip_filename = f"{job.job_id}_results.zip"
             zip_path = os.path.join(job.output_dir, zip_filename)
             
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            # GIF는 이미 압축된 형식이라 무압축 저장 (deflate해도 줄지 않고 CPU만 소모)
+            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zipf:
                 for task in job.tasks:
                     if task.status == JobStatus.COMPLETED and os.path.exists(task.output_path):
                         # ZIP 내에서의 파일명은 원본 파일명 기반으로 생성
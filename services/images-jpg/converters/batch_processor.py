@@ -1,6 +1,12 @@
 """
 배치 이미지 변환 처리 모듈
 대량 파일 처리를 위한 큐 기반 병렬 처리 시스템
+
+실행 백엔드 (BatchProcessor(backend=...) 또는 환경 변수 BATCH_BACKEND)
+    thread : 워커 스레드가 직접 변환 (PIL 인코딩/LANCZOS 리사이즈/rawpy·cairosvg 디코딩이 GIL을 잡아 1코어 근처에서 포화)
+    process: 워커 스레드는 큐/상태 관리(self.lock)만 하고 변환은 프로세스 풀에서 실행
+             (자식에게는 파일 경로와 옵션만 보내고 결과 파일 경로만 돌려받음)
+    auto   : CPU가 2개 이상이면 process, 아니면 thread (기본값)
 """
 
 import os
@@ -14,10 +20,34 @@ from typing import List, Dict, Optional, Callable
 from dataclasses import dataclass, asdict
 from enum import Enum
 import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 from .image_to_jpg import image_to_jpg, _is_supported_image
 
 
+BATCH_BACKEND = os.environ.get("BATCH_BACKEND", "auto")
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """요청/환경 변수 값 → "thread" | "process" """
+    backend = (backend or BATCH_BACKEND or "auto").strip().lower()
+    if backend in ("thread", "process"):
+        return backend
+    return "process" if (os.cpu_count() or 1) > 1 else "thread"
+
+
+def _convert_file(file_path: str, output_dir: str, quality: str, resize_factor: float) -> List[str]:
+    """파일 1개 변환 (process 백엔드에서는 자식 프로세스에서 실행되므로 경로/옵션만 주고받음)"""
+    return image_to_jpg(
+        file_path,
+        output_dir,
+        quality=quality,
+        resize_factor=resize_factor
+    )
+
+
 class JobStatus(Enum):
     PENDING = "pending"
     PROCESSING = "processing"
@@ -85,14 +115,17 @@ class BatchJob:
 class BatchProcessor:
     """배치 이미지 변환 처리기"""
     
-    def __init__(self, max_workers: int = 4, max_queue_size: int = 1000):
+    def __init__(self, max_workers: int = 4, max_queue_size: int = 1000, backend: Optional[str] = None):
         self.max_workers = max_workers
         self.max_queue_size = max_queue_size
+        self.backend = resolve_backend(backend)
         self.jobs: Dict[str, BatchJob] = {}
         self.task_queue = queue.Queue(maxsize=max_queue_size)
         self.workers = []
         self.running = False
         self.lock = threading.Lock()
+        self._pool = None
+        self._pool_lock = threading.Lock()
         
         # 워커 스레드 시작
         self._start_workers()
@@ -135,12 +168,7 @@ class BatchProcessor:
                 
                 # 실제 변환 작업 수행
                 try:
-                    result_files = image_to_jpg(
-                        task.file_path,
-                        job.output_dir,
-                        quality=job.quality,
-                        resize_factor=job.resize_factor
-                    )
+                    result_files = self._convert(task.file_path, job.output_dir, job.quality, job.resize_factor)
                     
                     with self.lock:
                         task.status = JobStatus.COMPLETED
@@ -176,13 +204,38 @@ class BatchProcessor:
                 print(f"Worker error: {e}")
                 continue
     
+    def _get_pool(self) -> ProcessPoolExecutor:
+        with self._pool_lock:
+            if self._pool is None:
+                # Flask 스레드가 떠 있는 프로세스에서 fork하면 락 상태가 복제될 수 있어 spawn 사용
+                ctx = multiprocessing.get_context("spawn")
+                workers = max(1, min(self.max_workers, os.cpu_count() or 1))
+                self._pool = ProcessPoolExecutor(max_workers=workers, mp_context=ctx)
+            return self._pool
+
+    def _convert(self, file_path: str, output_dir: str, quality: str, resize_factor: float) -> List[str]:
+        """선택된 백엔드로 파일 1개 변환 (호출한 워커 스레드는 결과가 나올 때까지 대기)"""
+        if self.backend != "process":
+            return _convert_file(file_path, output_dir, quality, resize_factor)
+        pool = self._get_pool()
+        try:
+            return pool.submit(_convert_file, file_path, output_dir, quality, resize_factor).result()
+        except BrokenProcessPool:
+            # 자식 프로세스가 비정상 종료(메모리 부족 등)하면 풀을 버리고 다음 작업에서 새로 만듦
+            with self._pool_lock:
+                if self._pool is pool:
+                    self._pool = None
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise RuntimeError("변환 프로세스가 비정상 종료되었습니다.")
+
     def _create_zip_file(self, job: BatchJob):
         """변환된 파일들을 ZIP으로 압축"""
         try:
             zip_filename = f"converted_images_{job.job_id}.zip"
             zip_path = os.path.join(job.output_dir, zip_filename)
             
-            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            # JPG는 이미 압축된 형식이라 무압축 저장 (deflate해도 줄지 않고 CPU만 소모)
+            with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_STORED) as zipf:
                 for task in job.tasks:
                     if task.status == JobStatus.COMPLETED:
                         # 변환된 JPG 파일 경로
@@ -333,6 +386,11 @@ class BatchProcessor:
         for worker in self.workers:
             worker.join(timeout=5.0)
 
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+
 
 # 전역 배치 처리기 인스턴스
 _batch_processor = None
@@ -1,6 +1,7 @@
 from PIL import Image
 import os, fitz
 from utils.file_utils import parse_pages
+from converters.pixel_ops import white_rgb_to_alpha
 
 def _parse_hex_color(hex_str: str):
     if not hex_str:
@@ -11,18 +12,8 @@ def _parse_hex_color(hex_str: str):
 
 # 투명 제거 유틸 (JPG에서는 사용하지 않지만 호환성 위해 유지)
 def _remove_white_to_alpha(img: Image.Image, white_threshold: int = 250) -> Image.Image:
-    if img.mode != 'RGBA':
-        img = img.convert('RGBA')
-    datas = img.getdata()
-    newData = []
-    for item in datas:
-        r, g, b, a = item
-        if r >= white_threshold and g >= white_threshold and b >= white_threshold:
-            newData.append((255, 255, 255, 0))
-        else:
-            newData.append((r, g, b, a))
-    img.putdata(newData)
-    return img
+    # R, G, B 모두 임계값 이상이면 (255, 255, 255, 0) - 픽셀 루프 대신 NumPy로 한 번에
+    return white_rgb_to_alpha(img, white_threshold)
 
 # Pixmap을 RGBA로 변환 (WEBP/PNG용이었으나 유지)
 def _pix_to_rgba(pix):
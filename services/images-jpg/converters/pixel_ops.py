@@ -0,0 +1,137 @@
+"""
+픽셀 마스크 연산 (흰색→투명, 컬러키, 임계값 마스크)
+
+서비스마다 gray.point(lambda p: ...)로 임계값 마스크를 만들고, 이미지를 한 번 더 복사한 뒤 putalpha 하거나
+getdata()를 파이썬 리스트로 돌며 putdata 하던 코드를 한곳에 모았습니다.
+
+- 임계값/일치 마스크: 256칸 룩업 테이블을 미리 만들어 캐시하고 Image.point에 그대로 넘김
+  (람다를 256번 호출해 테이블을 다시 만드는 일이 없음, 픽셀 처리는 PIL C 코드)
+- 흰색→투명(밝기 기준): convert("L") + 룩업 테이블 + putalpha. PIL이 람다를 256번만 부르므로 속도는 기존과 같고,
+  copy=False면 원본에 바로 알파를 넣어 직접 소유한 이미지는 페이지 전체 복사 1회를 줄임
+  (pix_bridge로 감싼 읽기 전용 이미지는 putalpha 때 PIL이 한 번 복사하므로 기존과 같음)
+- 흰색→투명(R,G,B 모두 기준) / 컬러키: NumPy로 버퍼 전체를 한 번에 처리
+  (NumPy가 없으면 흰색→투명은 PIL 채널 연산으로 대체, 컬러키는 ImportError)
+
+pixel_ops.py는 pdf-png / pdf-gif / pdf-image / images-png / images-jpg에 같은 내용으로 들어 있습니다.
+"""
+from functools import lru_cache
+
+from PIL import Image, ImageChops
+
+try:
+    import numpy as np
+except ImportError:  # NumPy가 없는 서비스는 PIL 룩업 테이블 경로만 사용
+    np = None
+
+if np is not None:
+    _CLEAR_WHITE = np.frombuffer(bytes((255, 255, 255, 0)), dtype=np.uint32)[0]  # 투명한 흰색 (바이트 순서 무관)
+
+
+@lru_cache(maxsize=64)
+def threshold_lut(threshold: int, high: int = 255, low: int = 0) -> tuple:
+    """값 >= threshold 이면 high, 아니면 low 인 256칸 룩업 테이블"""
+    t = max(0, min(256, int(threshold)))
+    return (low,) * t + (high,) * (256 - t)
+
+
+@lru_cache(maxsize=64)
+def equal_lut(value: int, high: int = 255, low: int = 0) -> tuple:
+    """값 == value 이면 high, 아니면 low 인 256칸 룩업 테이블"""
+    return tuple(high if v == value else low for v in range(256))
+
+
+def threshold_mask(gray: Image.Image, threshold: int, high: int = 255, low: int = 0) -> Image.Image:
+    """L 이미지 → 임계값 마스크 (gray.point(lambda p: high if p >= threshold else low)와 같은 결과)"""
+    return gray.point(threshold_lut(threshold, high, low))
+
+
+def equal_mask(gray: Image.Image, value: int, high: int = 255, low: int = 0) -> Image.Image:
+    """L 이미지 → 특정 값 일치 마스크"""
+    return gray.point(equal_lut(value, high, low))
+
+
+def white_to_alpha(rgba: Image.Image, white_threshold: int = 250, copy: bool = True) -> Image.Image:
+    """
+    밝기(L)가 white_threshold 이상인 픽셀(종이 배경)은 알파 0, 나머지는 255 (기존 알파는 덮어씀)
+    copy=False면 rgba에 바로 알파를 넣고 그대로 반환
+    """
+    alpha = threshold_mask(rgba.convert("L"), white_threshold, high=0, low=255)
+    out = rgba.copy() if copy else rgba
+    out.putalpha(alpha)
+    return out
+
+
+def white_rgb_to_alpha(img: Image.Image, white_threshold: int = 250) -> Image.Image:
+    """R, G, B가 모두 white_threshold 이상인 픽셀은 (255, 255, 255, 0), 나머지는 그대로 (새 RGBA 이미지 반환)"""
+    if img.mode != "RGBA":
+        img = img.convert("RGBA")
+    if np is None:
+        r, g, b, _ = img.split()
+        darkest = ImageChops.darker(ImageChops.darker(r, g), b)
+        out = img.copy()
+        out.paste((255, 255, 255, 0), mask=threshold_mask(darkest, white_threshold))
+        return out
+
+    arr = np.array(img)
+    darkest = np.minimum(arr[..., 0], arr[..., 1])
+    np.minimum(darkest, arr[..., 2], out=darkest)
+    # 픽셀(RGBA 4바이트)을 uint32 하나로 보고 한 번에 대입 (채널별 대입보다 2~3배 빠름)
+    pixels = arr.view(np.uint32).reshape(arr.shape[:2])
+    pixels[darkest >= white_threshold] = _CLEAR_WHITE
+    return Image.fromarray(arr, "RGBA")
+
+
+def _per_channel(v, default):
+    """정수 하나 또는 (r, g, b) 튜플을 채널별 3개 값으로 정규화"""
+    if v is None:
+        v = default
+    if isinstance(v, (tuple, list)):
+        return tuple(max(0, min(255, int(c))) for c in (list(v) * 3)[:3])
+    return (max(0, min(255, int(v))),) * 3
+
+
+@lru_cache(maxsize=32)
+def _colorkey_luts(key_rgb, tol, softness):
+    """
+    채널별 룩업 테이블 생성
+    - lut[c][v]: 값 v가 키 색상에서 허용 오차를 넘어선 정도(0..softness)
+    - alpha_lut[e]: 넘어선 정도 e에 대한 알파 (0이면 완전 투명)
+    """
+    v = np.arange(256, dtype=np.int16)
+    cap = max(1, softness)
+    luts = np.empty((3, 256), dtype=np.uint8)
+    for c in range(3):
+        luts[c] = np.clip(np.abs(v - key_rgb[c]) - tol[c], 0, cap)
+    if softness <= 0:
+        alpha_lut = np.array([0, 255], dtype=np.uint8)
+    else:
+        alpha_lut = np.round(np.arange(cap + 1) * (255.0 / cap)).astype(np.uint8)
+    return luts, alpha_lut
+
+
+def colorkey_alpha(img: Image.Image, key_rgb=(255, 255, 255), tol=10, softness: int = 0) -> Image.Image:
+    """
+    컬러키 투명화 (RGBA 이미지에 바로 알파를 넣고 반환)
+
+    tol: 허용 오차 (정수 또는 채널별 (r, g, b) 튜플)
+    softness: 0이면 허용 오차 안쪽만 완전 투명, >0이면 허용 오차 바깥 softness 구간에서
+              알파를 0→255로 선형 증가시켜 가장자리를 부드럽게 처리
+    기존 알파는 보존합니다(결과 알파 = min(기존 알파, 컬러키 알파)).
+    """
+    if np is None:
+        raise ImportError("numpy is required for colorkey_alpha")
+    key = _per_channel(key_rgb, 255)
+    tols = _per_channel(tol, 10)
+    softness = max(0, min(255, int(softness or 0)))
+    luts, alpha_lut = _colorkey_luts(key, tols, softness)
+
+    arr = np.asarray(img)
+    # 채널별 초과량의 최댓값 = 키 색상과의 (허용 오차 적용) 체비쇼프 거리
+    excess = luts[0][arr[..., 0]]
+    np.maximum(excess, luts[1][arr[..., 1]], out=excess)
+    np.maximum(excess, luts[2][arr[..., 2]], out=excess)
+    alpha = alpha_lut[excess]
+    np.minimum(alpha, arr[..., 3], out=alpha)
+    del arr, excess
+    img.putalpha(Image.fromarray(alpha, "L"))
+    return img
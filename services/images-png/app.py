@@ -130,14 +130,6 @@ def vite_client():
     # Vite 개발 서버 관련 요청 무시
     return '', 404
 
-def _zip_paths(paths):
-    buf = io.BytesIO()
-    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
-        for p in paths:
-            z.write(p, arcname=os.path.basename(p))
-    buf.seek(0)
-    return buf
-
 def _flag(v, default=False):
     if v is None:
         return default
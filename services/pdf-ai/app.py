@@ -7,6 +7,7 @@ from flask import Flask, request, jsonify, send_file, redirect
 from flask_cors import CORS
 from werkzeug.exceptions import HTTPException, NotFound, MethodNotAllowed
 import fitz  # PyMuPDF
+from job_store import create_job_store
 
 app = Flask(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -44,7 +45,7 @@ os.makedirs(UPLOADS_DIR, exist_ok=True)
 os.makedirs(OUTPUTS_DIR, exist_ok=True)
 
 executor = ThreadPoolExecutor(max_workers=2)
-JOBS = {}
+JOBS = create_job_store(BASE_DIR)
 
 def safe_move(src: str, dst: str):
     os.makedirs(os.path.dirname(dst), exist_ok=True)
@@ -108,10 +109,7 @@ def send_download_memory(path: str, download_name: str, ctype: str):
     return resp
 
 def set_progress(job_id, p, msg=None):
-    info = JOBS.setdefault(job_id, {})
-    info["progress"] = int(p)
-    if msg is not None:
-        info["message"] = msg
+    JOBS.set_progress(job_id, p, msg)
 
 def parse_page_range(expr: str, page_count: int) -> list[int]:
     """
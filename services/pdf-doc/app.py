@@ -1,3 +1,6 @@
+import time
+_IMPORT_STARTED = time.perf_counter()  # 모듈 로드 시작 시각 (/health의 startup_seconds 기준)
+
 from flask import Flask, request, render_template, send_file, flash, redirect, url_for, jsonify
 from flask_cors import CORS
 from concurrent.futures import ThreadPoolExecutor
@@ -6,26 +9,18 @@ import os
 import shutil
 import tempfile
 from werkzeug.utils import secure_filename
-from pdf2image import convert_from_path
-from pptx import Presentation
-from pptx.util import Inches
 import io
-from PIL import Image
 import json
 from dotenv import load_dotenv
-from docx import Document
-from docx.shared import Pt, Inches as DocxInches
-import subprocess
-import platform
-import pytesseract
-import cv2
-import numpy as np
-import fitz  # PyMuPDF
+import importlib
+import threading
 import re
 import urllib.parse
 from typing import List, Tuple, Dict, Any
-from pdf2docx import Converter
 import logging
+from job_store import create_job_store
+from result_cache import create_result_cache, save_upload_hashed
+import docx_parallel  # pdf2docx 페이지 구간 병렬 변환 (무거운 모듈은 사용 시 로드)
 
 # 환경 변수 로드
 load_dotenv()
@@ -64,7 +59,8 @@ app.config["MAX_CONTENT_LENGTH"] = max_mb * 1024 * 1024
 
 # 비동기 처리를 위한 전역 변수
 executor = ThreadPoolExecutor(max_workers=2)
-JOBS = {}  # job_id -> {"status": "pending|done|error", "path": "", "name": "", "ctype": "", "error": "", "progress": 0, "message": ""}
+RESULT_CACHE = create_result_cache(BASE_DIR)  # 동일 입력+옵션 결과 재사용 (비활성화 시 None)
+JOBS = create_job_store(BASE_DIR)  # job_id -> {"status": "pending|done|error", "path": "", "name": "", "ctype": "", "error": "", "progress": 0, "message": ""}
 
 UPLOAD_FOLDER = 'uploads'
 OUTPUT_FOLDER = 'outputs'
@@ -74,6 +70,45 @@ ALLOWED_EXTENSIONS = {'pdf', 'docx', 'jpg', 'jpeg', 'png', 'gif', 'bmp'}
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)
 os.makedirs(OUTPUT_FOLDER, exist_ok=True)
 
+# 무거운 변환 백엔드는 처음 쓸 때 로드 (콜드 스타트에서 cv2/numpy/fitz 등을 모두 올리지 않음)
+# 요청 경로에서 실제로 쓰는 것은 pdf2docx뿐이며, 다른 백엔드가 필요해지면 여기에 추가
+BACKENDS = {"pdf2docx": "pdf2docx"}
+_backend_modules = {}
+_backend_load_seconds = {}
+_backend_lock = threading.Lock()
+
+# 포트 바인딩 후 백그라운드에서 미리 로드할 백엔드 (쉼표 구분, 빈 값이면 미리 로드 안 함)
+PREWARM_BACKENDS = [b.strip() for b in os.environ.get("PREWARM_BACKENDS", "pdf2docx").split(",") if b.strip()]
+PREWARM_DELAY = float(os.environ.get("PREWARM_DELAY_SECONDS", "1"))
+
+def load_backend(name: str):
+    """백엔드 모듈을 처음 요청될 때 import하고 이후에는 캐시된 모듈 반환 (스레드 안전)"""
+    module = _backend_modules.get(name)
+    if module is not None:
+        return module
+    with _backend_lock:
+        if name not in _backend_modules:
+            t0 = time.perf_counter()
+            _backend_modules[name] = importlib.import_module(BACKENDS[name])
+            _backend_load_seconds[name] = round(time.perf_counter() - t0, 3)
+            app.logger.info(f"[backend] {name} loaded in {_backend_load_seconds[name]}s")
+        return _backend_modules[name]
+
+def start_prewarm():
+    """PREWARM_DELAY초 뒤 백그라운드 스레드에서 PREWARM_BACKENDS를 미리 로드"""
+    if not PREWARM_BACKENDS:
+        return
+
+    def prewarm():
+        time.sleep(PREWARM_DELAY)  # 서버가 먼저 포트를 열고 헬스체크에 응답하도록 잠시 대기
+        for name in PREWARM_BACKENDS:
+            try:
+                load_backend(name)
+            except Exception as e:
+                app.logger.warning(f"[backend] prewarm {name} failed: {e}")
+
+    threading.Thread(target=prewarm, name="backend-prewarm", daemon=True).start()
+
 def safe_base_name(filename: str) -> str:
     base = os.path.splitext(os.path.basename(filename or "output"))[0]
     # 위험 문자 제거만(한글/공백/숫자/영문/.-_는 허용)
@@ -88,13 +123,10 @@ def attach_download_headers(resp, download_name: str):
 
 def set_progress(job_id, p, msg=None):
     """진행률 업데이트 도우미 함수"""
-    info = JOBS.get(job_id)
-    if not info: return
-    info["progress"] = int(p)
-    if msg:
-        info["message"] = msg
+    if job_id not in JOBS: return
+    JOBS.set_progress(job_id, p, msg or None)
 
-def perform_doc_conversion(file_path, quality, base_name):
+def perform_doc_conversion(file_path, quality, base_name, job_id=None):
     """
     PDF를 DOCX로 변환하는 핵심 함수
     
@@ -102,6 +134,7 @@ def perform_doc_conversion(file_path, quality, base_name):
         file_path: 저장된 PDF 경로
         quality: "low"|"standard"
         base_name: 안전한 베이스 파일명
+        job_id: 비동기 작업 ID (병렬 변환 시 구간별 진행률 보고)
     
     Returns:
         (output_path, download_name, content_type)
@@ -115,7 +148,7 @@ def perform_doc_conversion(file_path, quality, base_name):
         final_path = os.path.join(OUTPUTS_DIR, final_name)
         
         # 기존 pdf_to_docx 함수 호출
-        pdf_to_docx(file_path, final_path, quality)
+        pdf_to_docx(file_path, final_path, quality, job_id=job_id)
         
         print(f"[DEBUG] DOCX 변환 완료: {final_name}")
         return final_path, final_name, "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
@@ -127,13 +160,28 @@ def perform_doc_conversion(file_path, quality, base_name):
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
-def pdf_to_docx_with_pdf2docx(pdf_path, output_path):
-    """pdf2docx 라이브러리를 사용한 PDF → DOCX 변환"""
+def pdf_to_docx_with_pdf2docx(pdf_path, output_path, job_id=None):
+    """pdf2docx 라이브러리를 사용한 PDF → DOCX 변환 (페이지가 많으면 구간 병렬 변환)"""
     try:
+        pages = docx_parallel.page_count(pdf_path)
+        if docx_parallel.should_parallelize(pages):
+            print(f"pdf2docx 구간 병렬 변환 중... ({pages}페이지)")
+
+            def on_chunk(done, total):
+                # 50~90% 구간을 변환 구간 수에 맞춰 나눠 보고
+                set_progress(job_id, 50 + 40 * done // total, f"페이지 변환 중 ({done}/{total})")
+
+            try:
+                docx_parallel.convert_parallel(pdf_path, output_path, pages=pages, progress=on_chunk)
+                print(f"pdf2docx 병렬 변환 완료: {output_path}")
+                return True
+            except Exception as e:
+                print(f"병렬 변환 실패, 순차 변환으로 재시도: {e}")
+
         print("pdf2docx 라이브러리를 사용하여 변환 중...")
         
-        # Converter 객체 생성
-        cv = Converter(pdf_path)
+        # Converter 객체 생성 (pdf2docx는 첫 사용 시 로드)
+        cv = load_backend("pdf2docx").Converter(pdf_path)
         
         # 변환 실행
         cv.convert(output_path, start=0, end=None)
@@ -148,12 +196,12 @@ def pdf_to_docx_with_pdf2docx(pdf_path, output_path):
         print(f"pdf2docx 변환 실패: {e}")
         return False
 
-def pdf_to_docx(pdf_path, output_path, quality='medium'):
+def pdf_to_docx(pdf_path, output_path, quality='medium', job_id=None):
     """PDF를 DOCX로 변환하는 함수"""
     try:
         # pdf2docx 라이브러리를 사용한 변환 시도
         print("=== pdf2docx 라이브러리 변환 시도 ===")
-        if pdf_to_docx_with_pdf2docx(pdf_path, output_path):
+        if pdf_to_docx_with_pdf2docx(pdf_path, output_path, job_id=job_id):
             print("pdf2docx 변환 성공!")
             
             # 변환된 파일이 실제로 존재하고 크기가 적절한지 확인
@@ -174,7 +222,15 @@ def pdf_to_docx(pdf_path, output_path, quality='medium'):
 # 헬스체크
 @app.route("/health")
 def health():
-    return "ok", 200
+    return jsonify({
+        "status": "ok",
+        "startup_seconds": STARTUP_SECONDS,
+        "uptime_seconds": round(time.time() - STARTED_AT, 1),
+        "backends": {
+            name: {"loaded": name in _backend_modules, "load_seconds": _backend_load_seconds.get(name)}
+            for name in BACKENDS
+        },
+    }), 200
 
 @app.route('/')
 def index():
@@ -194,11 +250,26 @@ def convert_sync():
     # 임시 파일로 저장
     temp_id = uuid4().hex
     in_path = os.path.join(UPLOADS_DIR, f"{temp_id}.pdf")
-    f.save(in_path)
+    digest = save_upload_hashed(f, in_path)
     
     # 원본 파일명에서 base_name 추출
     base_name = safe_base_name(f.filename)
     
+    # 같은 PDF + 같은 옵션이면 캐시된 결과를 바로 반환 (pdf2docx 변환 생략)
+    cache_key = None
+    if RESULT_CACHE is not None:
+        cache_key = RESULT_CACHE.make_key(digest, fmt="docx", quality=payload_quality)
+        hit = RESULT_CACHE.get(cache_key)
+        if hit:
+            app.logger.info(f"result cache hit: {cache_key[:12]}")
+            try:
+                os.remove(in_path)
+            except:
+                pass
+            name = hit.download_name(base_name)
+            resp = send_file(hit.path, mimetype=hit.content_type, as_attachment=True, download_name=name)
+            return attach_download_headers(resp, name)
+    
     try:
         # 동기적으로 변환 수행
         out_path, name, ctype = perform_doc_conversion(in_path, payload_quality, base_name)
@@ -207,6 +278,9 @@ def convert_sync():
         if not os.path.exists(out_path):
             return jsonify({"error": "변환된 파일을 찾을 수 없습니다"}), 500
         
+        if cache_key:
+            RESULT_CACHE.put(cache_key, out_path, ctype, name, base_name)
+        
         # 파일 다운로드 응답
         resp = send_file(out_path, mimetype=ctype, as_attachment=True, download_name=name)
         resp = attach_download_headers(resp, name)
@@ -262,7 +336,7 @@ def convert_async():
             set_progress(job_id, 10, "변환 준비 중")
             # 변환 시작 직전
             set_progress(job_id, 50, "문서 분석 중")
-            out_path, name, ctype = perform_doc_conversion(in_path, payload_quality, base_name)
+            out_path, name, ctype = perform_doc_conversion(in_path, payload_quality, base_name, job_id=job_id)
             set_progress(job_id, 90, "파일 생성 중")
             
             JOBS[job_id] = {
@@ -331,6 +405,18 @@ def handle_any_error(e):
     app.logger.exception("Unhandled error")
     return jsonify({"error": str(e)}), 500
 
+# 모듈 로드(=서버 기동 준비)에 걸린 시간
+STARTUP_SECONDS = round(time.perf_counter() - _IMPORT_STARTED, 3)
+STARTED_AT = time.time()
+app.logger.info(f"pdf-doc startup: {STARTUP_SECONDS}s")
+
+if __name__ != '__main__':
+    # gunicorn 워커: 마스터가 이미 포트를 바인딩한 뒤 import됨
+    start_prewarm()
+
 if __name__ == '__main__':
     port = int(os.environ.get("PORT", "5000"))
+    # 디버그 리로더의 감시 프로세스에서는 미리 로드하지 않음 (실제 서버는 자식 프로세스)
+    if os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_prewarm()
     app.run(debug=True, host='0.0.0.0', port=port)
\ No newline at end of file
@@ -0,0 +1,188 @@
+"""
+pdf2docx 페이지 구간 병렬 변환
+
+Converter(pdf).convert(out)은 한 스레드에서 모든 페이지를 차례로 분석하므로 긴 문서는 몇 분씩 걸립니다.
+여기서는 페이지를 연속 구간(chunk)으로 나눠 프로세스 풀에서 구간별 DOCX를 만들고,
+끝나면 하나의 DOCX로 합칩니다.
+
+- 각 워커는 자기 Converter로 PDF를 직접 엽니다 (pdf2docx 객체는 프로세스 간 공유 불가)
+- 합칠 때 구간마다 섹션(용지 크기/여백/단)을 유지: 앞 구간의 마지막 sectPr을 섹션 나누기로 바꿔 붙임
+- 첫 구간 문서에 없는 스타일은 복사하고, 이미지/하이퍼링크 관계(rId)는 새로 연결
+- 구간 하나가 끝날 때마다 progress(완료 구간 수, 전체 구간 수) 호출
+
+환경 변수
+    DOCX_PARALLEL_MIN_PAGES: 이 페이지 수 이상일 때만 병렬 변환 (기본: 12, 0이면 사용 안 함)
+    DOCX_CHUNK_PAGES: 구간당 페이지 수 (기본: 6)
+    DOCX_MAX_WORKERS: 프로세스 풀 최대 워커 수 (기본: CPU 수, 최대 4)
+"""
+import copy
+import io
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from threading import Lock
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        v = int(os.environ.get(key, ""))
+    except ValueError:
+        return default
+    return v if v >= 0 else default
+
+
+DOCX_PARALLEL_MIN_PAGES = _env_int("DOCX_PARALLEL_MIN_PAGES", 12)
+DOCX_CHUNK_PAGES = max(1, _env_int("DOCX_CHUNK_PAGES", 6))
+DOCX_MAX_WORKERS = max(1, _env_int("DOCX_MAX_WORKERS", min(4, os.cpu_count() or 1)))
+
+_pool = None
+_pool_lock = Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Flask 스레드가 떠 있는 프로세스에서 fork하면 락 상태가 복제될 수 있어 spawn 사용
+            ctx = multiprocessing.get_context("spawn")
+            _pool = ProcessPoolExecutor(max_workers=DOCX_MAX_WORKERS, mp_context=ctx)
+        return _pool
+
+
+def page_count(pdf_path: str) -> int:
+    import fitz  # PyMuPDF (pdf2docx 의존성이라 항상 설치되어 있음)
+    with fitz.open(pdf_path) as doc:
+        return doc.page_count
+
+
+def should_parallelize(pages: int) -> bool:
+    return DOCX_PARALLEL_MIN_PAGES > 0 and DOCX_MAX_WORKERS > 1 and pages >= DOCX_PARALLEL_MIN_PAGES
+
+
+def _convert_chunk(pdf_path: str, start: int, end: int, out_path: str) -> str:
+    """워커 프로세스에서 실행: [start, end) 페이지만 변환"""
+    from pdf2docx import Converter
+    cv = Converter(pdf_path)
+    try:
+        cv.convert(out_path, start=start, end=end)
+    finally:
+        cv.close()
+    return out_path
+
+
+def _page_ranges(pages: int, chunk_pages: int) -> list:
+    return [(s, min(s + chunk_pages, pages)) for s in range(0, pages, chunk_pages)]
+
+
+def convert_parallel(pdf_path: str, output_path: str, pages: int = None, progress=None) -> str:
+    """
+    페이지 구간별로 병렬 변환한 뒤 output_path 하나로 합치기
+
+    구간 결과는 완료되는 대로 progress(done, total)로 알리고, 합치는 순서는 항상 페이지 순서입니다.
+    구간 하나라도 실패하면 예외를 그대로 올리므로 호출자가 순차 변환으로 되돌아가면 됩니다.
+    """
+    if pages is None:
+        pages = page_count(pdf_path)
+    ranges = _page_ranges(pages, DOCX_CHUNK_PAGES)
+    work_dir = tempfile.mkdtemp(prefix="docx_chunks_", dir=os.path.dirname(os.path.abspath(output_path)))
+    try:
+        pool = _get_pool()
+        futures = {
+            pool.submit(_convert_chunk, pdf_path, s, e, os.path.join(work_dir, f"{i:04d}.docx")): i
+            for i, (s, e) in enumerate(ranges)
+        }
+        parts = [None] * len(ranges)
+        try:
+            for done, fut in enumerate(as_completed(futures), 1):
+                parts[futures[fut]] = fut.result()
+                if progress:
+                    progress(done, len(ranges))
+        except BaseException:
+            for fut in futures:
+                fut.cancel()
+            raise
+        merge_docx(parts, output_path)
+        return output_path
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+# --- DOCX 합치기 (python-docx) ---
+
+_W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+_R_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_RT_IMAGE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/image"
+
+
+def _w(tag: str) -> str:
+    return f"{{{_W_NS}}}{tag}"
+
+
+def _close_section(body, sect_pr):
+    """앞 구간의 마지막 섹션 속성을 빈 문단의 섹션 나누기로 만들어 본문 끝에 추가"""
+    p = body.makeelement(_w("p"), {})
+    ppr = p.makeelement(_w("pPr"), {})
+    ppr.append(copy.deepcopy(sect_pr))
+    p.append(ppr)
+    body.append(p)
+
+
+def _copy_styles(dst_doc, src_doc):
+    dst_styles = dst_doc.styles.element
+    have = {s.get(_w("styleId")) for s in dst_styles.findall(_w("style"))}
+    for style in src_doc.styles.element.findall(_w("style")):
+        if style.get(_w("styleId")) not in have:
+            dst_styles.append(copy.deepcopy(style))
+
+
+def _relink(element, src_part, dst_part, new_ids: dict):
+    """element 안의 r:* 관계 참조를 dst 문서의 관계로 다시 연결 (new_ids: 구간 문서 rId → 새 rId)"""
+    for node in element.iter():
+        for attr, rid in list(node.attrib.items()):
+            if not attr.startswith(f"{{{_R_NS}}}"):
+                continue
+            rel = src_part.rels.get(rid)
+            if rel is None:
+                continue
+            if rid in new_ids:
+                new_id = new_ids[rid]
+            elif rel.is_external:
+                new_id = dst_part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+            elif rel.reltype == _RT_IMAGE:
+                # get_or_add_image는 같은 바이트의 이미지를 한 번만 저장하고 파트 이름도 새로 붙임
+                new_id = dst_part.get_or_add_image(io.BytesIO(rel.target_part.blob))[0]
+            else:
+                # pdf2docx는 머리글/번호 매기기 등 다른 파트를 만들지 않음: 알 수 없는 관계면 합치기 포기
+                raise ValueError(f"unsupported relationship in chunk: {rel.reltype}")
+            new_ids[rid] = new_id
+            node.set(attr, new_id)
+
+
+def merge_docx(paths: list, output_path: str):
+    """구간 DOCX들을 순서대로 하나로 합치기 (첫 구간 문서를 바탕으로 스타일/설정 유지)"""
+    from docx import Document
+
+    if len(paths) == 1:
+        shutil.copyfile(paths[0], output_path)
+        return
+
+    merged = Document(paths[0])
+    body = merged.element.body
+    for path in paths[1:]:
+        src = Document(path)
+        _copy_styles(merged, src)
+
+        # 지금까지의 마지막 섹션을 닫고, 새 구간의 섹션 속성을 문서 끝 섹션으로 사용
+        last_sect = body.find(_w("sectPr"))
+        if last_sect is not None:
+            body.remove(last_sect)
+            _close_section(body, last_sect)
+
+        new_ids = {}
+        for child in list(src.element.body):
+            child = copy.deepcopy(child)
+            _relink(child, src.part, merged.part, new_ids)
+            body.append(child)  # 원본 sectPr도 마지막에 그대로 옮겨져 새 끝 섹션이 됨
+    merged.save(output_path)
@@ -0,0 +1,222 @@
+"""
+배치 OCR 엔진
+
+pytesseract.image_to_data는 호출마다 tesseract 프로세스를 새로 띄워 kor+eng 학습 데이터를 다시 읽고,
+페이지를 하나씩 순서대로 처리합니다. 여기서는 엔진을 띄워 둔 채로 여러 페이지를 처리하고,
+전처리(OpenCV) → 인식 → 후처리를 페이지 단위로 겹쳐서 실행합니다.
+
+- tesserocr가 설치되어 있으면: 스레드마다 PyTessBaseAPI를 한 번 만들어 계속 재사용
+  (엔진이 인식 중에는 GIL을 놓으므로 스레드 풀에서 페이지들이 동시에 진행됨)
+- 없으면: tesseract CLI에 이미지 목록 파일을 넘겨 배치당 프로세스 하나로 처리
+  (학습 데이터는 배치당 한 번만 로드, 다음 배치 전처리는 인식과 동시에 진행)
+
+인식 결과는 pytesseract.Output.DICT와 같은 형식(text/conf/left/top/width/height 리스트)이라
+기존 블록 후처리 코드를 그대로 쓸 수 있습니다.
+
+환경 변수
+    OCR_THREADS: 전처리/인식 스레드 수 (기본: CPU 수, 최대 4)
+    OCR_BATCH_PAGES: CLI 모드에서 tesseract 한 번에 넘기는 페이지 수 (기본: 8)
+    OCR_PAGE_TIMEOUT: 페이지당 인식 제한 시간(초), CLI 배치는 페이지 수만큼 곱함 (기본: 30)
+"""
+import csv
+import io
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+try:
+    import tesserocr
+except ImportError:  # 선택 의존성: 없으면 CLI 배치 모드
+    tesserocr = None
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        v = int(os.environ.get(key, "0"))
+    except ValueError:
+        v = 0
+    return v if v > 0 else default
+
+
+OCR_THREADS = _env_int("OCR_THREADS", min(4, os.cpu_count() or 1))
+OCR_BATCH_PAGES = _env_int("OCR_BATCH_PAGES", 8)
+OCR_PAGE_TIMEOUT = _env_int("OCR_PAGE_TIMEOUT", 30)
+
+_DATA_KEYS = ("level", "page_num", "block_num", "par_num", "line_num", "word_num",
+              "left", "top", "width", "height", "conf", "text")
+
+
+class OcrOptions:
+    """tesseract 인식 옵션 (-l / --oem / --psm / -c 변수)"""
+
+    def __init__(self, lang: str = "kor+eng", oem: int = 3, psm: int = 3, variables: Optional[Dict[str, str]] = None):
+        self.lang = lang
+        self.oem = oem
+        self.psm = psm
+        self.variables = dict(variables or {})
+
+    def key(self):
+        return (self.lang, self.oem, self.psm, tuple(sorted(self.variables.items())))
+
+    def cli_args(self) -> List[str]:
+        args = ["-l", self.lang, "--oem", str(self.oem), "--psm", str(self.psm)]
+        for name, value in self.variables.items():
+            args += ["-c", f"{name}={value}"]
+        return args
+
+
+def _empty_data() -> Dict[str, list]:
+    return {k: [] for k in _DATA_KEYS}
+
+
+def _parse_tsv(tsv: str) -> Dict[int, Dict[str, list]]:
+    """tesseract TSV 출력 → {page_num: image_to_data 형식 dict} (정수 열은 int, conf는 float)"""
+    pages = {}
+    for row in csv.reader(io.StringIO(tsv), delimiter="\t", quoting=csv.QUOTE_NONE):
+        if len(row) < 11 or row[0] == "level":
+            continue
+        try:
+            nums = [int(v) for v in row[:10]]
+            conf = float(row[10])
+        except ValueError:
+            continue
+        data = pages.setdefault(nums[1], _empty_data())
+        for k, v in zip(_DATA_KEYS[:10], nums):
+            data[k].append(v)
+        data["conf"].append(conf)
+        data["text"].append(row[11] if len(row) > 11 else "")
+    return pages
+
+
+# --- tesserocr: 스레드별로 유지되는 엔진 ---
+
+_local = threading.local()
+
+
+def _tess_api(options: OcrOptions):
+    apis = getattr(_local, "apis", None)
+    if apis is None:
+        apis = _local.apis = {}
+    api = apis.get(options.key())
+    if api is None:
+        api = tesserocr.PyTessBaseAPI(lang=options.lang, oem=options.oem, psm=options.psm)
+        for name, value in options.variables.items():
+            api.SetVariable(name, str(value))
+        apis[options.key()] = api
+    return api
+
+
+def _recognize_api(image, options: OcrOptions) -> Dict[str, list]:
+    api = _tess_api(options)
+    api.SetImage(image)
+    try:
+        api.Recognize()
+        return next(iter(_parse_tsv(api.GetTSVText(0)).values()), _empty_data())
+    finally:
+        api.Clear()
+
+
+# --- tesseract CLI: 배치당 프로세스 하나 ---
+
+def tesseract_cmd() -> str:
+    """setup_tesseract()가 pytesseract에 지정한 경로가 있으면 그것을 사용"""
+    try:
+        import pytesseract
+        cmd = pytesseract.pytesseract.tesseract_cmd
+        if cmd and (os.path.isabs(cmd) or shutil.which(cmd)):
+            return cmd
+    except ImportError:
+        pass
+    return shutil.which("tesseract") or "tesseract"
+
+
+def _recognize_cli(images: list, options: OcrOptions) -> List[Dict[str, list]]:
+    work_dir = tempfile.mkdtemp(prefix="ocr_batch_")
+    try:
+        paths = []
+        for i, image in enumerate(images):
+            path = os.path.join(work_dir, f"{i:04d}.png")
+            image.save(path, compress_level=1)  # 인식 전 임시 파일이라 압축보다 속도 우선
+            paths.append(path)
+        list_path = os.path.join(work_dir, "pages.txt")
+        with open(list_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(paths) + "\n")
+        proc = subprocess.run(
+            [tesseract_cmd(), list_path, "stdout", *options.cli_args(), "tsv"],
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            timeout=OCR_PAGE_TIMEOUT * len(images),
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"tesseract failed ({proc.returncode}): {proc.stderr.decode(errors='replace')[-500:]}")
+        pages = _parse_tsv(proc.stdout.decode("utf-8", errors="replace"))
+        return [pages.get(i + 1, _empty_data()) for i in range(len(images))]
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+# --- 파이프라인 ---
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=OCR_THREADS, thread_name_prefix="ocr")
+        return _pool
+
+
+def backend_name() -> str:
+    return "tesserocr" if tesserocr is not None else "tesseract-cli"
+
+
+def ocr_pages(images: Iterable, preprocess: Callable, postprocess: Callable,
+              options: OcrOptions, fallback: Optional[OcrOptions] = None) -> list:
+    """
+    페이지 이미지들을 전처리 → 인식 → 후처리해서 페이지 순서대로 결과 리스트 반환
+
+    preprocess(image) → 인식할 PIL 이미지, postprocess(data) → 페이지 결과(블록 리스트 등).
+    options로 인식이 실패하면 fallback 옵션으로 한 번 더 시도합니다.
+    """
+    images = list(images)
+    if not images:
+        return []
+    pool = _get_pool()
+
+    if tesserocr is not None:
+        def run(image):
+            prepared = preprocess(image)
+            try:
+                data = _recognize_api(prepared, options)
+            except Exception:
+                if fallback is None:
+                    raise
+                data = _recognize_api(prepared, fallback)
+            return postprocess(data)
+
+        return list(pool.map(run, images))
+
+    # CLI: 전처리는 풀에서 미리 돌려 두고, 배치 단위로 tesseract를 실행하는 동안 다음 배치 전처리가 진행됨
+    prepared = [pool.submit(preprocess, image) for image in images]
+    results = []
+    try:
+        for start in range(0, len(prepared), OCR_BATCH_PAGES):
+            batch = [f.result() for f in prepared[start:start + OCR_BATCH_PAGES]]
+            try:
+                datas = _recognize_cli(batch, options)
+            except Exception:
+                if fallback is None:
+                    raise
+                datas = _recognize_cli(batch, fallback)
+            results.extend(pool.map(postprocess, datas))
+    except BaseException:
+        for f in prepared:
+            f.cancel()
+        raise
+    return results
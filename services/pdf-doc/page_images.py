@@ -0,0 +1,62 @@
+"""
+문서 단위 페이지 이미지 제공자
+
+pdf_to_docx의 Adobe 하이브리드 경로는 페이지마다 convert_from_path(first_page=i+1, last_page=i+1)를 불러
+PDF를 다시 열고 poppler 프로세스를 새로 띄웠고, OCR 백업 경로는 문서 전체를 또 한 번 렌더링했습니다.
+여기서는 변환 한 건 동안 PDF를 PyMuPDF로 한 번만 열어 두고, 페이지는 처음 요청될 때 렌더링해
+변환이 끝날 때까지 캐시합니다. 하이브리드/OCR/이미지 영역 감지가 모두 같은 PIL 이미지를 받습니다.
+
+    with PageImageProvider(pdf_path, dpi=200) as pages:
+        image = pages.get(0)        # 0부터 시작, 첫 호출 때만 렌더링
+        for image in pages: ...     # 페이지 순서대로 (이미 렌더링한 페이지는 캐시 사용)
+"""
+import threading
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+
+class PageImageProvider:
+    def __init__(self, pdf_path: str, dpi: int = 200):
+        self.pdf_path = pdf_path
+        self.dpi = dpi
+        self._doc = fitz.open(pdf_path)
+        self._cache = {}  # (페이지 인덱스, dpi) -> PIL 이미지
+        self._lock = threading.Lock()  # fitz 문서는 스레드 간 동시 사용 불가
+
+    def __len__(self):
+        return self._doc.page_count
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.get(index)
+
+    def __getitem__(self, index):
+        return self.get(index)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def get(self, index: int, dpi: int = None) -> Image.Image:
+        """index 페이지를 dpi(기본: 생성 시 dpi)로 렌더링한 RGB 이미지 (같은 요청은 캐시 반환)"""
+        dpi = dpi or self.dpi
+        if not 0 <= index < len(self):
+            raise IndexError(f"page index out of range: {index}")
+        key = (index, dpi)
+        with self._lock:
+            image = self._cache.get(key)
+            if image is None:
+                zoom = dpi / 72.0
+                pix = self._doc.load_page(index).get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+                image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+                self._cache[key] = image
+            return image
+
+    def close(self):
+        with self._lock:
+            self._cache.clear()
+            if not self._doc.is_closed:
+                self._doc.close()
@@ -1,4 +1,5 @@
 import PyPDF2
+import fitz  # PyMuPDF
 from docx import Document
 from docx.shared import Inches
 from pdf2image import convert_from_path
@@ -6,6 +7,9 @@ import tempfile
 import os
 import logging
 import re
+import hashlib
+import threading
+from collections import OrderedDict
 from urllib.parse import unquote
 
 # Local imports
@@ -66,160 +70,165 @@ def get_unique_filename(file_path):
             new_filename = f"{name}_{timestamp}{ext}"
             return os.path.join(directory, new_filename)
 
-def analyze_page_orientation(pdf_path):
-    """PDF 페이지 방향 분석 (가로형/세로형 자동감지)"""
-    try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            if len(pdf_reader.pages) == 0:
-                return "unknown"
-            
-            landscape_pages = 0
-            portrait_pages = 0
-            
-            for page in pdf_reader.pages:
-                # 페이지 크기 정보 가져오기
-                mediabox = page.mediabox
-                width = float(mediabox.width)
-                height = float(mediabox.height)
-                
-                # 회전 정보 고려
-                rotation = page.get('/Rotate', 0)
-                if rotation in [90, 270]:
-                    width, height = height, width
-                
-                # 가로형/세로형 판단
-                if width > height:
-                    landscape_pages += 1
-                else:
-                    portrait_pages += 1
-            
-            # 주요 방향 결정
-            if landscape_pages > portrait_pages:
-                orientation = "landscape"
-                ratio = landscape_pages / (landscape_pages + portrait_pages)
-            else:
-                orientation = "portrait"
-                ratio = portrait_pages / (landscape_pages + portrait_pages)
-            
-            logging.info(f"페이지 방향 분석: {orientation} ({ratio:.2f} 비율)")
-            return {
-                "orientation": orientation,
-                "ratio": ratio,
-                "landscape_pages": landscape_pages,
-                "portrait_pages": portrait_pages
-            }
-            
-    except Exception as e:
-        logging.error(f"페이지 방향 분석 중 오류 발생: {e}")
-        return {"orientation": "unknown", "ratio": 0}
+# 공문서 키워드 패턴
+OFFICIAL_KEYWORDS = [
+    '공문', '시행', '수신', '발신', '시행일자', '문서번호', '담당부서',
+    '결재', '시장', '구청장', '과장', '팀장', '담당자',
+    '붙임', '끝.', '협조사항', '시행근거', '추진계획',
+    '○', '가.', '나.', '다.', '라.', '마.',
+    '1.', '2.', '3.', '4.', '5.',
+    '기안자', '검토자', '결재권자', '시행자'
+]
 
-def detect_official_document(pdf_path):
-    """공문서 자동감지 (텍스트 패턴, 레이아웃 분석)"""
-    try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            if len(pdf_reader.pages) == 0:
-                return False
-            
-            # 첫 페이지에서 텍스트 추출
-            first_page_text = pdf_reader.pages[0].extract_text()
-            
-            # 공문서 키워드 패턴
-            official_keywords = [
-                '공문', '시행', '수신', '발신', '시행일자', '문서번호', '담당부서',
-                '결재', '시장', '구청장', '과장', '팀장', '담당자',
-                '붙임', '끝.', '협조사항', '시행근거', '추진계획',
-                '○', '가.', '나.', '다.', '라.', '마.',
-                '1.', '2.', '3.', '4.', '5.',
-                '기안자', '검토자', '결재권자', '시행자'
-            ]
-            
-            # 공문서 레이아웃 패턴
-            layout_patterns = [
-                r'문서번호\s*:', r'시행일자\s*:', r'수신\s*:', r'발신\s*:',
-                r'제\s*목\s*:', r'담당부서\s*:', r'담당자\s*:',
-                r'\d{4}-\d+', r'\d{4}\.\d{1,2}\.\d{1,2}',  # 문서번호, 날짜 패턴
-                r'붙임\s*\d*\s*부', r'끝\s*\.',
-                r'[가-힣]+시장|[가-힣]+구청장|[가-힣]+과장'
-            ]
-            
-            keyword_count = 0
-            pattern_count = 0
-            
-            # 키워드 검사
-            for keyword in official_keywords:
-                if keyword in first_page_text:
-                    keyword_count += 1
-            
-            # 패턴 검사
-            for pattern in layout_patterns:
-                if re.search(pattern, first_page_text):
-                    pattern_count += 1
-            
-            # 공문서 판단 기준
-            is_official = (keyword_count >= 3 or pattern_count >= 2)
-            confidence = (keyword_count * 0.3 + pattern_count * 0.7) / 10
-            
-            logging.info(f"공문서 감지: {'예' if is_official else '아니오'} (키워드: {keyword_count}, 패턴: {pattern_count}, 신뢰도: {confidence:.2f})")
-            
-            return {
-                "is_official": is_official,
-                "confidence": min(confidence, 1.0),
-                "keyword_count": keyword_count,
-                "pattern_count": pattern_count
-            }
-            
-    except Exception as e:
-        logging.error(f"공문서 감지 중 오류 발생: {e}")
-        return {"is_official": False, "confidence": 0}
+# 공문서 레이아웃 패턴
+OFFICIAL_LAYOUT_PATTERNS = [re.compile(p) for p in (
+    r'문서번호\s*:', r'시행일자\s*:', r'수신\s*:', r'발신\s*:',
+    r'제\s*목\s*:', r'담당부서\s*:', r'담당자\s*:',
+    r'\d{4}-\d+', r'\d{4}\.\d{1,2}\.\d{1,2}',  # 문서번호, 날짜 패턴
+    r'붙임\s*\d*\s*부', r'끝\s*\.',
+    r'[가-힣]+시장|[가-힣]+구청장|[가-힣]+과장'
+)]
+
+# 파일 해시별 분석 결과 캐시 (같은 PDF를 다시 분석하지 않음)
+ANALYSIS_CACHE_SIZE = int(os.environ.get("ANALYSIS_CACHE_SIZE", "64"))
+_analysis_cache = OrderedDict()
+_analysis_lock = threading.Lock()
+
+def file_sha256(path):
+    """파일 내용의 SHA-256 hex (분석 캐시 키)"""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _orientation_summary(landscape_pages, portrait_pages):
+    # 주요 방향 결정
+    if landscape_pages > portrait_pages:
+        orientation = "landscape"
+        ratio = landscape_pages / (landscape_pages + portrait_pages)
+    else:
+        orientation = "portrait"
+        ratio = portrait_pages / (landscape_pages + portrait_pages)
+    logging.info(f"페이지 방향 분석: {orientation} ({ratio:.2f} 비율)")
+    return {
+        "orientation": orientation,
+        "ratio": ratio,
+        "landscape_pages": landscape_pages,
+        "portrait_pages": portrait_pages
+    }
+
+def _official_summary(first_page_text):
+    keyword_count = sum(1 for keyword in OFFICIAL_KEYWORDS if keyword in first_page_text)
+    pattern_count = sum(1 for pattern in OFFICIAL_LAYOUT_PATTERNS if pattern.search(first_page_text))
+
+    # 공문서 판단 기준
+    is_official = (keyword_count >= 3 or pattern_count >= 2)
+    confidence = (keyword_count * 0.3 + pattern_count * 0.7) / 10
+
+    logging.info(f"공문서 감지: {'예' if is_official else '아니오'} (키워드: {keyword_count}, 패턴: {pattern_count}, 신뢰도: {confidence:.2f})")
+    return {
+        "is_official": is_official,
+        "confidence": min(confidence, 1.0),
+        "keyword_count": keyword_count,
+        "pattern_count": pattern_count
+    }
+
+def _scan_pdf(pdf_path):
+    """
+    PDF를 한 번만 열어 페이지 크기/회전, 텍스트 양, 첫 페이지 공문서 키워드/패턴을 함께 수집
+    (PyMuPDF 텍스트 추출은 PyPDF2보다 훨씬 빠름)
+    """
+    with fitz.open(pdf_path) as pdf:
+        total_pages = pdf.page_count
+        if total_pages == 0:
+            return {"type": "empty"}
+
+        pages = []
+        page_texts = []
+        text_pages = 0
+        landscape_pages = 0
+        for page in pdf:
+            width, height = page.mediabox.width, page.mediabox.height
+            rotation = page.rotation
+            # 회전 정보 고려
+            if rotation in (90, 270):
+                width, height = height, width
+            if width > height:
+                landscape_pages += 1
+
+            text = page.get_text("text")
+            chars = len(text.strip())
+            if chars > 50:  # 50자 이상이면 텍스트 페이지로 간주
+                text_pages += 1
+            page_texts.append(text)
+            pages.append({"width": width, "height": height, "rotation": rotation, "text_chars": chars})
+
+    text_ratio = text_pages / total_pages
 
-def analyze_pdf_content(pdf_path):
-    """PDF 내용 분석하여 타입 결정 (방향 및 공문서 정보 포함)"""
+    # PDF 타입 결정
+    if text_ratio > 0.8:
+        pdf_type = "text_based"
+        logging.info(f"PDF 분석 결과: 텍스트 기반 (텍스트 비율: {text_ratio:.2f})")
+    elif text_ratio < 0.2:
+        pdf_type = "scanned_image"
+        logging.info(f"PDF 분석 결과: 이미지 기반 (텍스트 비율: {text_ratio:.2f})")
+    else:
+        pdf_type = "mixed"
+        logging.info(f"PDF 분석 결과: 혼합형 (텍스트 비율: {text_ratio:.2f})")
+
+    return {
+        "type": pdf_type,
+        "text_ratio": text_ratio,
+        "page_count": total_pages,
+        "pages": pages,
+        "page_texts": page_texts,
+        "orientation": _orientation_summary(landscape_pages, total_pages - landscape_pages),
+        "official_document": _official_summary(page_texts[0])
+    }
+
+def analyze_pdf_content(pdf_path, file_hash=None):
+    """
+    PDF 내용 분석하여 타입 결정 (방향 및 공문서 정보 포함)
+
+    결과는 파일 해시별로 캐시되며 file_hash 키에 해시가 들어 있습니다.
+    page_texts(페이지별 추출 텍스트)는 하위 변환 함수가 텍스트를 다시 추출하지 않도록 재사용합니다.
+    """
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            total_pages = len(pdf_reader.pages)
-            if total_pages == 0:
-                return {"type": "empty"}
+        file_hash = file_hash or file_sha256(pdf_path)
+        with _analysis_lock:
+            cached = _analysis_cache.get(file_hash)
+            if cached is not None:
+                _analysis_cache.move_to_end(file_hash)
+                logging.info(f"PDF 분석 캐시 사용: {file_hash[:12]}")
+                return dict(cached)
+
+        result = _scan_pdf(pdf_path)
+        result["file_hash"] = file_hash
+        with _analysis_lock:
+            _analysis_cache[file_hash] = result
+            while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+                _analysis_cache.popitem(last=False)
+        return dict(result)
 
-            text_pages = 0
-            for page in pdf_reader.pages:
-                # 페이지에서 텍스트 추출 시도
-                text = page.extract_text()
-                if text and len(text.strip()) > 50:  # 50자 이상이면 텍스트 페이지로 간주
-                    text_pages += 1
-            
-            text_ratio = text_pages / total_pages
-            
-            # 페이지 방향 분석
-            orientation_info = analyze_page_orientation(pdf_path)
-            
-            # 공문서 감지
-            official_info = detect_official_document(pdf_path)
-            
-            # PDF 타입 결정
-            if text_ratio > 0.8:
-                pdf_type = "text_based"
-                logging.info(f"PDF 분석 결과: 텍스트 기반 (텍스트 비율: {text_ratio:.2f})")
-            elif text_ratio < 0.2:
-                pdf_type = "scanned_image"
-                logging.info(f"PDF 분석 결과: 이미지 기반 (텍스트 비율: {text_ratio:.2f})")
-            else:
-                pdf_type = "mixed"
-                logging.info(f"PDF 분석 결과: 혼합형 (텍스트 비율: {text_ratio:.2f})")
-            
-            return {
-                "type": pdf_type,
-                "text_ratio": text_ratio,
-                "orientation": orientation_info,
-                "official_document": official_info
-            }
-            
     except Exception as e:
         logging.error(f"PDF 내용 분석 중 오류 발생: {e}")
         return {"type": "unknown"}
 
+def analyze_page_orientation(pdf_path):
+    """PDF 페이지 방향 분석 (가로형/세로형 자동감지, analyze_pdf_content 결과 재사용)"""
+    result = analyze_pdf_content(pdf_path)
+    if result.get("type") == "empty":
+        return "unknown"
+    return result.get("orientation", {"orientation": "unknown", "ratio": 0})
+
+def detect_official_document(pdf_path):
+    """공문서 자동감지 (텍스트 패턴, 레이아웃 분석, analyze_pdf_content 결과 재사용)"""
+    result = analyze_pdf_content(pdf_path)
+    if result.get("type") == "empty":
+        return False
+    return result.get("official_document", {"is_official": False, "confidence": 0})
+
 def convert_image_pdf_to_docx(pdf_path, use_ocr=False):
     """이미지 기반 PDF를 DOCX로 변환 (OCR 옵션 포함)"""
     # 원본 파일명을 유지하여 출력 파일명 생성
@@ -390,20 +399,24 @@ def fallback_text_conversion_optimized(pdf_path, analysis_result):
     output_path = get_unique_filename(os.path.join(outputs_dir, filename))
     
     try:
-        with open(pdf_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            doc = Document()
-            
-            # 방향에 따른 페이지 설정
-            if orientation == "landscape":
-                from docx.enum.section import WD_ORIENT
-                section = doc.sections[0]
-                section.orientation = WD_ORIENT.LANDSCAPE
-                section.page_width, section.page_height = section.page_height, section.page_width
-            
-            for page in pdf_reader.pages:
-                doc.add_paragraph(page.extract_text())
-            doc.save(output_path)
+        doc = Document()
+        
+        # 방향에 따른 페이지 설정
+        if orientation == "landscape":
+            from docx.enum.section import WD_ORIENT
+            section = doc.sections[0]
+            section.orientation = WD_ORIENT.LANDSCAPE
+            section.page_width, section.page_height = section.page_height, section.page_width
+        
+        # 분석 단계에서 추출한 페이지 텍스트 재사용 (없으면 다시 추출)
+        page_texts = analysis_result.get("page_texts")
+        if page_texts is None:
+            with open(pdf_path, 'rb') as file:
+                page_texts = [page.extract_text() for page in PyPDF2.PdfReader(file).pages]
+        
+        for text in page_texts:
+            doc.add_paragraph(text)
+        doc.save(output_path)
         logging.info(f"{orientation} 최적화된 폴백 텍스트 변환 완료: {output_path}")
         return output_path
     except Exception as e:
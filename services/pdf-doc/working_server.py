@@ -5,7 +5,6 @@ import tempfile
 import subprocess
 import platform
 from werkzeug.utils import secure_filename
-from pdf2image import convert_from_path
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
 from docx.enum.section import WD_ORIENT, WD_SECTION
@@ -24,6 +23,8 @@ import numpy as np
 import json
 import logging
 import zipfile
+from ocr_engine import OcrOptions, ocr_pages
+from page_images import PageImageProvider
 
 # Adobe SDK 임포트 - 선택적 로딩 (SDK 4.2 구조)
 try:
@@ -933,40 +934,48 @@ def setup_tesseract():
         print(f"Tesseract 설정 오류: {e}")
         return False
 
+# 단어 단위 OCR (PSM 6: 균일한 텍스트 블록)
+_WORD_OCR = OcrOptions("kor+eng", oem=3, psm=6)
+
+def _preprocess_word_ocr(pil_image):
+    img = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    gray = cv2.medianBlur(gray, 3)
+    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+    return Image.fromarray(clahe.apply(gray))
+
+def _word_blocks_from_data(data):
+    blocks = []
+    n = len(data["text"])
+    for i in range(n):
+        text = data["text"][i].strip()
+        # conf 값 안전하게 처리 (정수, 문자열, 실수 모두 고려)
+        conf_val = data["conf"][i]
+        if isinstance(conf_val, (int, float)):
+            conf = int(conf_val)
+        elif isinstance(conf_val, str) and conf_val.replace('.', '').replace('-', '').isdigit():
+            conf = int(float(conf_val))
+        else:
+            conf = -1
+        if text and conf >= 0:
+            blocks.append({
+                "text": text,
+                "x": data["left"][i],
+                "y": data["top"][i],
+                "w": data["width"][i],
+                "h": data["height"][i],
+                "conf": conf,
+            })
+    return blocks
+
+def ocr_images_to_blocks(pil_images):
+    """여러 페이지 이미지를 배치 OCR 엔진으로 처리해 페이지별 단어 블록 리스트 반환"""
+    return ocr_pages(pil_images, _preprocess_word_ocr, _word_blocks_from_data, _WORD_OCR)
+
 def ocr_image_to_blocks(pil_image):
     """이미지에서 단어 단위 텍스트와 위치(좌표)를 추출"""
     try:
-        img = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
-        gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-        gray = cv2.medianBlur(gray, 3)
-        clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-        gray = clahe.apply(gray)
-
-        config = r"--oem 3 --psm 6 -l kor+eng"
-        data = pytesseract.image_to_data(gray, config=config,
-                                         output_type=pytesseract.Output.DICT)
-        blocks = []
-        n = len(data["text"])
-        for i in range(n):
-            text = data["text"][i].strip()
-            # conf 값 안전하게 처리 (정수, 문자열, 실수 모두 고려)
-            conf_val = data["conf"][i]
-            if isinstance(conf_val, (int, float)):
-                conf = int(conf_val)
-            elif isinstance(conf_val, str) and conf_val.replace('.', '').replace('-', '').isdigit():
-                conf = int(float(conf_val))
-            else:
-                conf = -1
-            if text and conf >= 0:
-                blocks.append({
-                    "text": text,
-                    "x": data["left"][i],
-                    "y": data["top"][i],
-                    "w": data["width"][i],
-                    "h": data["height"][i],
-                    "conf": conf,
-                })
-        return blocks
+        return ocr_images_to_blocks([pil_image])[0]
     except Exception as e:
         error_msg = str(e)
         print(f"❌ OCR 블록 추출 오류: {error_msg}")
@@ -983,10 +992,6 @@ def ocr_image_to_blocks(pil_image):
         
         # 메모리 정리
         try:
-            if 'processed_image' in locals():
-                del processed_image
-            if 'img_array' in locals():
-                del img_array
             import gc
             gc.collect()
         except Exception:
@@ -1039,186 +1044,195 @@ def clean_korean_text(text):
         print(f"텍스트 정제 오류: {e}")
         return text.strip() if text else ""
 
+# 레이아웃 OCR 설정 (한글 공문서 최적화)
+# PSM 3: 완전 자동 페이지 분할 (공문서 레이아웃 최적화)
+# OEM 1: LSTM OCR 엔진만 사용 (한글 인식률 최대화)
+_LAYOUT_OCR = OcrOptions("kor+eng", oem=1, psm=3,
+                         variables={"preserve_interword_spaces": "1", "tessedit_do_invert": "0"})
+# 설정 오류 시 기본 설정으로 재시도
+_LAYOUT_OCR_FALLBACK = OcrOptions("kor+eng")
+
+def _preprocess_layout_ocr(image):
+    """한글 공문서 최적화 전처리 (정규화 → 노이즈 제거 → 대비 → 선명화 → 이진화 → 모폴로지)"""
+    # PIL 이미지를 OpenCV 형식으로 변환
+    img_array = np.array(image)
+
+    # 이미지 전처리
+    gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+
+    # 한글 공문서 최적화된 이미지 전처리 (정확도 향상)
+    # 1. 이미지 크기 정규화 (OCR 최적 해상도로 조정)
+    height, width = gray.shape
+    if height < 300 or width < 300:  # 너무 작은 이미지는 확대
+        scale_factor = max(300 / height, 300 / width)
+        new_width = int(width * scale_factor)
+        new_height = int(height * scale_factor)
+        gray = cv2.resize(gray, (new_width, new_height), interpolation=cv2.INTER_CUBIC)
+
+    # 2. 노이즈 제거 (한글 문자 보존 강화)
+    denoised = cv2.fastNlMeansDenoising(gray, h=8, templateWindowSize=7, searchWindowSize=21)
+
+    # 3. 대비 향상 (CLAHE 적용 - 한글 최적화)
+    clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
+    enhanced = clahe.apply(denoised)
+
+    # 4. 가우시안 블러로 미세한 노이즈 제거
+    # OpenCV Gaussian kernel 오류 방지: ksize 조건 검증
+    blur_ksize = (3, 3)  # (1,1)은 너무 작으므로 (3,3)으로 변경
+    if blur_ksize[0] > 0 and blur_ksize[0] % 2 == 1 and blur_ksize[1] > 0 and blur_ksize[1] % 2 == 1:
+        blurred = cv2.GaussianBlur(enhanced, blur_ksize, 0)
+    else:
+        blurred = enhanced.copy()  # 블러 없이 원본 사용
+
+    # 5. 언샤프 마스킹으로 텍스트 선명도 향상
+    unsharp_strength = 1.5
+    # (0,0) ksize는 sigmaX, sigmaY로 자동 계산되므로 유효함
+    gaussian = cv2.GaussianBlur(blurred, (0, 0), 2.0)
+    sharpened = cv2.addWeighted(blurred, 1.0 + unsharp_strength, gaussian, -unsharp_strength, 0)
+
+    # 6. 적응형 임계값으로 이진화 (한글 최적화 파라미터)
+    thresh = cv2.adaptiveThreshold(sharpened, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
+
+    # 7. 모폴로지 연산으로 문자 연결성 개선 (한글 특성 고려)
+    kernel_close = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 1))  # 가로 연결
+    closed = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel_close)
+
+    # 8. 작은 노이즈 제거 (한글 문자는 보존)
+    kernel_open = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2, 2))
+    processed = cv2.morphologyEx(closed, cv2.MORPH_OPEN, kernel_open)
+
+    return Image.fromarray(processed)
+
+def _line_blocks_from_data(data):
+    """OCR 단어 결과를 신뢰도로 거르고 라인 단위 블록으로 묶기"""
+    blocks = []
+
+    # 텍스트 블록을 라인별로 그룹화 (한글 공문서 최적화)
+    lines = {}
+    valid_texts = []
+
+    # 1단계: 유효한 텍스트만 필터링 (신뢰도 및 품질 기준 강화)
+    for i in range(len(data['text'])):
+        text = data['text'][i].strip()
+        conf = int(data['conf'][i])
+
+        # 한글 공문서 특화 필터링 조건
+        if (conf > 30 and text and  # 신뢰도 30% 이상으로 상향
+            len(text) >= 1 and  # 1글자 이상 (한글 특성 고려)
+            not text.isspace() and  # 공백만 있는 텍스트 제외
+            len([c for c in text if c.isalnum() or c in '가-힣ㄱ-ㅎㅏ-ㅣ']) > 0):  # 의미있는 문자 포함
+
+            valid_texts.append({
+                'text': text,
+                'left': data['left'][i],
+                'top': data['top'][i],
+                'width': data['width'][i],
+                'height': data['height'][i],
+                'confidence': conf
+            })
+
+    # 2단계: 라인별 그룹화 (한글 공문서 레이아웃 고려)
+    for item in valid_texts:
+        text = item['text']
+        left = item['left']
+        top = item['top']
+        width = item['width']
+        height = item['height']
+        conf = item['confidence']
+
+        # 동적 라인 그룹화 (텍스트 높이 기준)
+        line_tolerance = max(8, height // 3)  # 텍스트 높이의 1/3 또는 최소 8픽셀
+        line_key = round(top / line_tolerance) * line_tolerance
+
+        if line_key not in lines:
+            lines[line_key] = {
+                'texts': [],
+                'positions': [],
+                'top': top,
+                'left': left,
+                'width': width,
+                'height': height,
+                'confidence': conf
+            }
+
+        lines[line_key]['texts'].append(text)
+        lines[line_key]['positions'].append({'left': left, 'text': text})
+        lines[line_key]['left'] = min(lines[line_key]['left'], left)
+        lines[line_key]['width'] = max(lines[line_key]['width'], left + width - lines[line_key]['left'])
+        lines[line_key]['height'] = max(lines[line_key]['height'], height)
+        lines[line_key]['confidence'] = max(lines[line_key]['confidence'], conf)
+
+    # 3단계: 라인별 블록 생성 (한글 공문서 텍스트 순서 보존)
+    for line_key, line_data in sorted(lines.items()):
+        if line_data['texts'] and line_data['positions']:
+            # 같은 라인 내에서 좌측부터 정렬 (한글 공문서 읽기 순서)
+            sorted_positions = sorted(line_data['positions'], key=lambda x: x['left'])
+            ordered_texts = [pos['text'] for pos in sorted_positions]
+
+            # 텍스트 결합 (한글 공문서 특성 고려)
+            combined_text = ' '.join(ordered_texts).strip()
+
+            # 품질 검증 및 블록 생성
+            if (len(combined_text) >= 1 and  # 최소 1글자 이상
+                not combined_text.isspace() and  # 공백만 있는 텍스트 제외
+                line_data['confidence'] > 25):  # 신뢰도 25% 이상
+
+                # 한글 공문서 특화 텍스트 정제
+                cleaned_text = clean_korean_text(combined_text)
+
+                if cleaned_text:  # 정제 후에도 유효한 텍스트가 있는 경우
+                    blocks.append({
+                        'left': line_data['left'],
+                        'top': line_data['top'],
+                        'width': line_data['width'],
+                        'height': line_data['height'],
+                        'confidence': line_data['confidence'],
+                        'text': cleaned_text
+                    })
+
+    return blocks
+
+def _log_text_blocks(blocks):
+    print(f"  - OCR 텍스트 블록 {len(blocks)}개 추출됨")
+    for i, block in enumerate(blocks[:3]):  # 처음 3개만 로그 출력
+        print(f"    블록 {i+1}: '{block['text'][:30]}...' (신뢰도: {block['confidence']}%)")
+
+def extract_text_blocks_with_ocr_batch(images):
+    """
+    여러 페이지를 배치 OCR 엔진으로 처리해 페이지별 텍스트 블록 리스트 반환
+    (전처리/인식/후처리가 페이지 단위로 겹쳐서 진행되며, 결과는 페이지 순서 그대로)
+    """
+    try:
+        pages = ocr_pages(images, _preprocess_layout_ocr, _line_blocks_from_data,
+                          _LAYOUT_OCR, fallback=_LAYOUT_OCR_FALLBACK)
+    except Exception as e:
+        # 배치가 실패하면 페이지별로 다시 처리해 실패한 페이지만 빈 결과가 되도록 함
+        print(f"  - ⚠️ 배치 OCR 실패, 페이지별 처리로 전환: {e}")
+        return [extract_text_blocks_with_ocr(image) for image in images]
+    for blocks in pages:
+        _log_text_blocks(blocks)
+    return pages
+
 def extract_text_blocks_with_ocr(image):
     """OCR을 사용하여 이미지에서 텍스트 블록 추출 (개선된 버전)"""
     try:
-        # 이미지 전처리로 OCR 정확도 향상
-        import cv2
-        import numpy as np
-        
-        # PIL 이미지를 OpenCV 형식으로 변환
-        img_array = np.array(image)
-        
-        # 이미지 전처리
-        gray = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-        
-        # 한글 공문서 최적화된 이미지 전처리 (정확도 향상)
-        # 1. 이미지 크기 정규화 (OCR 최적 해상도로 조정)
-        height, width = gray.shape
-        if height < 300 or width < 300:  # 너무 작은 이미지는 확대
-            scale_factor = max(300 / height, 300 / width)
-            new_width = int(width * scale_factor)
-            new_height = int(height * scale_factor)
-            gray = cv2.resize(gray, (new_width, new_height), interpolation=cv2.INTER_CUBIC)
-        
-        # 2. 노이즈 제거 (한글 문자 보존 강화)
-        denoised = cv2.fastNlMeansDenoising(gray, h=8, templateWindowSize=7, searchWindowSize=21)
-        
-        # 3. 대비 향상 (CLAHE 적용 - 한글 최적화)
-        clahe = cv2.createCLAHE(clipLimit=3.0, tileGridSize=(8,8))
-        enhanced = clahe.apply(denoised)
-        
-        # 4. 가우시안 블러로 미세한 노이즈 제거
-        # OpenCV Gaussian kernel 오류 방지: ksize 조건 검증
-        blur_ksize = (3, 3)  # (1,1)은 너무 작으므로 (3,3)으로 변경
-        if blur_ksize[0] > 0 and blur_ksize[0] % 2 == 1 and blur_ksize[1] > 0 and blur_ksize[1] % 2 == 1:
-            blurred = cv2.GaussianBlur(enhanced, blur_ksize, 0)
-        else:
-            blurred = enhanced.copy()  # 블러 없이 원본 사용
-        
-        # 5. 언샤프 마스킹으로 텍스트 선명도 향상
-        unsharp_strength = 1.5
-        # (0,0) ksize는 sigmaX, sigmaY로 자동 계산되므로 유효함
-        gaussian = cv2.GaussianBlur(blurred, (0, 0), 2.0)
-        sharpened = cv2.addWeighted(blurred, 1.0 + unsharp_strength, gaussian, -unsharp_strength, 0)
-        
-        # 6. 적응형 임계값으로 이진화 (한글 최적화 파라미터)
-        thresh = cv2.adaptiveThreshold(sharpened, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2)
-        
-        # 7. 모폴로지 연산으로 문자 연결성 개선 (한글 특성 고려)
-        kernel_close = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 1))  # 가로 연결
-        closed = cv2.morphologyEx(thresh, cv2.MORPH_CLOSE, kernel_close)
-        
-        # 8. 작은 노이즈 제거 (한글 문자는 보존)
-        kernel_open = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (2, 2))
-        processed = cv2.morphologyEx(closed, cv2.MORPH_OPEN, kernel_open)
-        
-        # 전처리된 이미지로 OCR 수행
-        processed_image = Image.fromarray(processed)
-        
-        # 한글 공문서 최적화된 Tesseract 설정 (정확도 향상)
-        # PSM 3: 완전 자동 페이지 분할 (공문서 레이아웃 최적화)
-        # OEM 1: LSTM OCR 엔진만 사용 (한글 인식률 최대화)
-        # 한글 공문서 특화 설정
-        config = r'--oem 1 --psm 3 -l kor+eng -c tessedit_char_whitelist=가-힣ㄱ-ㅎㅏ-ㅣ0-9A-Za-z()[]{}.,?!-+=:;"\'\'\ /\n\t·※○●△▲▼◆■□◇◎★☆ -c preserve_interword_spaces=1 -c tessedit_do_invert=0'
-        
-        # OCR 수행 (타임아웃 및 오류 처리 강화)
-        try:
-            data = pytesseract.image_to_data(processed_image, config=config, output_type=pytesseract.Output.DICT, timeout=30)
-        except pytesseract.TesseractError as te:
-            print(f"  - ⚠️ Tesseract 설정 오류, 기본 설정으로 재시도: {te}")
-            # 기본 설정으로 재시도
-            try:
-                data = pytesseract.image_to_data(processed_image, lang='kor+eng', output_type=pytesseract.Output.DICT, timeout=30)
-            except Exception as retry_error:
-                print(f"  - ❌ OCR 재시도 실패: {retry_error}")
-                return []
-        except Exception as ocr_error:
-            print(f"  - ❌ OCR 처리 오류: {ocr_error}")
-            return []
-        
-        blocks = []
-        
-        # 텍스트 블록을 라인별로 그룹화 (한글 공문서 최적화)
-        lines = {}
-        valid_texts = []
-        
-        # 1단계: 유효한 텍스트만 필터링 (신뢰도 및 품질 기준 강화)
-        for i in range(len(data['text'])):
-            text = data['text'][i].strip()
-            conf = int(data['conf'][i])
-            
-            # 한글 공문서 특화 필터링 조건
-            if (conf > 30 and text and  # 신뢰도 30% 이상으로 상향
-                len(text) >= 1 and  # 1글자 이상 (한글 특성 고려)
-                not text.isspace() and  # 공백만 있는 텍스트 제외
-                len([c for c in text if c.isalnum() or c in '가-힣ㄱ-ㅎㅏ-ㅣ']) > 0):  # 의미있는 문자 포함
-                
-                valid_texts.append({
-                    'text': text,
-                    'left': data['left'][i],
-                    'top': data['top'][i],
-                    'width': data['width'][i],
-                    'height': data['height'][i],
-                    'confidence': conf
-                })
-        
-        # 2단계: 라인별 그룹화 (한글 공문서 레이아웃 고려)
-        for item in valid_texts:
-            text = item['text']
-            left = item['left']
-            top = item['top']
-            width = item['width']
-            height = item['height']
-            conf = item['confidence']
-            
-            # 동적 라인 그룹화 (텍스트 높이 기준)
-            line_tolerance = max(8, height // 3)  # 텍스트 높이의 1/3 또는 최소 8픽셀
-            line_key = round(top / line_tolerance) * line_tolerance
-            
-            if line_key not in lines:
-                lines[line_key] = {
-                    'texts': [],
-                    'positions': [],
-                    'top': top,
-                    'left': left,
-                    'width': width,
-                    'height': height,
-                    'confidence': conf
-                }
-            
-            lines[line_key]['texts'].append(text)
-            lines[line_key]['positions'].append({'left': left, 'text': text})
-            lines[line_key]['left'] = min(lines[line_key]['left'], left)
-            lines[line_key]['width'] = max(lines[line_key]['width'], left + width - lines[line_key]['left'])
-            lines[line_key]['height'] = max(lines[line_key]['height'], height)
-            lines[line_key]['confidence'] = max(lines[line_key]['confidence'], conf)
-        
-        # 3단계: 라인별 블록 생성 (한글 공문서 텍스트 순서 보존)
-        for line_key, line_data in sorted(lines.items()):
-            if line_data['texts'] and line_data['positions']:
-                # 같은 라인 내에서 좌측부터 정렬 (한글 공문서 읽기 순서)
-                sorted_positions = sorted(line_data['positions'], key=lambda x: x['left'])
-                ordered_texts = [pos['text'] for pos in sorted_positions]
-                
-                # 텍스트 결합 (한글 공문서 특성 고려)
-                combined_text = ' '.join(ordered_texts).strip()
-                
-                # 품질 검증 및 블록 생성
-                if (len(combined_text) >= 1 and  # 최소 1글자 이상
-                    not combined_text.isspace() and  # 공백만 있는 텍스트 제외
-                    line_data['confidence'] > 25):  # 신뢰도 25% 이상
-                    
-                    # 한글 공문서 특화 텍스트 정제
-                    cleaned_text = clean_korean_text(combined_text)
-                    
-                    if cleaned_text:  # 정제 후에도 유효한 텍스트가 있는 경우
-                        blocks.append({
-                            'left': line_data['left'],
-                            'top': line_data['top'],
-                            'width': line_data['width'],
-                            'height': line_data['height'],
-                            'confidence': line_data['confidence'],
-                            'text': cleaned_text
-                        })
-        
-        print(f"  - OCR 텍스트 블록 {len(blocks)}개 추출됨")
-        for i, block in enumerate(blocks[:3]):  # 처음 3개만 로그 출력
-            print(f"    블록 {i+1}: '{block['text'][:30]}...' (신뢰도: {block['confidence']}%)")
-        
+        blocks = ocr_pages([image], _preprocess_layout_ocr, _line_blocks_from_data,
+                           _LAYOUT_OCR, fallback=_LAYOUT_OCR_FALLBACK)[0]
+        _log_text_blocks(blocks)
         return blocks
         
     except Exception as e:
         print(f"OCR 블록 추출 오류: {e}")
         return []
 
-def add_image_and_overlay_text(doc, image, section):
-    """스마트 문서 타입 감지 및 적응형 변환"""
+def add_image_and_overlay_text(doc, image, section, text_blocks=None):
+    """스마트 문서 타입 감지 및 적응형 변환 (text_blocks: 배치 OCR로 미리 추출한 블록)"""
     try:
         print("  - 🔍 문서 타입 감지 시작")
         
         # OCR 텍스트 추출
-        text_blocks = extract_text_blocks_with_ocr(image)
+        if text_blocks is None:
+            text_blocks = extract_text_blocks_with_ocr(image)
         print(f"  - OCR 텍스트 블록 {len(text_blocks)}개 감지")
         
         # 문서 타입 감지
@@ -1308,7 +1322,7 @@ def pdf_to_docx(pdf_path, output_path):
     """PDF를 DOCX로 변환 - Adobe PDF Services SDK 4.2 무조건 우선 사용.
     Adobe SDK를 통한 완전 편집 가능한 텍스트 추출을 최우선으로 처리하고,
     SDK 실패 시에만 OCR 백업 사용. (안정성 강화)"""
-    images = None
+    pages = None  # 페이지 이미지 제공자 (필요할 때 PDF를 한 번만 열고, 렌더링한 페이지는 변환 동안 캐시)
     doc = None
     try:
         print(f"PDF → DOCX 변환 시작: {pdf_path}")
@@ -1376,6 +1390,7 @@ def pdf_to_docx(pdf_path, output_path):
             
             # 새 Word 문서 생성 (하이브리드 모드)
             doc = Document()
+            pages = PageImageProvider(pdf_path, dpi=200)
             
             # 한글 폰트 설정
             setup_korean_font(doc)
@@ -1399,10 +1414,8 @@ def pdf_to_docx(pdf_path, output_path):
                 # Adobe 하이브리드 블록을 편집 가능한 텍스트로 추가
                 # 페이지별로 처리하되 첫 번째 페이지의 이미지와 섹션 정보 사용
                 if adobe_blocks_per_page:
-                    # 첫 번째 페이지 이미지 생성 (좌표 변환용)
-                    from pdf2image import convert_from_path
-                    temp_images = convert_from_path(pdf_path, dpi=200, first_page=i+1, last_page=i+1)
-                    page_image = temp_images[0] if temp_images else None
+                    # 페이지 이미지 (좌표 변환용, 처음 요청될 때만 렌더링)
+                    page_image = pages.get(i) if i < len(pages) else None
                     
                     add_editable_text_with_adobe(doc, page_image, section, page_blocks)
                     print(f"  - ✅ Adobe 하이브리드 {len(page_blocks)}개 블록 편집 가능하게 추가")
@@ -1413,14 +1426,17 @@ def pdf_to_docx(pdf_path, output_path):
             return True
         else:
             print("🖼️ 하이브리드 모드: 배경 이미지 + OCR 텍스트 오버레이")
-            # 이미지 렌더링 (하이브리드 모드용)
-            images = convert_from_path(pdf_path, dpi=200)
+            # 페이지 이미지 (하이브리드 모드용, OCR과 이미지 영역 감지가 같은 렌더링 결과를 공유)
+            pages = PageImageProvider(pdf_path, dpi=200)
+            
+            # 전 페이지 OCR을 배치로 먼저 처리 (엔진 1회 로드, 전처리/인식 파이프라인)
+            page_text_blocks = extract_text_blocks_with_ocr_batch(pages)
             
             # 새 Word 문서 생성
             doc = Document()
             
-            for i, image in enumerate(images):
-                print(f"페이지 {i+1}/{len(images)} 하이브리드 처리 중...")
+            for i, image in enumerate(pages):
+                print(f"페이지 {i+1}/{len(pages)} 하이브리드 처리 중...")
                 
                 # 이미지 방향 감지
                 orientation = detect_image_orientation(image)
@@ -1434,7 +1450,7 @@ def pdf_to_docx(pdf_path, output_path):
                 _set_section_orientation(section, orientation)
                 
                 # 배경 이미지 + OCR 텍스트 오버레이 (편집 가능)
-                add_image_and_overlay_text(doc, image, section)
+                add_image_and_overlay_text(doc, image, section, page_text_blocks[i])
         
         # DOCX 파일 저장
         doc.save(output_path)
@@ -1446,6 +1462,9 @@ def pdf_to_docx(pdf_path, output_path):
         import traceback
         traceback.print_exc()
         return False
+    finally:
+        if pages is not None:
+            pages.close()
 
 def _prevent_text_overlap(text_blocks, image_regions=None, min_distance_pt=15):
     """텍스트 블록 간 겹침 방지 및 이미지 영역과의 충돌 회피 - 개선된 분리 로직"""
@@ -1,4 +1,4 @@
-import os, io, urllib.parse, tempfile, shutil, errno, zipfile, logging
+import os, io, urllib.parse, shutil, errno, zipfile, logging
 from uuid import uuid4
 from concurrent.futures import ThreadPoolExecutor
 
@@ -6,7 +6,15 @@ from flask import Flask, request, jsonify, send_file, render_template
 from flask_cors import CORS
 from werkzeug.exceptions import HTTPException
 import fitz  # PyMuPDF
-from PIL import Image
+from PIL import Image, ImageChops
+
+from page_renderer import render_pages, resolve_workers
+from gif_stream import KEY_INDEX, GifStreamWriter, fit_canvas, global_palette, quantize_frame
+from pix_bridge import pix_to_pil as pix_to_pil_view
+from pixel_ops import equal_mask, threshold_mask
+from chunked_upload import ChunkedUploadStore, UploadError, analyze_pdf, create_upload_blueprint
+from job_store import create_job_store
+from result_cache import create_result_cache, save_upload_hashed
 
 app = Flask(__name__)
 logging.basicConfig(level=logging.INFO)
@@ -20,8 +28,8 @@ CORS(app, resources={
             "https://www.77-tools.xyz",
             "https://popular-77.vercel.app"
         ],
-        "methods": ["GET", "POST", "OPTIONS"],
-        "allow_headers": ["Content-Type"],
+        "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        "allow_headers": ["Content-Type", "Upload-Offset"],
         "expose_headers": ["Content-Disposition"],
     }
 })
@@ -33,17 +41,27 @@ os.makedirs(UPLOADS_DIR, exist_ok=True)
 os.makedirs(OUTPUTS_DIR, exist_ok=True)
 
 executor = ThreadPoolExecutor(max_workers=2)
-JOBS = {}
+RESULT_CACHE = create_result_cache(BASE_DIR)  # 동일 입력+옵션 결과 재사용 (비활성화 시 None)
+JOBS = create_job_store(BASE_DIR)
+# 이어 올리기 업로드 (/upload/init → PUT /upload/<id>?offset= → /upload/<id>/complete → /convert-async에 upload_id)
+UPLOADS = ChunkedUploadStore(UPLOADS_DIR, kind="pdf", extensions={"pdf"}, max_mb=200, analyzer=analyze_pdf)
+app.register_blueprint(create_upload_blueprint(UPLOADS))
 
 def safe_base_name(filename: str) -> str:
     base = os.path.splitext(os.path.basename(filename or "output"))[0]
     return base.replace("/", "_").replace("\\", "_").strip() or "output"
 
+def claim_pdf_upload(upload_id: str):
+    """청크 업로드(/upload)로 올린 PDF 꺼내기 → (in_path, base_name). 암호 PDF는 변환 전에 거절"""
+    upload = UPLOADS.claim(upload_id)
+    if (upload["analysis"] or {}).get("encrypted"):
+        try: os.remove(upload["path"])
+        except: pass
+        raise UploadError("암호로 보호된 PDF는 변환할 수 없습니다.", 400)
+    return upload["path"], safe_base_name(upload["filename"])
+
 def set_progress(job_id, p, msg=None):
-    JOBS.setdefault(job_id, {})
-    JOBS[job_id]["progress"] = int(p)
-    if msg is not None:
-        JOBS[job_id]["message"] = msg
+    JOBS.set_progress(job_id, p, msg)
 
 def send_download_memory(path: str, download_name: str, ctype: str):
     if not path or not os.path.exists(path):
@@ -79,54 +97,33 @@ def safe_move(src: str, dst: str):
         else:
             raise
 
-def build_transparent_p_frame(rgba: Image.Image, colors: int, dither: int, white_threshold: int = 250):
+def build_transparent_p_frame(rgba: Image.Image, palette: Image.Image, dither: int, white_threshold: int = 250):
     """
     rgba: 알파 포함 RGBA 프레임 (흰색 배경을 투명으로 바꾸고 싶으면 미리 알파를 설정)
-    colors: 팔레트 색상 수(<=256)
+    palette: gif_stream.global_palette로 만든 전역 팔레트
     dither: 0/1
     white_threshold: 0~255, 이 값보다 밝은 픽셀을 '투명'으로 간주할 마스크 생성에 사용
     반환: (P 모드 프레임, transparency_index:int)
     """
-    colors = max(2, min(256, int(colors)))
-    # 1) 흰색→투명 마스크(배경 제거)
-    gray = rgba.convert("L")
-    # 밝으면(종이 배경) 투명(0), 어두우면 불투명(255)
-    alpha_mask = gray.point(lambda p: 0 if p >= white_threshold else 255)
-    rgba = rgba.copy()
-    rgba.putalpha(alpha_mask)
-    
-    # 2) 팔레트로 양자화(투명은 나중에 인덱스로 처리)
-    p = rgba.convert("RGB").convert(
-        "P", 
-        palette=Image.ADAPTIVE, 
-        colors=min(255, colors)  # 투명 인덱스로 하나 더 쓸 수 있게 255 권장
-    )
-    
-    # 3) 투명 인덱스 확보(255번 인덱스를 투명으로 사용)
-    transparent_index = 255 if colors >= 255 else colors - 1  # 마지막 인덱스를 투명으로
-    palette = p.getpalette()
-    # 투명 인덱스를 확실한 '키 색'으로 설정(0,0,0 같은 값 사용)
-    if len(palette) < 256 * 3:
-        palette += [0] * (256 * 3 - len(palette))
-    palette[transparent_index*3:transparent_index*3+3] = [0, 0, 0]
-    p.putpalette(palette)
-    
-    # 4) 알파가 0인 픽셀을 '투명 인덱스'로 칠하기
-    # alpha_mask == 0 → 투명
-    p.paste(transparent_index, mask=alpha_mask.point(lambda a: 255 if a == 0 else 0))
-    
-    return p, transparent_index
+    # 1) 흰색→투명 마스크(배경 제거): 밝으면(종이 배경) 255 = 투명으로 칠할 영역
+    clear_mask = threshold_mask(rgba.convert("L"), white_threshold)
+    if rgba.mode == "RGBA":
+        # PDF 자체가 투명한 영역(알파 0)도 투명으로 (RGB가 0이라 밝기 기준만으로는 검정이 됨)
+        clear_mask = ImageChops.lighter(clear_mask, equal_mask(rgba.getchannel("A"), 0))
+
+    # 2) 전역 팔레트로 양자화 + 투명 영역은 예약 인덱스(KEY_INDEX)로
+    return quantize_frame(rgba, palette, dither, clear_mask=clear_mask), KEY_INDEX
 
 def pil_from_fitz_pix(pix) -> Image.Image:
-    mode = "RGBA" if pix.alpha else "RGB"
-    img = Image.frombytes(mode, [pix.width, pix.height], pix.samples)
-    return img.convert("RGBA") if mode == "RGB" else img
+    img = pix_to_pil_view(pix)
+    return img.convert("RGBA") if img.mode == "RGB" else img
 
 def pix_to_pil(pix: fitz.Pixmap, keep_alpha: bool) -> Image.Image:
     """Convert PyMuPDF Pixmap to PIL Image"""
     # keep_alpha가 True이고 pix.alpha가 있으면 RGBA 유지
-    mode = "RGBA" if (keep_alpha and pix.alpha) else "RGB"
-    img = Image.frombytes(mode, [pix.width, pix.height], pix.samples)
+    img = pix_to_pil_view(pix)
+    if img.mode == "RGBA" and not keep_alpha:
+        return img.convert("RGB")
     return img
 
 def perform_gif_conversion(in_path: str, base_name: str, job_id: str,
@@ -136,63 +133,47 @@ def perform_gif_conversion(in_path: str, base_name: str, job_id: str,
                            dither: int = 1,
                            max_pages: int = 100,
                            transparent: int = 0,
-                           white_threshold: int = 250):
+                           white_threshold: int = 250,
+                           workers: int = 1):
     """
     PDF -> Animated GIF 1개 생성.
+    workers > 1이면 페이지 렌더링을 프로세스 풀에 분배(프레임 순서는 유지).
     반환: (final_path, final_name, content_type)
     """
-    with tempfile.TemporaryDirectory(dir=OUTPUTS_DIR) as tmp:
-        doc = fitz.open(in_path)
+    with fitz.open(in_path) as doc:
         page_count = doc.page_count
-        mat = fitz.Matrix(scale, scale)
-
-        frames = []
         use_pages = min(page_count, max(1, int(max_pages)))
-        for i in range(use_pages):
+        # 논리 화면 크기 = 첫 페이지 렌더링 크기 (get_pixmap과 같은 반올림 규칙)
+        canvas = (doc.load_page(0).rect * fitz.Matrix(scale, scale)).irect
+        size = (canvas.width, canvas.height)
+
+    pages = range(1, use_pages + 1)
+    # 샘플 페이지로 전역 팔레트 1개 → 모든 프레임이 같은 색을 써서 깜빡임 없음
+    palette = global_palette(in_path, pages, colors, scale=scale)
+
+    final_name = f"{base_name}.gif"
+    final_path = os.path.join(OUTPUTS_DIR, final_name)
+    if os.path.exists(final_path):
+        os.remove(final_path)
+
+    # 프레임은 렌더링되는 즉시 파일에 기록 (메모리에는 직전 프레임만 유지)
+    with GifStreamWriter(final_path, size, palette, duration_ms=delay_ms, transparent=bool(transparent)) as gif:
+        # alpha=True로 렌더하면 PDF에서 진짜 투명한 영역은 가져올 수 있음
+        for pix in render_pages(in_path, pages, scale=scale, alpha=bool(transparent), workers=workers):
+            i = pix.number - 1
             set_progress(job_id, 10 + int(80 * (i + 1) / use_pages), f"페이지 {i+1}/{use_pages} 처리 중")
-            page = doc.load_page(i)
-            # alpha=True로 렌더하면 PDF에서 진짜 투명한 영역은 가져올 수 있음
-            pix = page.get_pixmap(matrix=mat, alpha=bool(transparent))
-            rgba = pil_from_fitz_pix(pix)
-            
+
             if transparent:
                 # 흰색 배경 제거 + 투명 인덱스 예약
-                p_frame, trans_idx = build_transparent_p_frame(
-                    rgba, colors=colors, dither=dither, white_threshold=white_threshold
+                p_frame, _ = build_transparent_p_frame(
+                    fit_canvas(pil_from_fitz_pix(pix), size), palette, dither=dither, white_threshold=white_threshold
                 )
-                frames.append((p_frame, trans_idx))
             else:
-                # 기존 불투명 처리: 팔레트 축소만
-                p = rgba.convert("RGB").convert("P", palette=Image.ADAPTIVE, colors=max(2, min(256, colors)))
-                frames.append((p, None))
-
-        final_name = f"{base_name}.gif"
-        final_path = os.path.join(OUTPUTS_DIR, final_name)
-        if os.path.exists(final_path):
-            os.remove(final_path)
-
-        # transparency 인덱스 찾기(첫 프레임 기준)
-        transparency_idx = None
-        if transparent and frames and frames[0][1] is not None:
-            transparency_idx = frames[0][1]
-
-        p_images = [fr[0] for fr in frames]
-        save_kwargs = dict(
-            loop=0,
-            optimize=True,
-            duration=max(20, int(delay_ms)),
-            disposal=2,
-        )
-        if transparency_idx is not None:
-            save_kwargs["transparency"] = transparency_idx
+                # 불투명 처리: 전역 팔레트로 양자화 (RGB로 렌더링했으므로 RGBA 왕복 없음)
+                p_frame = quantize_frame(fit_canvas(pix_to_pil(pix, keep_alpha=False), size), palette, dither)
+            gif.add_frame(p_frame)
 
-        if len(p_images) == 1:
-            # 단일 프레임
-            p_images[0].save(final_path, **save_kwargs)
-        else:
-            p_images[0].save(final_path, save_all=True, append_images=p_images[1:], **save_kwargs)
-
-        return final_path, final_name, "image/gif"
+    return final_path, final_name, "image/gif"
 
 @app.route("/", methods=["GET"])
 def root():
@@ -212,7 +193,7 @@ def convert():
     base_name = safe_base_name(f.filename)
     job_id = uuid4().hex
     in_path = os.path.join(UPLOADS_DIR, f"{job_id}.pdf")
-    f.save(in_path)
+    digest = save_upload_hashed(f, in_path)
 
     # 옵션 파라미터 
     def clamp(v, lo, hi, default): 
@@ -228,12 +209,31 @@ def convert():
     dither = clamp(request.form.get("dither", "1"), 0, 1, 1)
     max_pages = clamp(request.form.get("max_pages", "100"), 1, 500, 100)
     transparent = clamp(request.form.get("transparent", "0"), 0, 1, 0)  # 0=사용 안함, 1=사용 
+    workers = resolve_workers(clamp(request.form.get("workers", "1"), 1, 64, 1))
+
+    # 같은 PDF + 같은 옵션이면 캐시된 결과를 바로 반환 (렌더링 생략)
+    cache_key = None
+    if RESULT_CACHE is not None:
+        cache_key = RESULT_CACHE.make_key(
+            digest, fmt="gif", scale=scale, delay_ms=delay_ms, colors=colors,
+            dither=dither, max_pages=max_pages, transparent=transparent
+        )
+        hit = RESULT_CACHE.get(cache_key)
+        if hit:
+            app.logger.info(f"result cache hit: {cache_key[:12]}")
+            try:
+                os.remove(in_path)
+            except:
+                pass
+            return send_download_memory(hit.path, hit.download_name(base_name), hit.content_type)
 
     try:
         out_path, name, ctype = perform_gif_conversion( 
             in_path, base_name, job_id,
-            scale=scale, delay_ms=delay_ms, colors=colors, dither=dither, max_pages=max_pages, transparent=transparent 
+            scale=scale, delay_ms=delay_ms, colors=colors, dither=dither, max_pages=max_pages, transparent=transparent, workers=workers 
         ) 
+        if cache_key:
+            RESULT_CACHE.put(cache_key, out_path, ctype, name, base_name)
         
         # 동기 변환이므로 바로 파일 반환
         response = send_download_memory(out_path, name, ctype)
@@ -281,11 +281,12 @@ def convert_to_gif():
     max_pages = clamp(request.form.get("max_pages", "100"), 1, 500, 100)
     transparent_raw = request.form.get("transparent_bg", request.form.get("transparent", "0"))
     transparent = 1 if str(transparent_raw).lower() in ("1", "true", "on", "yes") else 0
+    workers = resolve_workers(clamp(request.form.get("workers", "1"), 1, 64, 1))
 
     try:
         out_path, name, ctype = perform_gif_conversion(
             in_path, base_name, job_id,
-            scale=scale, delay_ms=delay_ms, colors=colors, dither=dither, max_pages=max_pages, transparent=transparent
+            scale=scale, delay_ms=delay_ms, colors=colors, dither=dither, max_pages=max_pages, transparent=transparent, workers=workers
         )
         response = send_download_memory(out_path, name, ctype)
         try:
@@ -304,14 +305,21 @@ def convert_to_gif():
 
 @app.route("/convert-async", methods=["POST"])
 def convert_async():
-    f = request.files.get("file") or request.files.get("pdfFile")
-    if not f:
-        return jsonify({"error": "file field is required"}), 400
-
-    base_name = safe_base_name(f.filename)
     job_id = uuid4().hex
-    in_path = os.path.join(UPLOADS_DIR, f"{job_id}.pdf")
-    f.save(in_path)
+    upload_id = request.form.get("upload_id")
+    if upload_id:
+        # /upload 청크 업로드로 미리 올린 파일 사용
+        try:
+            in_path, base_name = claim_pdf_upload(upload_id)
+        except UploadError as e:
+            return jsonify({"error": str(e)}), e.status
+    else:
+        f = request.files.get("file") or request.files.get("pdfFile")
+        if not f:
+            return jsonify({"error": "file field is required"}), 400
+        base_name = safe_base_name(f.filename)
+        in_path = os.path.join(UPLOADS_DIR, f"{job_id}.pdf")
+        f.save(in_path)
 
     # 옵션 파라미터 
     def clamp(v, lo, hi, default): 
@@ -327,6 +335,7 @@ def convert_async():
     dither = clamp(request.form.get("dither", "1"), 0, 1, 1) 
     max_pages = clamp(request.form.get("max_pages", "100"), 1, 1000, 100) 
     transparent = clamp(request.form.get("transparent", "0"), 0, 1, 0) 
+    workers = resolve_workers(clamp(request.form.get("workers", "1"), 1, 64, 1))
 
     JOBS[job_id] = {"status": "pending", "progress": 1, "message": "대기 중"} 
     app.logger.info(f"[{job_id}] uploaded: {in_path}, base={base_name}, scale={scale}, delay={delay_ms}, colors={colors}, dither={dither}, max_pages={max_pages}") 
@@ -338,7 +347,7 @@ def convert_async():
             set_progress(job_id, 10, "변환 준비 중") 
             out_path, name, ctype = perform_gif_conversion( 
                 in_path, base_name, job_id,
-                scale=scale, delay_ms=delay_ms, colors=colors, dither=dither, max_pages=max_pages, transparent=transparent 
+                scale=scale, delay_ms=delay_ms, colors=colors, dither=dither, max_pages=max_pages, transparent=transparent, workers=workers 
             ) 
             JOBS[job_id] = {"status": "done", "path": out_path, "name": name, "ctype": ctype, 
                             "progress": 100, "message": "완료"} 
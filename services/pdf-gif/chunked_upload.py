@@ -0,0 +1,446 @@
+"""
+이어 올리기(재개 가능) 청크 업로드
+
+기존 업로드는 multipart 본문 전체를 werkzeug가 임시 파일로 받은 뒤에야 크기/형식을 검사하고 file.save로 다시 복사했습니다.
+500MB 영상이 거의 다 올라간 뒤 연결이 끊기면 처음부터 다시 보내야 했고, 잘못된 파일도 끝까지 받은 뒤에야 거절했습니다.
+여기서는
+1. POST /upload/init 으로 업로드 ID를 받고,
+2. PUT /upload/<id>?offset=N 으로 청크를 보내면 최종 업로드 경로의 해당 위치에 바로 기록 (임시 파일/재복사 없음),
+3. 연결이 끊기면 GET /upload/<id> 로 받은 offset부터 이어서 보내고,
+4. POST /upload/<id>/complete 로 마무리한 뒤, 변환 API에 file 대신 upload_id를 넘깁니다.
+첫 청크(앞부분 MAGIC_BYTES 바이트)가 도착하면 매직 바이트로 형식을 검사해 맞지 않으면 바로 거절하고,
+ANALYZE_AFTER_MB 이상 받으면 마지막 청크를 기다리지 않고 백그라운드에서 analyzer(ffprobe/fitz 등)를 실행합니다.
+조기 분석이 실패했거나 일부 정보만 얻었으면 complete 때 전체 파일로 다시 분석하고,
+claim 시점에 최종 분석 결과가 아직 저장되지 않았으면 claim이 기다리지 않고 analyzer를 한 번 직접 실행합니다.
+(video-coverter 등은 gunicorn sync 워커 1개/스레드 1개로 돌기 때문에 요청 스레드에서 대기하면
+ 청크 PUT이나 작업 상태 조회 같은 다른 요청이 모두 멈춥니다. analyzer는 ffprobe/fitz처럼 짧게 끝나는 것만 사용)
+
+업로드 상태는 <업로드 폴더>/.chunked/<id>.json 에 저장하므로 재시작 후에도 이어 올릴 수 있고 gunicorn 워커끼리 공유됩니다.
+
+환경 변수
+    CHUNKED_UPLOAD_MAX_MB: 업로드 최대 크기 MB (기본: 서비스에서 지정한 값)
+    CHUNKED_UPLOAD_CHUNK_MB: 권장 청크 크기 MB (기본: 8, 한 번에 받는 최대 크기는 그 4배)
+    CHUNKED_UPLOAD_TTL: 마지막 청크 후 미완료 업로드 보관 시간(초) (기본: 86400)
+    CHUNKED_UPLOAD_ANALYZE_AFTER_MB: 조기 분석을 시작할 수신량 MB (기본: 8)
+
+chunked_upload.py는 video-coverter / pdf-gif / pdf-svg에 같은 내용으로 들어 있습니다.
+"""
+import json
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from uuid import uuid4
+
+from flask import Blueprint, jsonify, request
+from werkzeug.utils import secure_filename
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 스레드 잠금만 사용
+    fcntl = None
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        v = int(os.environ.get(key, "0"))
+    except ValueError:
+        v = 0
+    return v if v > 0 else default
+
+
+CHUNK_SIZE = _env_int("CHUNKED_UPLOAD_CHUNK_MB", 8) * 1024 * 1024
+MAX_CHUNK_SIZE = CHUNK_SIZE * 4
+UPLOAD_TTL = _env_int("CHUNKED_UPLOAD_TTL", 86400)
+ANALYZE_AFTER = _env_int("CHUNKED_UPLOAD_ANALYZE_AFTER_MB", 8) * 1024 * 1024
+MAGIC_BYTES = 4096
+_COPY_BLOCK = 1024 * 1024
+_ID_RE = re.compile(r"^[0-9a-f]{32}$")
+
+
+class UploadError(Exception):
+    """HTTP 상태 코드와 함께 클라이언트에 돌려줄 업로드 오류"""
+
+    def __init__(self, message: str, status: int = 400, **extra):
+        super().__init__(message)
+        self.status = status
+        self.extra = extra
+
+
+def _is_ts(head: bytes) -> bool:
+    # MPEG-TS(188바이트 패킷) / M2TS(4바이트 타임코드 + 188)
+    return (len(head) > 188 and head[0] == 0x47 and head[188] == 0x47) or \
+           (len(head) > 196 and head[4] == 0x47 and head[196] == 0x47)
+
+
+def is_pdf(head: bytes) -> bool:
+    # 헤더 앞에 쓰레기 바이트가 조금 붙은 PDF도 뷰어들이 열어 주므로 앞 1KB 안에서 찾음
+    return b"%PDF-" in head[:1024]
+
+
+def is_media(head: bytes) -> bool:
+    """알려진 비디오/오디오 컨테이너 시그니처인지"""
+    if head[4:8] in (b"ftyp", b"moov", b"mdat", b"free", b"wide", b"skip"):  # MP4/MOV/3GP/M4A
+        return True
+    if head[:4] in (b"\x1a\x45\xdf\xa3", b"OggS", b"fLaC", b"FLV\x01", b".RMF", b".ra\xfd", b".snd",
+                    b"MAC ", b"wvpk", b"TiVo", b"NSVf", b"NSVs", b"DHAV", b"\x06\x0e\x2b\x34"):  # ... MXF
+        return True
+    if head[:4] == b"RIFF" and head[8:12] in (b"AVI ", b"WAVE", b"AMV ", b"CDXA"):  # CDXA = VCD .dat
+        return True
+    if head[:4] == b"FORM" and head[8:12] in (b"AIFF", b"AIFC"):
+        return True
+    if head[:16] in (bytes.fromhex("3026b2758e66cf11a6d900aa0062ce6c"),   # ASF (WMV/WMA/DVR-MS)
+                     bytes.fromhex("b7d800203749da11a64e0007e95eaddb")):  # WTV
+        return True
+    if head[:4] in (b"\x00\x00\x01\xba", b"\x00\x00\x01\xb3"):  # MPEG-PS(VOB/MPG/MOD/TOD) / MPEG 비디오
+        return True
+    if head[:3] in (b"ID3", b"\x1f\x07\x00") or head[:5] == b"#!AMR" or head[:2] == b"\x0b\x77":  # ... DV, AC-3
+        return True
+    if head[4:8] == b"\x57\x90\x75\x36":  # Audible .aa
+        return True
+    if len(head) > 1 and head[0] == 0xFF and head[1] & 0xE0 == 0xE0:  # MPEG 오디오 / ADTS AAC 프레임 동기
+        return True
+    return _is_ts(head)
+
+
+SIGNATURE_CHECKS = {"pdf": is_pdf, "media": is_media}
+
+_LINEARIZED_RE = re.compile(rb"/Linearized\s[^>]*?/N\s+(\d+)")
+
+
+def analyze_pdf(path: str, complete: bool):
+    """
+    PDF 업로드 분석기
+    - 받는 중: 선형화(웹 최적화) PDF는 앞부분의 선형화 사전(/N)에 페이지 수가 있어 바로 알 수 있음
+      (암호 여부는 모르므로 partial로 표시해 완료 후 다시 분석)
+    - 완료 후: fitz로 열어 페이지 수 / 암호 여부 확인
+    """
+    if not complete:
+        with open(path, "rb") as f:
+            m = _LINEARIZED_RE.search(f.read(MAGIC_BYTES))
+        return {"page_count": int(m.group(1)), "linearized": True, "partial": True} if m else None
+    import fitz  # PDF 서비스에만 설치되어 있음
+    with fitz.open(path) as doc:
+        return {"page_count": doc.page_count, "encrypted": bool(doc.needs_pass)}
+
+
+class ChunkedUploadStore:
+    """
+    업로드 세션 저장소
+
+        store = ChunkedUploadStore(UPLOAD_FOLDER, kind="media", extensions=VIDEO_EXTENSIONS, max_mb=500,
+                                   analyzer=lambda path, complete: probe_media(path))
+        app.register_blueprint(create_upload_blueprint(store))
+        ...
+        upload = store.claim(upload_id)   # {'path', 'filename', 'size', 'analysis'} - 이후 파일은 호출 측 소유
+
+    analyzer(path, complete) -> dict | None: complete=False면 일부만 받은 파일,
+    None(분석 불가)이나 "partial": True가 든 dict를 돌려주면 complete 시점에 전체 파일로 한 번 더 호출
+    """
+
+    def __init__(self, upload_dir: str, kind: str, extensions=None, max_mb: int = 500, analyzer=None):
+        if kind not in SIGNATURE_CHECKS:
+            raise ValueError(f"unknown upload kind: {kind}")
+        self.upload_dir = upload_dir
+        self.meta_dir = os.path.join(upload_dir, ".chunked")
+        self.kind = kind
+        self.extensions = {e.lower() for e in extensions} if extensions else None
+        self.max_bytes = _env_int("CHUNKED_UPLOAD_MAX_MB", max_mb) * 1024 * 1024
+        self.analyzer = analyzer
+        self._lock = threading.Lock()
+        self._locks = {}  # upload_id -> 스레드 잠금 (업로드끼리는 서로 막지 않음)
+        os.makedirs(self.meta_dir, exist_ok=True)
+
+    # ---- 세션 메타데이터 ----
+
+    def _meta_path(self, upload_id: str) -> str:
+        if not _ID_RE.match(upload_id or ""):
+            raise UploadError("업로드를 찾을 수 없습니다.", 404)
+        return os.path.join(self.meta_dir, f"{upload_id}.json")
+
+    def _load(self, upload_id: str) -> dict:
+        try:
+            with open(self._meta_path(upload_id), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            raise UploadError("업로드를 찾을 수 없습니다.", 404)
+
+    def _save(self, info: dict):
+        path = self._meta_path(info["upload_id"])
+        tmp = f"{path}.{uuid4().hex}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(info, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @contextmanager
+    def _session(self, upload_id: str):
+        """세션 하나에 대한 배타적 잠금 (스레드 + 가능하면 프로세스 간 flock)"""
+        meta_path = self._meta_path(upload_id)
+        if not os.path.exists(meta_path):  # 없는 업로드에 잠금 파일을 남기지 않음
+            raise UploadError("업로드를 찾을 수 없습니다.", 404)
+        lock_path = meta_path + ".lock"
+        with self._lock:
+            thread_lock = self._locks.setdefault(upload_id, threading.Lock())
+        with thread_lock:
+            if fcntl is None:
+                if not os.path.exists(meta_path):
+                    raise UploadError("업로드를 찾을 수 없습니다.", 404)
+                yield
+                return
+            with open(lock_path, "a") as fp:
+                fcntl.flock(fp, fcntl.LOCK_EX)
+                try:
+                    # 잠금을 기다리는 사이 claim/abort로 정리됐으면 방금 다시 만든 잠금 파일도 지움
+                    if not os.path.exists(meta_path):
+                        try:
+                            os.remove(lock_path)
+                        except OSError:
+                            pass
+                        raise UploadError("업로드를 찾을 수 없습니다.", 404)
+                    yield
+                finally:
+                    fcntl.flock(fp, fcntl.LOCK_UN)
+
+    def _discard(self, info: dict, remove_file: bool = True):
+        with self._lock:
+            self._locks.pop(info["upload_id"], None)
+        meta = self._meta_path(info["upload_id"])
+        for path in ([info["path"]] if remove_file else []) + [meta, meta + ".lock"]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def purge_expired(self):
+        """TTL이 지난 미완료 업로드 정리"""
+        now = time.time()
+        for name in os.listdir(self.meta_dir):
+            if not name.endswith(".json"):
+                continue
+            try:
+                info = self._load(name[:-5])
+            except UploadError:
+                continue
+            if now - info.get("updated", 0) > UPLOAD_TTL:
+                self._discard(info)
+
+    @staticmethod
+    def _public(info: dict) -> dict:
+        return {
+            "upload_id": info["upload_id"],
+            "filename": info["filename"],
+            "size": info["size"],
+            "offset": info["offset"],
+            "complete": info["complete"],
+            "validated": info["validated"],
+            "chunk_size": CHUNK_SIZE,
+            "analysis": info.get("analysis"),
+        }
+
+    # ---- API ----
+
+    def init(self, filename: str, size) -> dict:
+        try:
+            size = int(size)
+        except (TypeError, ValueError):
+            raise UploadError("size가 필요합니다.")
+        if size <= 0:
+            raise UploadError("빈 파일은 업로드할 수 없습니다.")
+        if size > self.max_bytes:
+            raise UploadError(f"파일 크기가 {self.max_bytes // (1024 * 1024)}MB를 초과합니다.", 413)
+        safe_name = secure_filename(filename or "")
+        ext = safe_name.rsplit(".", 1)[-1].lower() if "." in safe_name else ""
+        if not ext or (self.extensions is not None and ext not in self.extensions):
+            raise UploadError("지원되지 않는 파일 형식입니다.", 415)
+
+        self.purge_expired()
+        upload_id = uuid4().hex
+        info = {
+            "upload_id": upload_id,
+            "filename": safe_name,
+            "path": os.path.join(self.upload_dir, f"{upload_id}_{safe_name}"),
+            "size": size,
+            "offset": 0,
+            "complete": False,
+            "validated": False,
+            "analysis": None,
+            "analysis_started": False,  # 분석 스레드 실행 중
+            "analysis_final": False,    # 더 분석할 필요 없음 (claim이 기다리는 조건)
+            "early_analysis": False,    # 받는 중 조기 분석을 이미 시도함
+            "created": time.time(),
+            "updated": time.time(),
+        }
+        # 최종 경로에 빈 파일을 만들어 두고 청크마다 해당 위치에 직접 기록
+        open(info["path"], "wb").close()
+        self._save(info)
+        return self._public(info)
+
+    def status(self, upload_id: str) -> dict:
+        return self._public(self._load(upload_id))
+
+    def write_chunk(self, upload_id: str, offset, stream, length) -> dict:
+        """stream에서 length 바이트를 offset 위치에 기록. offset은 지금까지 받은 크기와 같아야 함"""
+        try:
+            offset = int(offset)
+        except (TypeError, ValueError):
+            raise UploadError("offset이 필요합니다.")
+        if length is None:
+            raise UploadError("Content-Length가 필요합니다.", 411)
+        if length > MAX_CHUNK_SIZE:
+            raise UploadError(f"청크는 최대 {MAX_CHUNK_SIZE // (1024 * 1024)}MB까지 보낼 수 있습니다.", 413)
+
+        with self._session(upload_id):
+            info = self._load(upload_id)
+            if info["complete"]:
+                raise UploadError("이미 완료된 업로드입니다.", 409, offset=info["offset"])
+            if offset != info["offset"]:
+                # 클라이언트는 돌려받은 offset부터 다시 보내면 됨
+                raise UploadError("offset이 맞지 않습니다.", 409, offset=info["offset"])
+            if offset + length > info["size"]:
+                raise UploadError("선언한 파일 크기를 넘었습니다.", 413, offset=info["offset"])
+
+            written = 0
+            with open(info["path"], "r+b") as out:
+                out.seek(offset)
+                while written < length:
+                    block = stream.read(min(_COPY_BLOCK, length - written))
+                    if not block:
+                        break
+                    out.write(block)
+                    written += len(block)
+                out.truncate(offset + written)  # 끊긴 청크의 남은 부분이 있으면 잘라냄
+            info["offset"] = offset + written
+            info["updated"] = time.time()
+
+            if not info["validated"] and info["offset"] >= min(info["size"], MAGIC_BYTES):
+                with open(info["path"], "rb") as f:
+                    head = f.read(MAGIC_BYTES)
+                if not SIGNATURE_CHECKS[self.kind](head):
+                    self._discard(info)
+                    raise UploadError("파일 내용이 지원되는 형식이 아닙니다.", 415)
+                info["validated"] = True
+
+            start_analysis = (self.analyzer is not None and info["validated"] and not info["analysis_started"]
+                              and not info.get("early_analysis")
+                              and info["offset"] >= min(info["size"], ANALYZE_AFTER))
+            if start_analysis:
+                info["analysis_started"] = info["early_analysis"] = True
+            self._save(info)
+
+        if start_analysis:
+            self._analyze_async(upload_id, info["path"], complete=info["offset"] == info["size"])
+        if written < length:
+            raise UploadError("청크 수신이 중간에 끊겼습니다.", 400, offset=info["offset"])
+        return self._public(info)
+
+    def _call_analyzer(self, path: str, complete: bool):
+        try:
+            return self.analyzer(path, complete)
+        except Exception:
+            return None
+
+    @staticmethod
+    def _store_analysis(info: dict, result, complete: bool):
+        """분석 결과 반영. 완료된 파일의 결과이거나 부분 결과가 아니면 최종"""
+        final = complete or (result is not None and not result.get("partial"))
+        if result is not None or complete:
+            info["analysis"] = result
+        info["analysis_final"] = final
+
+    def _analyze_async(self, upload_id: str, path: str, complete: bool):
+        def run(complete=complete):
+            while True:
+                result = self._call_analyzer(path, complete)
+                try:
+                    with self._session(upload_id):
+                        info = self._load(upload_id)
+                        self._store_analysis(info, result, complete)
+                        # 부분 분석 중에 업로드가 완료됐으면 이 스레드에서 바로 전체 분석
+                        again = not info["analysis_final"] and info["complete"]
+                        info["analysis_started"] = again
+                        self._save(info)
+                except UploadError:
+                    return  # 그사이 취소/사용된 업로드
+                if not again:
+                    return
+                complete = True
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def complete(self, upload_id: str) -> dict:
+        with self._session(upload_id):
+            info = self._load(upload_id)
+            if info["offset"] != info["size"]:
+                raise UploadError("아직 모든 청크를 받지 않았습니다.", 409, offset=info["offset"])
+            info["complete"] = True
+            info["updated"] = time.time()
+            retry = (self.analyzer is not None and not info["analysis_started"]
+                     and not info.get("analysis_final"))
+            if retry:
+                info["analysis_started"] = True
+            self._save(info)
+        if retry:
+            self._analyze_async(upload_id, info["path"], complete=True)
+        return self._public(info)
+
+    def claim(self, upload_id: str) -> dict:
+        """
+        완료된 업로드를 꺼내 세션 정리. 반환한 path 파일은 호출 측이 지워야 함
+        최종 분석 결과가 없으면 (백그라운드 분석이 아직 안 끝남) 기다리지 않고 여기서 한 번 분석
+        """
+        with self._session(upload_id):
+            info = self._load(upload_id)
+            if not info["complete"]:
+                raise UploadError("업로드가 완료되지 않았습니다.", 409, offset=info["offset"])
+            if self.analyzer is not None and not info.get("analysis_final"):
+                self._store_analysis(info, self._call_analyzer(info["path"], True), True)
+            self._discard(info, remove_file=False)
+        return {
+            "path": info["path"],
+            "filename": info["filename"],
+            "size": info["size"],
+            "analysis": info.get("analysis"),
+        }
+
+    def abort(self, upload_id: str):
+        with self._session(upload_id):
+            self._discard(self._load(upload_id))
+
+
+def create_upload_blueprint(store: ChunkedUploadStore, url_prefix: str = "/upload") -> Blueprint:
+    """init / 청크 PUT / 상태 조회 / complete / 취소 엔드포인트"""
+    bp = Blueprint("chunked_upload", __name__, url_prefix=url_prefix)
+
+    @bp.errorhandler(UploadError)
+    def _upload_error(e):
+        body = {"success": False, "error": str(e)}
+        body.update(e.extra)
+        return jsonify(body), e.status
+
+    @bp.post("/init")
+    def upload_init():
+        data = request.get_json(silent=True) or request.form
+        info = store.init(data.get("filename"), data.get("size"))
+        return jsonify(dict(info, success=True)), 201
+
+    @bp.put("/<upload_id>")
+    def upload_chunk(upload_id):
+        offset = request.args.get("offset", request.headers.get("Upload-Offset"))
+        info = store.write_chunk(upload_id, offset, request.stream, request.content_length)
+        return jsonify(dict(info, success=True))
+
+    @bp.get("/<upload_id>")
+    def upload_status(upload_id):
+        return jsonify(dict(store.status(upload_id), success=True))
+
+    @bp.post("/<upload_id>/complete")
+    def upload_complete(upload_id):
+        return jsonify(dict(store.complete(upload_id), success=True))
+
+    @bp.delete("/<upload_id>")
+    def upload_abort(upload_id):
+        store.abort(upload_id)
+        return jsonify({"success": True, "upload_id": upload_id})
+
+    return bp
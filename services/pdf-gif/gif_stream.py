@@ -0,0 +1,198 @@
+"""
+애니메이션 GIF 스트리밍 인코더 (전역 공유 팔레트 + 변경 영역 프레임)
+
+기존 perform_gif_conversion은 양자화한 프레임을 모두 frames 리스트에 쌓아 두었다가 save_all로 한 번에 썼습니다.
+max_pages만큼 메모리가 늘어나고, 프레임마다 ADAPTIVE 팔레트가 달라 같은 색도 프레임마다 다르게 보여 깜빡였습니다.
+여기서는
+1. 페이지 일부를 저해상도로 샘플링해 팔레트 하나를 만들고(global_palette) 모든 프레임을 그 팔레트로 양자화,
+2. GifStreamWriter가 프레임을 받는 즉시 파일에 기록(메모리에는 직전 프레임 1장만 유지),
+3. 불투명 모드는 직전 프레임과 달라진 사각형만 기록하고(disposal=1), 그 안에서도 바뀌지 않은 픽셀은
+   투명 키 인덱스로 채워 LZW 압축이 잘 되게 합니다.
+   투명 모드는 프레임이 끝날 때 배경(투명)으로 지워야 하므로(disposal=2) 불투명 픽셀이 있는 사각형만 기록합니다.
+
+LZW 압축은 PIL GIF 인코더(GifImagePlugin.getdata)를 그대로 쓰고, 헤더/전역 색상표/반복 확장만 직접 씁니다.
+
+환경 변수
+    GIF_PALETTE_SAMPLES: 전역 팔레트 계산에 쓸 최대 샘플 페이지 수 (기본: 8)
+    GIF_PALETTE_SAMPLE_PX: 샘플 페이지의 긴 변 최대 픽셀 (기본: 384)
+"""
+import os
+import struct
+
+import fitz  # PyMuPDF
+from PIL import GifImagePlugin, Image, ImageChops
+
+from pixel_ops import equal_mask
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        v = int(os.environ.get(key, "0"))
+    except ValueError:
+        v = 0
+    return v if v > 0 else default
+
+
+GIF_PALETTE_SAMPLES = _env_int("GIF_PALETTE_SAMPLES", 8)
+GIF_PALETTE_SAMPLE_PX = _env_int("GIF_PALETTE_SAMPLE_PX", 384)
+
+KEY_INDEX = 255    # 투명/변경 없음 표시용 예약 인덱스 (실제 색은 최대 255개)
+MAX_COLORS = 255
+
+
+def _sample_pages(pages: list, count: int) -> list:
+    """pages에서 고르게 흩어진 최대 count개 페이지"""
+    if len(pages) <= count:
+        return list(pages)
+    step = (len(pages) - 1) / (count - 1) if count > 1 else 0
+    return sorted({pages[round(i * step)] for i in range(count)})
+
+
+def global_palette(pdf_path: str, pages: list, colors: int, scale: float = 1.0) -> Image.Image:
+    """
+    샘플 페이지를 저해상도로 렌더링해 세로로 이어 붙인 뒤 한 번 양자화한 팔레트 이미지
+    (반환값은 Image.quantize(palette=...)에 그대로 넘길 수 있는 P 모드 이미지)
+    """
+    colors = max(2, min(MAX_COLORS, int(colors)))
+    samples = []
+    with fitz.open(pdf_path) as doc:
+        for pno in _sample_pages(list(pages), GIF_PALETTE_SAMPLES):
+            page = doc.load_page(pno - 1)
+            longest = max(page.rect.width, page.rect.height) * scale
+            zoom = scale * min(1.0, GIF_PALETTE_SAMPLE_PX / longest) if longest else scale
+            pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), alpha=False)
+            samples.append(Image.frombytes("RGB", (pix.width, pix.height), pix.samples))
+
+    montage = Image.new("RGB", (max(s.width for s in samples), sum(s.height for s in samples)), "white")
+    y = 0
+    for s in samples:
+        montage.paste(s, (0, y))
+        y += s.height
+    return montage.quantize(colors=colors, method=Image.Quantize.MEDIANCUT)
+
+
+def fit_canvas(image: Image.Image, size: tuple, fill="white") -> Image.Image:
+    """논리 화면 크기와 다른 페이지는 왼쪽 위 기준으로 캔버스에 맞춤 (남는 곳은 fill, 넘치는 곳은 잘림)"""
+    if image.size == size:
+        return image
+    canvas = Image.new(image.mode, size, fill)
+    canvas.paste(image, (0, 0))
+    return canvas
+
+
+def quantize_frame(rgb: Image.Image, palette: Image.Image, dither: int = 1, clear_mask: Image.Image = None) -> Image.Image:
+    """
+    전역 팔레트로 양자화한 P 프레임
+    clear_mask(L, 255=투명)가 있으면 해당 픽셀은 KEY_INDEX로 채움
+    """
+    p = rgb.convert("RGB").quantize(
+        palette=palette,
+        dither=Image.Dither.FLOYDSTEINBERG if dither else Image.Dither.NONE,
+    )
+    if clear_mask is not None:
+        p.paste(KEY_INDEX, mask=clear_mask)
+    return p
+
+
+def _indices(p: Image.Image) -> Image.Image:
+    """P 이미지의 팔레트 인덱스를 그대로 L 이미지로 (색 변환 없음)"""
+    return Image.frombytes("L", p.size, p.tobytes())
+
+
+class GifStreamWriter:
+    """
+    프레임을 받는 즉시 GIF89a 파일에 기록하는 인코더
+
+        with GifStreamWriter(path, size, palette, duration_ms=400, transparent=False) as gif:
+            for frame in frames:          # palette로 양자화한 P 이미지 (크기 = size)
+                gif.add_frame(frame)
+    """
+
+    def __init__(self, path: str, size: tuple, palette: Image.Image, duration_ms: int = 400,
+                 transparent: bool = False, loop: int = 0):
+        self.path = path
+        self.size = size
+        self.duration_ms = max(20, int(duration_ms))
+        self.transparent = bool(transparent)
+        self.frame_count = 0
+        self._prev = None  # 직전 프레임 인덱스(L) - 불투명 변경 영역 계산용
+        self._palette = self._color_table(palette)
+        self._fp = open(path, "wb")
+        try:
+            self._write_header(loop)
+        except Exception:
+            self._fp.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.close(discard=exc_type is not None)
+
+    @staticmethod
+    def _color_table(palette: Image.Image) -> bytes:
+        """256색 전역 색상표 (빈 칸과 KEY_INDEX는 검정)"""
+        rgb = bytes(palette.getpalette("RGB")[:MAX_COLORS * 3])
+        return rgb + b"\0" * (256 * 3 - len(rgb))
+
+    def _write_header(self, loop: int):
+        width, height = self.size
+        self._fp.write(b"GIF89a")
+        # 논리 화면: 전역 색상표 있음(0x80), 색 해상도 8비트(0x70), 색상표 크기 2^(7+1)=256
+        self._fp.write(struct.pack("<HHBBB", width, height, 0xF7, 0, 0))
+        self._fp.write(self._palette)
+        # NETSCAPE2.0 반복 확장
+        self._fp.write(b"!\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", loop) + b"\0")
+
+    def _write_image(self, image: Image.Image, offset: tuple, disposal: int, transparency=None):
+        image.putpalette(self._palette)
+        params = dict(duration=self.duration_ms, disposal=disposal)
+        if transparency is not None:
+            params["transparency"] = transparency
+        for chunk in GifImagePlugin.getdata(image, offset=offset, **params):
+            self._fp.write(chunk)
+        self.frame_count += 1
+
+    def add_frame(self, frame: Image.Image):
+        """global_palette로 양자화한 P 프레임 추가 (투명 모드에서는 KEY_INDEX 픽셀이 투명)"""
+        if frame.size != self.size:
+            raise ValueError(f"frame size {frame.size} != canvas size {self.size}")
+        current = _indices(frame)
+
+        if self.transparent:
+            # 프레임마다 배경으로 지워지므로(disposal=2) 불투명 픽셀이 있는 사각형만 쓰면 됨
+            bbox = equal_mask(current, KEY_INDEX, high=0, low=255).getbbox() or (0, 0, 1, 1)
+            self._write_image(frame.crop(bbox), bbox[:2], disposal=2, transparency=KEY_INDEX)
+            return
+
+        if self._prev is None:
+            self._write_image(frame, (0, 0), disposal=1)
+        else:
+            diff = ImageChops.difference(current, self._prev)
+            bbox = diff.getbbox()
+            if bbox is None:
+                # 직전 프레임과 같으면 투명 1x1 프레임으로 지연 시간만 이어감
+                self._write_image(Image.new("P", (1, 1), KEY_INDEX), (0, 0), disposal=1, transparency=KEY_INDEX)
+            else:
+                region = frame.crop(bbox)
+                # 사각형 안에서도 바뀌지 않은 픽셀은 투명 키로 (직전 프레임이 그대로 보임)
+                unchanged = equal_mask(diff.crop(bbox), 0)
+                region.paste(KEY_INDEX, mask=unchanged)
+                self._write_image(region, bbox[:2], disposal=1, transparency=KEY_INDEX)
+        self._prev = current
+
+    def close(self, discard: bool = False):
+        if self._fp.closed:
+            return
+        try:
+            if not discard:
+                self._fp.write(b";")  # 트레일러
+        finally:
+            self._fp.close()
+            self._prev = None
+        if discard:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
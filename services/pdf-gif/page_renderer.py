@@ -0,0 +1,150 @@
+"""
+PyMuPDF 페이지 렌더링 엔진
+
+페이지 목록을 연속 구간(chunk)으로 나눠 프로세스 풀에 분배하고,
+결과는 항상 요청한 페이지 순서대로 돌려줍니다.
+각 워커 프로세스는 자기 fitz 문서를 직접 엽니다(Document 객체는 프로세스 간 공유 불가).
+
+환경 변수
+    RENDER_MAX_WORKERS: 프로세스 풀 최대 워커 수 (기본: CPU 수, 최대 8)
+    RENDER_CHUNK_PAGES: 워커 1회 작업당 최대 페이지 수 (기본: 2)
+"""
+import os
+import multiprocessing
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from typing import Iterator, Optional
+
+import fitz  # PyMuPDF
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        v = int(os.environ.get(key, "0"))
+    except ValueError:
+        v = 0
+    return v if v > 0 else default
+
+
+RENDER_MAX_WORKERS = _env_int("RENDER_MAX_WORKERS", min(8, os.cpu_count() or 1))
+RENDER_CHUNK_PAGES = _env_int("RENDER_CHUNK_PAGES", 2)
+
+_pool = None
+_pool_lock = Lock()
+
+
+class RenderedPage:
+    """
+    렌더링된 페이지 1장 (fitz.Pixmap과 같은 width/height/alpha/n/samples 속성 제공)
+
+    현재 프로세스에서 렌더링했으면 pixmap에 원본 Pixmap을 들고 있어 pix_bridge가 복사 없이 감쌀 수 있고,
+    워커 프로세스에서 왔으면 samples(bytes)만 들고 옵니다. fmt 지정 시 인코딩된 바이트는 data에 있습니다.
+    """
+    __slots__ = ("number", "width", "height", "alpha", "n", "data", "pixmap", "_samples")
+
+    def __init__(self, number, width, height, alpha, n, samples=None, data=None, pixmap=None):
+        self.number = number  # 1부터 시작하는 페이지 번호
+        self.width = width
+        self.height = height
+        self.alpha = alpha
+        self.n = n
+        self._samples = samples
+        self.data = data
+        self.pixmap = pixmap
+
+    @property
+    def samples(self) -> Optional[bytes]:
+        if self._samples is None and self.pixmap is not None:
+            return self.pixmap.samples
+        return self._samples
+
+    def __getstate__(self):
+        # 워커 → 부모로 보낼 때 Pixmap은 직렬화하지 않음
+        return (self.number, self.width, self.height, self.alpha, self.n, self.samples, self.data)
+
+    def __setstate__(self, state):
+        self.number, self.width, self.height, self.alpha, self.n, self._samples, self.data = state
+        self.pixmap = None
+
+
+def resolve_workers(requested=None) -> int:
+    """요청 워커 수를 1..RENDER_MAX_WORKERS 범위로 보정 (None/0이면 최대값)"""
+    try:
+        n = int(requested) if requested is not None else 0
+    except (TypeError, ValueError):
+        n = 0
+    if n <= 0:
+        n = RENDER_MAX_WORKERS
+    return max(1, min(RENDER_MAX_WORKERS, n))
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Flask 스레드가 떠 있는 프로세스에서 fork하면 락 상태가 복제될 수 있어 spawn 사용
+            ctx = multiprocessing.get_context("spawn")
+            _pool = ProcessPoolExecutor(max_workers=RENDER_MAX_WORKERS, mp_context=ctx)
+        return _pool
+
+
+def _render_one(doc, pno: int, mat, alpha: bool, fmt: Optional[str], keep_pixmap: bool = False) -> RenderedPage:
+    pix = doc.load_page(pno - 1).get_pixmap(matrix=mat, alpha=alpha)
+    if fmt:
+        return RenderedPage(pno, pix.width, pix.height, bool(pix.alpha), pix.n, data=pix.tobytes(fmt))
+    if keep_pixmap:
+        return RenderedPage(pno, pix.width, pix.height, bool(pix.alpha), pix.n, pixmap=pix)
+    return RenderedPage(pno, pix.width, pix.height, bool(pix.alpha), pix.n, samples=pix.samples)
+
+
+def _render_chunk(pdf_path: str, pages: list, scale: float, alpha: bool, fmt: Optional[str]) -> list:
+    """워커 프로세스에서 실행: 문서를 직접 열고 구간 내 페이지를 순서대로 렌더링"""
+    mat = fitz.Matrix(scale, scale)
+    doc = fitz.open(pdf_path)
+    try:
+        return [_render_one(doc, pno, mat, alpha, fmt) for pno in pages]
+    finally:
+        doc.close()
+
+
+def _chunked(pages: list, workers: int) -> list:
+    # 구간을 작게 유지해야 페이지별 비용 편차가 흡수되고, 대기 중인 결과 메모리도 작아짐
+    size = max(1, min(RENDER_CHUNK_PAGES, -(-len(pages) // workers)))
+    return [pages[i:i + size] for i in range(0, len(pages), size)]
+
+
+def render_pages(pdf_path: str, pages: list, scale: float = 1.0, alpha: bool = False,
+                 workers: int = 1, fmt: Optional[str] = None) -> Iterator[RenderedPage]:
+    """
+    pages(1부터 시작)를 렌더링해서 RenderedPage를 페이지 순서대로 내보내는 제너레이터
+
+    workers <= 1 이거나 페이지가 1장이면 현재 프로세스에서 순차 렌더링하고,
+    그 외에는 프로세스 풀에 구간을 분배합니다. 진행 중인 구간은 워커 수 + 1개로 제한해
+    앞 페이지를 소비하기 전까지 뒤 페이지가 메모리에 무한정 쌓이지 않게 합니다.
+    fmt("png" 등)를 주면 워커에서 인코딩까지 끝낸 바이트를 data로 돌려줍니다.
+    """
+    pages = list(pages)
+    workers = resolve_workers(workers) if workers and workers > 1 else 1
+    if workers <= 1 or len(pages) <= 1:
+        mat = fitz.Matrix(scale, scale)
+        doc = fitz.open(pdf_path)
+        try:
+            for pno in pages:
+                yield _render_one(doc, pno, mat, alpha, fmt, keep_pixmap=True)
+        finally:
+            doc.close()
+        return
+
+    pool = _get_pool()
+    chunks = deque(_chunked(pages, workers))
+    pending = deque()
+    try:
+        while chunks or pending:
+            while chunks and len(pending) <= workers:
+                pending.append(pool.submit(_render_chunk, pdf_path, chunks.popleft(), scale, alpha, fmt))
+            for rendered in pending.popleft().result():
+                yield rendered
+    finally:
+        for fut in pending:
+            fut.cancel()
@@ -0,0 +1,83 @@
+"""
+PyMuPDF Pixmap ↔ PIL / NumPy 브리지
+
+pix.samples는 호출할 때마다 픽셀 전체를 새 bytes로 복사하고,
+Image.frombytes(...)와 .convert("RGBA")가 각각 한 번씩 더 복사합니다.
+여기서는 Pixmap의 픽셀 메모리를 그대로 감싸서 복사 없이 PIL 이미지/NumPy 배열을 만들고,
+인코더가 원하는 색공간과 알파 레이아웃으로 처음부터 렌더링해 변환 단계를 없앱니다.
+
+page_renderer.RenderedPage도 같은 방식으로 처리합니다.
+"""
+import ctypes
+
+import fitz  # PyMuPDF
+from PIL import Image
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 뷰가 필요 없는 서비스는 numpy 없이도 동작
+    np = None
+
+# PIL 모드 → (fitz 색공간, 알파 여부)
+_RENDER_LAYOUT = {
+    "L": (fitz.csGRAY, False),
+    "LA": (fitz.csGRAY, True),
+    "RGB": (fitz.csRGB, False),
+    "RGBA": (fitz.csRGB, True),
+}
+
+# (채널 수, 알파 여부) → PIL 모드
+_PIL_MODE = {
+    (1, False): "L",
+    (2, True): "LA",
+    (3, False): "RGB",
+    (4, True): "RGBA",
+}
+
+
+def render_page(page, matrix, mode: str = "RGB"):
+    """인코더가 쓸 모드("L"|"LA"|"RGB"|"RGBA") 그대로 페이지를 렌더링 (후속 convert 불필요)"""
+    colorspace, alpha = _RENDER_LAYOUT[mode]
+    return page.get_pixmap(matrix=matrix, colorspace=colorspace, alpha=alpha)
+
+
+def _buffer(pix):
+    """
+    (버퍼, 채널 수, stride)
+
+    fitz.Pixmap이면 samples_ptr 위에 ctypes 배열을 씌워 복사 없이 공유합니다.
+    (samples_mv를 직접 넘기면 Pixmap.__del__에서 memoryview 해제가 BufferError로 실패함)
+    버퍼 객체가 Pixmap을 참조하도록 묶어 두므로, 이미지/배열이 살아 있는 동안 픽셀 메모리도 유지됩니다.
+    워커 프로세스에서 온 RenderedPage는 samples bytes를 그대로 사용합니다.
+    """
+    pixmap = getattr(pix, "pixmap", None) or pix  # 현재 프로세스에서 렌더링한 RenderedPage
+    ptr = getattr(pixmap, "samples_ptr", None)
+    if ptr is not None:
+        buf = (ctypes.c_ubyte * (pixmap.stride * pixmap.height)).from_address(ptr)
+        buf._fitz_pix = pixmap
+        return buf, pixmap.n, pixmap.stride
+    return pix.samples, pix.n, pix.width * pix.n
+
+
+def pix_to_pil(pix) -> Image.Image:
+    """
+    Pixmap을 PIL 이미지로 감싸기
+
+    L/RGBA 등 PIL 내부 레이아웃과 같은 모드는 버퍼를 공유(복사 0회)하고,
+    RGB는 PIL 내부가 4바이트 픽셀이라 1회 복사됩니다(기존: samples + frombytes + convert = 3회).
+    공유된 이미지는 읽기 전용이라 putalpha/paste 등 수정 시 PIL이 알아서 복사합니다.
+    """
+    buf, n, stride = _buffer(pix)
+    mode = _PIL_MODE[(n, bool(pix.alpha))]
+    return Image.frombuffer(mode, (pix.width, pix.height), buf, "raw", mode, stride, 1)
+
+
+def pix_as_array(pix):
+    """Pixmap 버퍼를 (높이, 너비, 채널) uint8 NumPy 뷰로 반환 (복사 없음, 읽기 전용, stride 패딩 고려)"""
+    if np is None:
+        raise ImportError("numpy is required for pix_as_array")
+    buf, n, stride = _buffer(pix)
+    arr = np.frombuffer(buf, dtype=np.uint8)
+    return np.lib.stride_tricks.as_strided(
+        arr, shape=(pix.height, pix.width, n), strides=(stride, n, 1), writeable=False
+    )
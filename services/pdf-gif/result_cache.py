@@ -0,0 +1,163 @@
+"""
+변환 결과 캐시 (내용 주소 기반)
+
+같은 PDF를 같은 옵션으로 다시 올리면 /convert가 처음부터 다시 렌더링했습니다.
+입력 바이트의 SHA-256과 정규화한 옵션으로 키를 만들고, 완성된 결과 파일을 디스크에 보관해
+적중 시 변환 엔진(fitz, pdf2image, pdf2docx 등)을 전혀 호출하지 않고 바로 응답합니다.
+
+- 업로드를 저장하면서 동시에 해시를 계산 (추가 읽기 없음)
+- 적중할 때마다 mtime을 갱신하고, 용량/개수 제한을 넘으면 가장 오래 쓰지 않은 것부터 제거(LRU)
+- 파일명은 키에 포함하지 않음: 다운로드 이름은 요청마다 원본 이름 + 저장된 접미사(.zip, _png.zip 등)로 만듦
+
+환경 변수
+    RESULT_CACHE: "1"(기본) | "0" 이면 사용 안 함
+    RESULT_CACHE_DIR: 캐시 폴더 (기본: <서비스 폴더>/cache)
+    RESULT_CACHE_MAX_MB: 최대 총 용량 MB (기본: 1024)
+    RESULT_CACHE_MAX_ENTRIES: 최대 보관 결과 수 (기본: 500)
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from uuid import uuid4
+
+_HASH_CHUNK = 1024 * 1024
+
+
+def save_upload_hashed(file_storage, dest_path: str) -> str:
+    """업로드(FileStorage)를 dest_path에 저장하면서 SHA-256 hex를 계산해 반환"""
+    h = hashlib.sha256()
+    stream = file_storage.stream
+    with open(dest_path, "wb") as out:
+        while True:
+            chunk = stream.read(_HASH_CHUNK)
+            if not chunk:
+                break
+            h.update(chunk)
+            out.write(chunk)
+    return h.hexdigest()
+
+
+def _normalize(value):
+    # 0.5와 "0.5", 1.0과 1을 같은 키로 취급
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, (list, tuple)):
+        return [_normalize(v) for v in value]
+    if isinstance(value, str):
+        s = value.strip().lower()
+        try:
+            return _normalize(float(s))
+        except ValueError:
+            return s
+    return value
+
+
+class CachedResult:
+    __slots__ = ("path", "content_type", "suffix", "name")
+
+    def __init__(self, path, content_type, suffix, name=None):
+        self.path = path
+        self.content_type = content_type
+        self.suffix = suffix  # 다운로드 이름에서 원본 이름 뒤에 붙는 부분
+        self.name = name      # 원본 이름과 무관한 고정 이름일 때만 사용
+
+    def download_name(self, base_name: str) -> str:
+        return self.name or f"{base_name}{self.suffix}"
+
+
+class ResultCache:
+    def __init__(self, cache_dir: str, max_bytes: int = 1024 * 1024 * 1024, max_entries: int = 500):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(input_digest: str, **options) -> str:
+        """입력 해시 + 정규화한 옵션(None 제외, 키 정렬) → 캐시 키"""
+        opts = {k: _normalize(v) for k, v in options.items() if v is not None}
+        raw = input_digest + "\n" + json.dumps(opts, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _paths(self, key):
+        return os.path.join(self.cache_dir, f"{key}.bin"), os.path.join(self.cache_dir, f"{key}.json")
+
+    def get(self, key):
+        data_path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            os.utime(data_path)  # LRU 순서 갱신 (파일이 없으면 OSError)
+        except (OSError, ValueError):
+            return None
+        return CachedResult(data_path, meta.get("content_type", "application/octet-stream"),
+                            meta.get("suffix", ""), meta.get("name"))
+
+    def put(self, key, src_path: str, content_type: str, download_name: str, base_name: str):
+        """완성된 결과 파일을 캐시에 복사 (원본은 호출자가 그대로 사용/정리)"""
+        with open(src_path, "rb") as f:
+            self._store(key, content_type, download_name, base_name,
+                        lambda out: shutil.copyfileobj(f, out, _HASH_CHUNK))
+
+    def put_bytes(self, key, data: bytes, content_type: str, download_name: str, base_name: str):
+        self._store(key, content_type, download_name, base_name, lambda out: out.write(data))
+
+    def _store(self, key, content_type, download_name, base_name, write):
+        if base_name and download_name.startswith(base_name):
+            naming = {"suffix": download_name[len(base_name):]}
+        else:
+            naming = {"name": download_name}
+        data_path, meta_path = self._paths(key)
+        tmp = os.path.join(self.cache_dir, f".{key}.{uuid4().hex}.tmp")
+        try:
+            with open(tmp, "wb") as out:
+                write(out)
+            # 데이터를 먼저 원자적으로 교체한 뒤 메타를 써야 get()이 반쯤 쓴 파일을 보지 않음
+            os.replace(tmp, data_path)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"content_type": content_type, "created": time.time(), **naming}, f, ensure_ascii=False)
+            os.replace(tmp, meta_path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self._evict()
+
+    def _evict(self):
+        with self._lock:
+            entries = []
+            total = 0
+            for name in os.listdir(self.cache_dir):
+                if not name.endswith(".bin"):
+                    continue
+                path = os.path.join(self.cache_dir, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, name[:-4]))
+                total += st.st_size
+            entries.sort()
+            while entries and (total > self.max_bytes or len(entries) > self.max_entries):
+                _, size, key = entries.pop(0)
+                for p in self._paths(key):
+                    try:
+                        os.remove(p)
+                    except OSError:
+                        pass
+                total -= size
+
+
+def create_result_cache(base_dir: str):
+    """환경 변수 설정에 맞는 결과 캐시 생성 (RESULT_CACHE=0이면 None)"""
+    if os.environ.get("RESULT_CACHE", "1").lower() in ("0", "false", "off"):
+        return None
+    cache_dir = os.environ.get("RESULT_CACHE_DIR") or os.path.join(base_dir, "cache")
+    max_mb = float(os.environ.get("RESULT_CACHE_MAX_MB", "1024"))
+    max_entries = int(os.environ.get("RESULT_CACHE_MAX_ENTRIES", "500"))
+    return ResultCache(cache_dir, max_bytes=int(max_mb * 1024 * 1024), max_entries=max_entries)
@@ -1,9 +1,14 @@
 from flask import Flask, request, send_file, jsonify, render_template, send_from_directory
 from werkzeug.utils import secure_filename
-import os, io, zipfile
+import os, io, zipfile, mimetypes
+from uuid import uuid4
+import urllib.parse
 
 from converters.pdf_to_images import pdf_to_images
+from converters.page_renderer import resolve_workers
 from utils.file_utils import ensure_dirs
+from utils.result_cache import create_result_cache, save_upload_hashed
+from utils.zip_stream import zip_response
 
 BASE = os.path.dirname(__file__)
 UPLOAD_DIR = os.path.join(BASE, "uploads")
@@ -11,6 +16,7 @@ OUTPUT_DIR = os.path.join(BASE, "outputs")
 
 app = Flask(__name__)
 ensure_dirs([UPLOAD_DIR, OUTPUT_DIR])
+RESULT_CACHE = create_result_cache(BASE)  # 동일 입력+옵션 결과 재사용 (비활성화 시 None)
 
 @app.route("/", methods=["GET"])
 def root():
@@ -43,9 +49,11 @@ def root():
                 "pages": "Page range (e.g., '1-3,5')",
                 "transparentBg": "Transparent background (true/false)",
                 "transparentColor": "Color to make transparent (hex)",
-                "tolerance": "Color tolerance (default: 8)",
+                "tolerance": "Color tolerance (default: 8, or per-channel 'r,g,b')",
+                "softness": "Soft alpha edge width beyond tolerance (default: 0)",
                 "webpLossless": "WebP lossless mode (true/false)",
-                "whiteThreshold": "White threshold (default: 250)"
+                "whiteThreshold": "White threshold (default: 250)",
+                "workers": "Page render processes (default: 1, capped by RENDER_MAX_WORKERS)"
             }
         }
     })
@@ -64,18 +72,29 @@ def vite_client():
     return '', 404
 
 def _zip_paths(paths):
-    buf = io.BytesIO()
-    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as z:
-        for p in paths:
-            z.write(p, arcname=os.path.basename(p))
-    buf.seek(0)
-    return buf
+    """ZIP 항목 목록 (zip_response가 파일을 조금씩 읽어 스트리밍)"""
+    return [(os.path.basename(p), p) for p in paths]
+
+def _send_cached(hit, base_name):
+    name = hit.download_name(base_name)
+    resp = send_file(hit.path, mimetype=hit.content_type, as_attachment=True, download_name=name)
+    resp.headers["Content-Length"] = str(os.path.getsize(hit.path))
+    resp.headers["Content-Disposition"] = f"attachment; filename*=UTF-8''{urllib.parse.quote(name)}"
+    return resp
 
 def _flag(v, default=False):
     if v is None:
         return default
     return str(v).strip().lower() in ("1","true","yes","y","on")
 
+def _tolerance(v, default=8):
+    if not v:
+        return default
+    parts = [int(x) for x in str(v).split(",") if x.strip()]
+    if len(parts) == 3:
+        return tuple(parts)
+    return parts[0] if parts else default
+
 @app.route("/api/pdf-to-images", methods=["POST"])
 def api_pdf_to_images():
     f = request.files.get("file")
@@ -90,13 +109,29 @@ def api_pdf_to_images():
     # 투명 배경 처리 - 다양한 파라미터명 지원
     transparent_bg = _flag(request.form.get("transparentBg"), False) or _flag(request.form.get("transparent"), False)
     transparent_color = request.form.get("transparentColor")   # 예: ffffff, #fff
-    tolerance = int(request.form.get("tolerance") or 8)
+    tolerance = _tolerance(request.form.get("tolerance"))  # 8 또는 채널별 "8,8,16"
+    softness = int(request.form.get("softness") or 0)       # 컬러키 가장자리 부드럽게(0=하드)
     webp_lossless = _flag(request.form.get("webpLossless"), True)
     white_threshold = int(request.form.get("whiteThreshold") or 250)  # PDF-PNG 방식 밝기 임계값
+    workers = resolve_workers(request.form.get("workers") or 1)  # 페이지 렌더링 프로세스 수
 
     name = secure_filename(f.filename)
     in_path = os.path.join(UPLOAD_DIR, name)
-    f.save(in_path)
+    digest = save_upload_hashed(f, in_path)
+    base_name = os.path.splitext(f.filename)[0]
+
+    # 같은 PDF + 같은 옵션이면 캐시된 결과를 바로 반환 (렌더링 생략)
+    cache_key = None
+    if RESULT_CACHE is not None:
+        cache_key = RESULT_CACHE.make_key(
+            digest, fmt=fmt, dpi=dpi, quality=quality, pages=pages_spec,
+            transparent_bg=transparent_bg, transparent_color=transparent_color,
+            tolerance=tolerance, softness=softness, webp_lossless=webp_lossless,
+            white_threshold=white_threshold
+        )
+        hit = RESULT_CACHE.get(cache_key)
+        if hit:
+            return _send_cached(hit, base_name)
 
     out_dir = os.path.join(OUTPUT_DIR, os.path.splitext(name)[0])
     os.makedirs(out_dir, exist_ok=True)
@@ -106,7 +141,7 @@ def api_pdf_to_images():
         fmt=fmt, dpi=dpi, quality=quality, pages_spec=pages_spec,
         transparent_bg=transparent_bg, transparent_color=transparent_color,
         tolerance=tolerance, webp_lossless=webp_lossless,
-        white_threshold=white_threshold
+        white_threshold=white_threshold, workers=workers, softness=softness
     )
 
     if not out_files:
@@ -116,31 +151,25 @@ def api_pdf_to_images():
     if len(out_files) == 1:
         fp = out_files[0]
         # 단일 페이지: 원본파일명.확장자 형식으로 파일명 설정
-        base_name = os.path.splitext(f.filename)[0]
         korean_filename = f"{base_name}.{fmt}"
+        if cache_key:
+            ctype = mimetypes.guess_type(fp)[0] or "application/octet-stream"
+            RESULT_CACHE.put(cache_key, fp, ctype, korean_filename, base_name)
         resp = send_file(fp, as_attachment=True, download_name=korean_filename)
         resp.headers["Content-Length"] = str(os.path.getsize(fp))
         # UTF-8 인코딩을 위한 Content-Disposition 헤더 설정 (URL 인코딩)
-        import urllib.parse
         encoded_filename = urllib.parse.quote(korean_filename)
         resp.headers["Content-Disposition"] = f"attachment; filename*=UTF-8''{encoded_filename}"
         return resp
 
-    buf = _zip_paths(out_files)
-    buf.seek(0, os.SEEK_END)
-    length = buf.tell()
-    buf.seek(0)
     # 다중 페이지: 원본파일명_확장자.zip 형식으로 파일명 설정
-    base_name = os.path.splitext(f.filename)[0]
     korean_zip_filename = f"{base_name}_{fmt}.zip"
-    resp = send_file(buf, mimetype="application/zip", as_attachment=True,
-                     download_name=korean_zip_filename)
-    resp.headers["Content-Length"] = str(length)
-    # UTF-8 인코딩을 위한 Content-Disposition 헤더 설정 (URL 인코딩)
-    import urllib.parse
-    encoded_zip_filename = urllib.parse.quote(korean_zip_filename)
-    resp.headers["Content-Disposition"] = f"attachment; filename*=UTF-8''{encoded_zip_filename}"
-    return resp
+    # ZIP을 메모리에 만들지 않고 항목별로 바로 전송 (PNG/JPG/WEBP/GIF는 무압축 저장)
+    return zip_response(
+        _zip_paths(out_files), korean_zip_filename,
+        tee_path=os.path.join(OUTPUT_DIR, f".{uuid4().hex}.zip.part") if cache_key else None,
+        on_complete=lambda p: RESULT_CACHE.put(cache_key, p, "application/zip", korean_zip_filename, base_name),
+    )
 
 # 호환 라우트: 당신의 테스트 URL대로도 동작합니다.
 @app.route("/api/pdf-image/convert_to_images", methods=["POST"])
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+컬러키 투명화 벤치마크: 기존 픽셀 루프 vs NumPy 룩업 테이블 방식
+
+A4 페이지(도형/텍스트가 있는 흰 배경)를 144/300/600 DPI로 렌더링한 뒤
+두 구현의 처리 시간을 비교하고, 결과 알파 채널이 같은지도 확인합니다.
+
+사용법:
+    python bench_colorkey.py                  # 기본: 144,300,600 DPI (기존 방식은 300 DPI까지만)
+    python bench_colorkey.py --dpi 144 300 --legacy-max-dpi 600
+"""
+import argparse
+import time
+
+import fitz
+import numpy as np
+from PIL import Image
+
+from converters.pixel_ops import colorkey_alpha
+
+
+def legacy_colorkey(img: Image.Image, key_rgb=(255, 255, 255), tol=10):
+    """변경 전 구현 (비교용)"""
+    if img.getchannel("A").getextrema() == (255, 255):
+        r0, g0, b0 = key_rgb
+        px = img.load()
+        w, h = img.size
+        for y in range(h):
+            for x in range(w):
+                r, g, b, a = px[x, y]
+                if abs(r - r0) <= tol and abs(g - g0) <= tol and abs(b - b0) <= tol:
+                    px[x, y] = (r, g, b, 0)
+    return img
+
+
+def make_a4_page(dpi: int) -> Image.Image:
+    doc = fitz.open()
+    page = doc.new_page(width=595, height=842)  # A4 (pt)
+    for i in range(40):
+        page.draw_rect(fitz.Rect(40 + i * 12, 60 + i * 15, 120 + i * 12, 100 + i * 15),
+                       color=(0.1, 0.2, 0.6), fill=(0.9, 0.9, 0.85))
+    page.insert_text((72, 760), "Color key benchmark - A4", fontsize=24)
+    pix = page.get_pixmap(matrix=fitz.Matrix(dpi / 72.0, dpi / 72.0), alpha=False)
+    img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples).convert("RGBA")
+    doc.close()
+    return img
+
+
+def timed(fn, img):
+    t0 = time.perf_counter()
+    out = fn(img)
+    return time.perf_counter() - t0, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dpi", type=int, nargs="+", default=[144, 300, 600])
+    ap.add_argument("--legacy-max-dpi", type=int, default=300,
+                    help="이 DPI를 넘으면 기존 픽셀 루프는 건너뜀(600 DPI는 수 분 소요)")
+    ap.add_argument("--tol", type=int, default=10)
+    args = ap.parse_args()
+
+    print(f"{'DPI':>5} {'size':>12} {'legacy(s)':>10} {'numpy(s)':>10} {'speedup':>8}  match")
+    for dpi in args.dpi:
+        base = make_a4_page(dpi)
+        size = f"{base.width}x{base.height}"
+
+        t_new, out_new = timed(lambda im: colorkey_alpha(im, (255, 255, 255), tol=args.tol), base.copy())
+
+        if dpi <= args.legacy_max_dpi:
+            t_old, out_old = timed(lambda im: legacy_colorkey(im, (255, 255, 255), tol=args.tol), base.copy())
+            match = np.array_equal(np.asarray(out_old.getchannel("A")), np.asarray(out_new.getchannel("A")))
+            print(f"{dpi:>5} {size:>12} {t_old:>10.3f} {t_new:>10.3f} {t_old / t_new:>7.1f}x  {match}")
+        else:
+            print(f"{dpi:>5} {size:>12} {'skipped':>10} {t_new:>10.3f} {'-':>8}  -")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+픽셀 마스크 연산 마이크로 벤치마크: 기존 구현 vs converters/pixel_ops
+
+A4 페이지(도형/텍스트가 있는 흰 배경)를 DPI별로 렌더링해 아래 연산을 비교하고 결과가 같은지 확인합니다.
+    white_to_alpha      밝기 기준 흰색→투명 (pdf-png / pdf-image)   : lambda 마스크 + copy vs 캐시 LUT + copy=False
+    white_rgb_to_alpha  R,G,B 기준 흰색→투명 (images-png / images-jpg): getdata/putdata 루프 vs NumPy
+    threshold_mask      임계값 마스크 (pdf-gif)                      : point(lambda) vs 캐시 LUT
+    colorkey_alpha      컬러키 (pdf-image)                            : NumPy 룩업 테이블 (기존 비교는 bench_colorkey.py)
+
+사용법:
+    python bench_pixel_ops.py                          # 기본: 144,300 DPI (getdata 루프는 144 DPI까지만)
+    python bench_pixel_ops.py --dpi 144 300 600 --repeat 5 --legacy-max-dpi 300
+"""
+import argparse
+import time
+
+import fitz
+from PIL import Image
+
+from converters.pixel_ops import colorkey_alpha, threshold_mask, white_rgb_to_alpha, white_to_alpha
+
+
+def legacy_white_to_alpha(rgba: Image.Image, white_threshold: int = 250) -> Image.Image:
+    """변경 전 pdf-png remove_white_to_alpha / pdf-image _remove_white_to_alpha (비교용)"""
+    gray = rgba.convert("L")
+    alpha_mask = gray.point(lambda p: 0 if p >= white_threshold else 255)
+    out = rgba.copy()
+    out.putalpha(alpha_mask)
+    return out
+
+
+def legacy_white_rgb_to_alpha(img: Image.Image, white_threshold: int = 250) -> Image.Image:
+    """변경 전 images-png _remove_white_to_alpha (비교용)"""
+    if img.mode != 'RGBA':
+        img = img.convert('RGBA')
+    datas = img.getdata()
+    newData = []
+    for item in datas:
+        r, g, b, a = item
+        if r >= white_threshold and g >= white_threshold and b >= white_threshold:
+            newData.append((255, 255, 255, 0))
+        else:
+            newData.append((r, g, b, a))
+    img.putdata(newData)
+    return img
+
+
+def legacy_threshold_mask(gray: Image.Image, white_threshold: int = 250) -> Image.Image:
+    """변경 전 pdf-gif 마스크 (비교용)"""
+    return gray.point(lambda p: 255 if p >= white_threshold else 0)
+
+
+def render_a4(dpi: int):
+    """알파 포함으로 렌더링한 A4 Pixmap (서비스와 같은 입력: 읽기 전용 RGBA 뷰의 원본)"""
+    doc = fitz.open()
+    page = doc.new_page(width=595, height=842)
+    page.draw_rect(page.rect, fill=(1, 1, 1))  # 종이 배경
+    for i in range(40):
+        page.draw_rect(fitz.Rect(40 + i * 12, 60 + i * 15, 120 + i * 12, 100 + i * 15),
+                       color=(0.1, 0.2, 0.6), fill=(0.9, 0.9, 0.85))
+    page.insert_text((72, 760), "Pixel ops benchmark - A4", fontsize=24)
+    pix = page.get_pixmap(matrix=fitz.Matrix(dpi / 72.0, dpi / 72.0), alpha=True)
+    doc.close()
+    return pix
+
+
+def best_of(fn, make_input, repeat: int):
+    """입력 준비 시간은 빼고 repeat회 중 가장 빠른 시간과 마지막 결과"""
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        arg = make_input()
+        t0 = time.perf_counter()
+        out = fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dpi", type=int, nargs="+", default=[144, 300])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--threshold", type=int, default=250)
+    ap.add_argument("--legacy-max-dpi", type=int, default=144,
+                    help="이 DPI를 넘으면 getdata/putdata 루프는 건너뜀(300 DPI는 수십 초 소요)")
+    args = ap.parse_args()
+    th = args.threshold
+
+    print(f"{'op':<20} {'DPI':>5} {'size':>12} {'legacy(ms)':>11} {'new(ms)':>9} {'speedup':>8}  match")
+    for dpi in args.dpi:
+        pix = render_a4(dpi)
+        size = f"{pix.width}x{pix.height}"
+        rgba = Image.frombytes("RGBA", (pix.width, pix.height), pix.samples)
+        view = lambda: Image.frombuffer("RGBA", rgba.size, pix.samples, "raw", "RGBA", 0, 1)  # pix_bridge와 같은 읽기 전용 뷰
+        gray = rgba.convert("L")
+
+        cases = [
+            ("white_to_alpha",
+             lambda im: legacy_white_to_alpha(im, th), lambda im: white_to_alpha(im, th, copy=False), view),
+            ("white_rgb_to_alpha",
+             (lambda im: legacy_white_rgb_to_alpha(im, th)) if dpi <= args.legacy_max_dpi else None,
+             lambda im: white_rgb_to_alpha(im, th), rgba.copy),
+            ("threshold_mask",
+             lambda im: legacy_threshold_mask(im, th), lambda im: threshold_mask(im, th), lambda: gray),
+            ("colorkey_alpha",
+             None, lambda im: colorkey_alpha(im, (255, 255, 255), tol=255 - th), rgba.copy),
+        ]
+        for name, legacy, new, make_input in cases:
+            t_new, out_new = best_of(new, make_input, args.repeat)
+            if legacy is None:
+                print(f"{name:<20} {dpi:>5} {size:>12} {'-':>11} {t_new * 1000:>9.1f} {'-':>8}  -")
+                continue
+            t_old, out_old = best_of(legacy, make_input, 1 if name == "white_rgb_to_alpha" else args.repeat)
+            match = out_old.tobytes() == out_new.tobytes()
+            print(f"{name:<20} {dpi:>5} {size:>12} {t_old * 1000:>11.1f} {t_new * 1000:>9.1f} "
+                  f"{t_old / t_new:>7.1f}x  {match}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+"""
+스트리밍 ZIP / 파일 응답
+
+기존에는 결과 전체를 BytesIO에 ZIP으로 만들거나, 완성된 파일을 통째로 읽은 뒤 send_file로 보냈습니다.
+200페이지 300DPI PNG 내보내기 같은 요청 하나가 수백 MB를 메모리에 들고 있었던 이유입니다.
+여기서는 ZIP 항목을 만들어지는 즉시 청크로 내보내고(Transfer-Encoding: chunked),
+완성된 파일은 열린 파일 핸들 그대로 조금씩 전송합니다.
+
+- PNG/JPEG/WEBP/GIF 등 이미 압축된 형식은 ZIP_STORED로 저장 (deflate해도 줄지 않고 CPU만 소모)
+- 항목 원본은 파일 경로, bytes, 또는 bytes 청크 이터레이터 (페이지를 렌더링하면서 바로 넘길 수 있음)
+- tee_path를 주면 보낸 바이트를 파일로도 기록하고, 끝까지 전송되면 on_complete(tee_path)를 호출 (결과 캐시 저장용)
+"""
+import logging
+import os
+import time
+import urllib.parse
+import zipfile
+
+from flask import Response, send_file
+
+STORED_EXTS = {".png", ".jpg", ".jpeg", ".webp", ".gif", ".zip"}
+CHUNK_SIZE = 256 * 1024
+
+
+def compression_for(name: str) -> int:
+    """이미 압축된 형식이면 ZIP_STORED, 그 외(SVG, BMP, TIFF 등)는 ZIP_DEFLATED"""
+    return zipfile.ZIP_STORED if os.path.splitext(name)[1].lower() in STORED_EXTS else zipfile.ZIP_DEFLATED
+
+
+class _ChunkSink:
+    """ZipFile이 쓰는 바이트를 모아 두는 쓰기 전용 스트림 (seek 불가 → ZipFile이 데이터 디스크립터 사용)"""
+
+    def __init__(self, tee=None):
+        self._chunks = []
+        self._size = 0
+        self._tee = tee
+
+    def write(self, b):
+        b = bytes(b)
+        if b:
+            self._chunks.append(b)
+            self._size += len(b)
+            if self._tee is not None:
+                self._tee.write(b)
+        return len(b)
+
+    def flush(self):
+        pass
+
+    def drain(self, min_size: int = 0) -> bytes:
+        if not self._chunks or self._size < min_size:
+            return b""
+        data = b"".join(self._chunks)
+        self._chunks, self._size = [], 0
+        return data
+
+
+def _zipinfo(arcname: str, src) -> zipfile.ZipInfo:
+    if isinstance(src, str):
+        zinfo = zipfile.ZipInfo.from_file(src, arcname)
+    else:
+        zinfo = zipfile.ZipInfo(arcname, time.localtime()[:6])
+        zinfo.external_attr = 0o644 << 16
+        if isinstance(src, (bytes, bytearray, memoryview)):
+            zinfo.file_size = len(src)  # 4GB 초과 시 zip64 판단에 사용
+    zinfo.compress_type = compression_for(arcname)
+    return zinfo
+
+
+def _iter_source(src):
+    if isinstance(src, str):
+        with open(src, "rb") as f:
+            while True:
+                block = f.read(CHUNK_SIZE)
+                if not block:
+                    break
+                yield block
+    elif isinstance(src, (bytes, bytearray, memoryview)):
+        yield src
+    else:
+        yield from src
+
+
+def iter_zip(entries, tee=None):
+    """(arcname, 원본) 항목들로 ZIP을 만들면서 완성된 바이트 청크를 차례로 내보내는 제너레이터"""
+    sink = _ChunkSink(tee)
+    with zipfile.ZipFile(sink, "w") as zf:
+        for arcname, src in entries:
+            with zf.open(_zipinfo(arcname, src), "w") as dst:
+                for block in _iter_source(src):
+                    dst.write(block)
+                    data = sink.drain(CHUNK_SIZE)
+                    if data:
+                        yield data
+            data = sink.drain(CHUNK_SIZE)
+            if data:
+                yield data
+    data = sink.drain()
+    if data:
+        yield data
+
+
+def _attachment_headers(resp, download_name: str):
+    resp.headers["Cache-Control"] = "no-store"
+    resp.headers["Content-Disposition"] = f"attachment; filename*=UTF-8''{urllib.parse.quote(download_name)}"
+    return resp
+
+
+def zip_response(entries, download_name: str, tee_path: str = None, on_complete=None, cleanup=None):
+    """
+    ZIP을 청크 단위로 스트리밍하는 응답
+
+    entries는 지연 이터레이터여도 되며, 응답 본문을 보내는 동안 소비됩니다.
+    cleanup()은 전송이 끝나거나 중단된 뒤 항상 호출되므로 입력/임시 파일 정리에 사용합니다.
+    """
+    def generate():
+        tee = open(tee_path, "wb") if tee_path else None
+        completed = False
+        try:
+            yield from iter_zip(entries, tee)
+            completed = True
+        finally:
+            if tee is not None:
+                tee.close()
+                try:
+                    if completed and on_complete:
+                        on_complete(tee_path)
+                except Exception:
+                    logging.exception("zip_response on_complete failed")
+                finally:
+                    try:
+                        os.remove(tee_path)
+                    except OSError:
+                        pass
+            if cleanup:
+                cleanup()
+
+    resp = Response(generate(), mimetype="application/zip")
+    return _attachment_headers(resp, download_name)
+
+
+def send_file_stream(path: str, download_name: str, ctype: str):
+    """
+    완성된 파일을 메모리에 올리지 않고 청크 단위로 전송
+
+    응답을 만들 때 파일을 열어 두므로, 호출 직후 원본을 삭제해도 전송은 끝까지 이어집니다(POSIX).
+    """
+    f = open(path, "rb")
+    size = os.fstat(f.fileno()).st_size
+    resp = send_file(f, mimetype=ctype, as_attachment=True, download_name=download_name, conditional=False)
+    resp.headers["Content-Length"] = str(size)
+    return _attachment_headers(resp, download_name)
@@ -3,15 +3,17 @@ from flask_cors import CORS
 from concurrent.futures import ThreadPoolExecutor
 from uuid import uuid4
 import os
-import shutil
 import tempfile
 import zipfile
-from pdf2image import convert_from_bytes
+import fitz  # PyMuPDF
+from pix_bridge import render_page, pix_to_pil
 from PIL import Image
 import io
 import logging
 import re
 import urllib.parse
+from job_store import create_job_store
+from result_cache import create_result_cache, save_upload_hashed
 
 logging.basicConfig(level=logging.INFO)
 
@@ -38,7 +40,8 @@ CORS(app, resources={
 
 # 비동기 처리를 위한 전역 변수
 executor = ThreadPoolExecutor(max_workers=2)
-JOBS = {}  # job_id -> {"status": "pending|done|error", "path": "", "name": "", "ctype": "", "error": "", "progress": 0, "message": ""}
+RESULT_CACHE = create_result_cache(BASE_DIR)  # 동일 입력+옵션 결과 재사용 (비활성화 시 None)
+JOBS = create_job_store(BASE_DIR)  # job_id -> {"status": "pending|done|error", "path": "", "name": "", "ctype": "", "error": "", "progress": 0, "message": ""}
 
 def safe_base_name(filename: str) -> str:
     base = os.path.splitext(os.path.basename(filename or "output"))[0]
@@ -54,21 +57,35 @@ def attach_download_headers(resp, download_name: str):
 
 def set_progress(job_id, p, msg=None):
     """진행률 업데이트 도우미 함수"""
-    info = JOBS.get(job_id)
-    if not info: return
-    info["progress"] = int(p)
-    if msg:
-        info["message"] = msg
+    if job_id not in JOBS: return
+    JOBS.set_progress(job_id, p, msg or None)
+
+def iter_pdf_pages(file_path, dpi):
+    """
+    PDF를 한 페이지씩 렌더링해서 (페이지 번호, PIL 이미지)를 순서대로 내보내는 제너레이터
 
-def perform_jpg_conversion(file_path, quality, scale, base_name):
+    convert_from_bytes처럼 전체 페이지를 메모리에 올리지 않고,
+    호출 측에서 저장을 끝내면 다음 페이지를 렌더링하므로 피크 메모리는 한 페이지 분량입니다.
     """
-    PDF를 JPG로 변환하는 핵심 함수
+    mat = fitz.Matrix(dpi / 72.0, dpi / 72.0)
+    doc = fitz.open(file_path)
+    try:
+        for i in range(doc.page_count):
+            # 인코더가 쓰는 RGB로 바로 렌더링하고, samples 복사 없이 PIL 이미지로 감쌈
+            yield i + 1, pix_to_pil(render_page(doc.load_page(i), mat, "RGB"))
+    finally:
+        doc.close()
+
+def perform_jpg_conversion(file_path, quality, scale, base_name, progress_cb=None):
+    """
+    PDF를 JPG로 변환하는 핵심 함수 (페이지 단위 스트리밍)
     
     Args:
         file_path: 저장된 PDF 경로
         quality: "low"|"medium"|"high"
         scale: 문자열/숫자(예: "1.0")
         base_name: 원본 파일명(확장자 제거)
+        progress_cb: (선택) progress_cb(done, total) 형태의 페이지 진행률 콜백
     
     Returns:
         (output_path, download_name, content_type)
@@ -87,56 +104,50 @@ def perform_jpg_conversion(file_path, quality, scale, base_name):
             
             print(f"[DEBUG] 변환 시작 - 파일: {file_path}, 기본 파일명: {base_name}")
             
-            # pdf2image를 사용하여 PDF를 이미지로 변환
-            with open(file_path, 'rb') as pdf_file:
-                pdf_bytes = pdf_file.read()
-            
-            # PDF를 PIL 이미지로 변환
-            images = convert_from_bytes(pdf_bytes, dpi=dpi, fmt='JPEG')
-            page_count = len(images)
-            print(f"[DEBUG] PDF 변환 완료 - 총 {page_count}개 페이지 발견")
+            with fitz.open(file_path) as doc:
+                page_count = doc.page_count
+            print(f"[DEBUG] PDF 열기 완료 - 총 {page_count}개 페이지 발견")
             
             if page_count == 0:
                 raise Exception('PDF 파일에 페이지가 없습니다.')
             
-            # 임시 폴더에 JPG 파일들 생성
-            tmp_image_paths = []
-            for page_num, pil_image in enumerate(images):
-                output_image_filename = f"{base_name}_page_{page_num+1}.jpg"
-                tmp_image_path = os.path.join(tmp_dir, output_image_filename)
-                pil_image.save(tmp_image_path, 'JPEG')
-                tmp_image_paths.append(tmp_image_path)
-                print(f"[DEBUG] 페이지 {page_num+1} 저장 완료: {output_image_filename}")
-            
-            print(f"[DEBUG] 최종 페이지 수: {page_count}")
-            
             if page_count == 1:
-                # 단일 페이지: JPG 파일을 OUTPUTS_DIR로 이동
+                # 단일 페이지: OUTPUTS_DIR에 바로 JPG 저장
                 final_name = f"{base_name}.jpg"
                 final_path = os.path.join(OUTPUTS_DIR, final_name)
                 if os.path.exists(final_path):
                     os.remove(final_path)
-                shutil.move(tmp_image_paths[0], final_path)
-                print(f"[DEBUG] 단일 페이지 처리 - JPG 파일({final_name})을 {final_path}로 이동")
+                for page_num, pil_image in iter_pdf_pages(file_path, dpi):
+                    pil_image.save(final_path, 'JPEG')
+                    pil_image.close()
+                    if progress_cb:
+                        progress_cb(page_num, page_count)
+                print(f"[DEBUG] 단일 페이지 처리 - JPG 파일({final_name})을 {final_path}에 저장")
                 return final_path, final_name, "image/jpeg"
             
-            else:
-                # 다중 페이지: ZIP 파일을 OUTPUTS_DIR에 생성
-                pad = max(2, len(str(page_count)))
-                final_name = f"{base_name}.zip"
-                final_path = os.path.join(OUTPUTS_DIR, final_name)
-                if os.path.exists(final_path):
-                    os.remove(final_path)
-                print(f"[DEBUG] 다중 페이지 처리 - {page_count}장을 ZIP 파일({final_name})로 압축")
-                
-                with zipfile.ZipFile(final_path, 'w', zipfile.ZIP_DEFLATED) as zf:
-                    for i, tmp_path in enumerate(tmp_image_paths, start=1):
-                        arcname = f"{base_name}_{i:0{pad}d}.jpg"
-                        zf.write(tmp_path, arcname=arcname)
-                        print(f"[DEBUG] ZIP에 추가: {os.path.basename(tmp_path)}")
-                
-                print(f"[DEBUG] ZIP 파일 생성 완료: {final_name}")
-                return final_path, final_name, "application/zip"
+            # 다중 페이지: 한 페이지씩 렌더링 → 인코딩 → ZIP에 추가 후 바로 해제
+            pad = max(2, len(str(page_count)))
+            final_name = f"{base_name}.zip"
+            final_path = os.path.join(OUTPUTS_DIR, final_name)
+            if os.path.exists(final_path):
+                os.remove(final_path)
+            print(f"[DEBUG] 다중 페이지 처리 - {page_count}장을 ZIP 파일({final_name})로 압축")
+            
+            # JPEG는 이미 압축돼 있어 deflate해도 줄지 않으므로 무압축 저장
+            with zipfile.ZipFile(final_path, 'w', zipfile.ZIP_STORED) as zf:
+                for page_num, pil_image in iter_pdf_pages(file_path, dpi):
+                    tmp_path = os.path.join(tmp_dir, f"{base_name}_page_{page_num}.jpg")
+                    pil_image.save(tmp_path, 'JPEG')
+                    pil_image.close()
+                    arcname = f"{base_name}_{page_num:0{pad}d}.jpg"
+                    zf.write(tmp_path, arcname=arcname)
+                    os.remove(tmp_path)
+                    if progress_cb:
+                        progress_cb(page_num, page_count)
+                    print(f"[DEBUG] ZIP에 추가: {arcname}")
+            
+            print(f"[DEBUG] ZIP 파일 생성 완료: {final_name}")
+            return final_path, final_name, "application/zip"
                 
         except Exception as e:
             print(f"[ERROR] JPG 변환 중 오류 발생: {e}")
@@ -190,20 +201,33 @@ def convert():
 
         # 임시 PDF 파일 저장 (UPLOADS_DIR 사용)
         temp_pdf = tempfile.NamedTemporaryFile(delete=False, suffix='.pdf', dir=UPLOADS_DIR)
-        file.save(temp_pdf.name)
-        input_path = temp_pdf.name
         temp_pdf.close()
+        input_path = temp_pdf.name
+        digest = save_upload_hashed(file, input_path)
         
         app.logger.info(f"Saved temp file: {input_path}")
         
         # 파일명에서 base_name 추출
         base_name = safe_base_name(file.filename)
         
+        # 같은 PDF + 같은 옵션이면 캐시된 결과를 바로 반환 (렌더링 생략)
+        cache_key = None
+        if RESULT_CACHE is not None:
+            cache_key = RESULT_CACHE.make_key(digest, fmt="jpg", quality=quality, scale=scale)
+            hit = RESULT_CACHE.get(cache_key)
+            if hit:
+                app.logger.info(f"Result cache hit: {cache_key[:12]}")
+                return send_file(hit.path, as_attachment=True, download_name=hit.download_name(base_name),
+                                 mimetype=hit.content_type)
+        
         # 변환 함수 호출
         output_path, download_name, content_type = perform_jpg_conversion(input_path, quality, scale, base_name)
         
         app.logger.info(f"Conversion completed: {output_path}, exists: {os.path.exists(output_path)}")
         
+        if cache_key:
+            RESULT_CACHE.put(cache_key, output_path, content_type, download_name, base_name)
+        
         # 파일 전송
         return send_file(output_path, as_attachment=True, download_name=download_name, mimetype=content_type)
     
@@ -243,8 +267,13 @@ def convert_async():
         try:
             set_progress(job_id, 10, "변환 준비 중")
             # 변환 시작 직전
-            set_progress(job_id, 50, "페이지 래스터라이즈 중")
-            out_path, name, ctype = perform_jpg_conversion(in_path, quality, scale, base_name)
+            set_progress(job_id, 20, "페이지 래스터라이즈 중")
+            out_path, name, ctype = perform_jpg_conversion(
+                in_path, quality, scale, base_name,
+                progress_cb=lambda done, total: set_progress(
+                    job_id, 20 + int(70 * done / total), f"페이지 {done}/{total} 처리 중"
+                )
+            )
             set_progress(job_id, 90, "파일 생성 중")
             
             JOBS[job_id] = {
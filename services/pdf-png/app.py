@@ -6,6 +6,7 @@ import shutil
 import errno
 import zipfile
 import logging
+import itertools
 from uuid import uuid4
 from concurrent.futures import ThreadPoolExecutor
 
@@ -15,6 +16,13 @@ from werkzeug.exceptions import HTTPException
 import fitz  # PyMuPDF
 from PIL import Image
 
+from page_renderer import render_pages, resolve_workers
+from pix_bridge import pix_to_pil
+from pixel_ops import white_to_alpha
+from job_store import create_job_store
+from result_cache import create_result_cache, save_upload_hashed
+from zip_stream import send_file_stream, zip_response
+
 app = Flask(__name__, static_folder="web", static_url_path="")
 logging.basicConfig(level=logging.INFO)
 
@@ -40,7 +48,8 @@ os.makedirs(UPLOADS_DIR, exist_ok=True)
 os.makedirs(OUTPUTS_DIR, exist_ok=True)
 
 executor = ThreadPoolExecutor(max_workers=2)
-JOBS = {}
+JOBS = create_job_store(BASE_DIR)
+RESULT_CACHE = create_result_cache(BASE_DIR)  # 동일 입력+옵션 결과 재사용 (비활성화 시 None)
 current_job_id = None
 
 def safe_base_name(filename: str) -> str:
@@ -48,83 +57,62 @@ def safe_base_name(filename: str) -> str:
     return base.replace("/", "_").replace("\\", "_").strip() or "output"
 
 def set_progress(job_id, p, msg=None):
-    info = JOBS.setdefault(job_id, {})
-    info["progress"] = int(p)
-    if msg is not None:
-        info["message"] = msg
+    JOBS.set_progress(job_id, p, msg)
 
-def send_download_memory(path: str, download_name: str, ctype: str):
+def send_download_file(path: str, download_name: str, ctype: str):
     if not path or not os.path.exists(path):
         return jsonify({"error": "output file missing"}), 500
-    with open(path, "rb") as f:
-        data = f.read()
-    resp = send_file(
-        io.BytesIO(data),
-        mimetype=ctype,
-        as_attachment=True,
-        download_name=download_name,
-        conditional=False
-    )
-    resp.direct_passthrough = False
-    resp.headers["Content-Length"] = str(len(data))
-    resp.headers["Cache-Control"] = "no-store"
-    quoted = urllib.parse.quote(download_name)
-    resp.headers["Content-Disposition"] = f"attachment; filename*=UTF-8''{quoted}"
-    return resp
+    return send_file_stream(path, download_name, ctype)
 
 def pix_to_rgba(pix: fitz.Pixmap) -> Image.Image:
-    mode = "RGBA" if pix.alpha else "RGB"
-    img = Image.frombytes(mode, [pix.width, pix.height], pix.samples)
-    return img if mode == "RGBA" else img.convert("RGBA")
-
-def remove_white_to_alpha(rgba: Image.Image, white_threshold: int = 250) -> Image.Image:
-    # 밝은 영역(종이 배경)을 투명으로
-    gray = rgba.convert("L")
-    alpha_mask = gray.point(lambda p: 0 if p >= white_threshold else 255)
-    out = rgba.copy()
-    out.putalpha(alpha_mask)
-    return out
+    # alpha=True로 렌더링한 Pixmap은 복사 없이 RGBA 이미지로 감싸짐
+    img = pix_to_pil(pix)
+    return img if img.mode == "RGBA" else img.convert("RGBA")
+
+def iter_png_pages(in_path: str, base_name: str, page_count: int,
+                   scale: float = 1.0,
+                   transparent: int = 0,
+                   white_threshold: int = 250,
+                   workers: int = 1,
+                   job_id=None):
+    """페이지를 렌더링하는 대로 (ZIP 내 파일명, PNG 바이트)를 내보내는 제너레이터"""
+    # 알파 포함 렌더(투명 처리 대비), workers > 1이면 프로세스 풀에서 병렬 렌더링
+    for pix in render_pages(in_path, range(1, page_count + 1), scale=scale, alpha=True, workers=workers):
+        i = pix.number - 1
+        set_progress(job_id, 10 + int(80 * (i + 1) / page_count), f"페이지 {i+1}/{page_count} 처리 중")
+        rgba = pix_to_rgba(pix)
+        if transparent:
+            # 밝은 영역(종이 배경)을 투명으로 (추가 copy 없이 알파만 교체)
+            rgba = white_to_alpha(rgba, white_threshold=white_threshold, copy=False)
+        buf = io.BytesIO()
+        rgba.save(buf, format="PNG", optimize=True)
+        yield f"{base_name}_{i+1:02d}.png", buf.getvalue()
 
 def perform_png_conversion(in_path: str, base_name: str,
                           scale: float = 1.0,
                           transparent: int = 0,
-                          white_threshold: int = 250):
-    with tempfile.TemporaryDirectory(dir=OUTPUTS_DIR) as tmp:  # 같은 디스크에 임시폴더
-        doc = fitz.open(in_path)
-        mat = fitz.Matrix(scale, scale)
+                          white_threshold: int = 250,
+                          workers: int = 1):
+    with fitz.open(in_path) as doc:
         page_count = doc.page_count
-        out_paths = []
-
-        for i in range(page_count):
-            set_progress(current_job_id, 10 + int(80 * (i + 1) / page_count), f"페이지 {i+1}/{page_count} 처리 중")
-            page = doc.load_page(i)
-            # 알파 포함 렌더(투명 처리 대비)
-            pix = page.get_pixmap(matrix=mat, alpha=True)
-            rgba = pix_to_rgba(pix)
-            if transparent:
-                rgba = remove_white_to_alpha(rgba, white_threshold=white_threshold)
-            out_path = os.path.join(tmp, f"{base_name}_{i+1:02d}.png")
-            rgba.save(out_path, format="PNG", optimize=True)
-            out_paths.append(out_path)
-
-        doc.close()
-
-        if len(out_paths) == 1:
-            final_name = f"{base_name}.png"
-            final_path = os.path.join(OUTPUTS_DIR, final_name)
-            if os.path.exists(final_path): 
-                os.remove(final_path)
-            shutil.move(out_paths[0], final_path)  # EXDEV 안전
-            return final_path, final_name, "image/png"
+    pages = iter_png_pages(in_path, base_name, page_count, scale, transparent, white_threshold,
+                           workers, job_id=current_job_id)
 
-        final_name = f"{base_name}.zip"
+    if page_count == 1:
+        final_name = f"{base_name}.png"
         final_path = os.path.join(OUTPUTS_DIR, final_name)
-        if os.path.exists(final_path): 
-            os.remove(final_path)
-        with zipfile.ZipFile(final_path, "w", zipfile.ZIP_DEFLATED) as zf:
-            for p in out_paths:
-                zf.write(p, arcname=os.path.basename(p))
-        return final_path, final_name, "application/zip"
+        _, data = next(pages)
+        with open(final_path, "wb") as f:
+            f.write(data)
+        return final_path, final_name, "image/png"
+
+    # 페이지를 임시 파일로 저장했다가 다시 복사하지 않고 바로 ZIP에 기록 (PNG는 이미 압축돼 있어 STORED)
+    final_name = f"{base_name}.zip"
+    final_path = os.path.join(OUTPUTS_DIR, final_name)
+    with zipfile.ZipFile(final_path, "w", zipfile.ZIP_STORED) as zf:
+        for arcname, data in pages:
+            zf.writestr(arcname, data)
+    return final_path, final_name, "application/zip"
 
 @app.get("/")
 def index():
@@ -155,9 +143,10 @@ def convert_async():
     scale = clamp_num(request.form.get("scale", "1.0"), 0.2, 2.0, 1.0, float)
     transparent = clamp_num(request.form.get("transparent", "0"), 0, 1, 0, int)
     white_threshold = clamp_num(request.form.get("white_threshold", "250"), 0, 255, 250, int)
+    workers = resolve_workers(clamp_num(request.form.get("workers", "1"), 1, 64, 1, int))
 
     JOBS[job_id] = {"status": "pending", "progress": 1, "message": "대기 중"}
-    app.logger.info(f"[{job_id}] uploaded: {in_path}, base={base_name}, scale={scale}, transparent={transparent}, th={white_threshold}")
+    app.logger.info(f"[{job_id}] uploaded: {in_path}, base={base_name}, scale={scale}, transparent={transparent}, th={white_threshold}, workers={workers}")
 
     def run_job():
         global current_job_id
@@ -165,22 +154,24 @@ def convert_async():
         try:
             set_progress(job_id, 5, "변환 시작")
             final_path, final_name, content_type = perform_png_conversion(
-                in_path, base_name, scale, transparent, white_threshold
+                in_path, base_name, scale, transparent, white_threshold, workers
             )
             set_progress(job_id, 100, "완료")
-            JOBS[job_id].update({
-                "status": "completed",
-                "output_path": final_path,
-                "filename": final_name,
-                "content_type": content_type
-            })
+            JOBS.patch(
+                job_id,
+                status="completed",
+                output_path=final_path,
+                filename=final_name,
+                content_type=content_type
+            )
         except Exception as e:
             app.logger.error(f"[{job_id}] conversion failed: {str(e)}")
-            JOBS[job_id].update({
-                "status": "failed",
-                "error": str(e),
-                "message": f"오류: {str(e)}"
-            })
+            JOBS.patch(
+                job_id,
+                status="failed",
+                error=str(e),
+                message=f"오류: {str(e)}"
+            )
         finally:
             # 입력 파일 정리
             if os.path.exists(in_path):
@@ -219,7 +210,7 @@ def download_result(job_id):
         return jsonify({"error": "Output file not found"}), 404
     
     try:
-        return send_download_memory(
+        return send_download_file(
             output_path,
             job["filename"],
             job["content_type"]
@@ -251,29 +242,71 @@ def convert_sync():
     scale = clamp_num(request.form.get("scale", "1.0"), 0.2, 2.0, 1.0, float)
     transparent = clamp_num(request.form.get("transparent", "0"), 0, 1, 0, int)
     white_threshold = clamp_num(request.form.get("white_threshold", "250"), 0, 255, 250, int)
+    workers = resolve_workers(clamp_num(request.form.get("workers", "1"), 1, 64, 1, int))
     
     base_name = safe_base_name(f.filename)
     
     # 입력 파일 저장
     job_id = uuid4().hex
     in_path = os.path.join(UPLOADS_DIR, f"{job_id}.pdf")
-    f.save(in_path)
+    digest = save_upload_hashed(f, in_path)
+    streaming = False
     
     try:
+        # 같은 PDF + 같은 옵션이면 캐시된 결과를 바로 반환 (렌더링 생략)
+        cache_key = None
+        if RESULT_CACHE is not None:
+            cache_key = RESULT_CACHE.make_key(
+                digest, fmt="png", scale=scale, transparent=transparent,
+                white_threshold=white_threshold if transparent else None
+            )
+            hit = RESULT_CACHE.get(cache_key)
+            if hit:
+                app.logger.info(f"result cache hit: {cache_key[:12]}")
+                return send_download_file(hit.path, hit.download_name(base_name), hit.content_type)
+        
+        with fitz.open(in_path) as doc:
+            page_count = doc.page_count
+        if page_count > 1:
+            # 여러 페이지는 렌더링하는 대로 ZIP 청크를 바로 전송 (결과 전체를 메모리/디스크에 모으지 않음)
+            zip_name = f"{base_name}.zip"
+
+            def cleanup():
+                try:
+                    os.remove(in_path)
+                except OSError:
+                    pass
+
+            # 첫 페이지는 응답 전에 렌더링: 열기/첫 렌더 실패는 JSON 500으로 돌려줌
+            # (스트리밍이 시작된 뒤 N번째 페이지에서 실패하면 200 응답의 ZIP 본문이 중간에 끊김)
+            pages = iter_png_pages(in_path, base_name, page_count, scale, transparent, white_threshold, workers)
+            first_page = next(pages)
+
+            streaming = True
+            return zip_response(
+                itertools.chain([first_page], pages),
+                zip_name,
+                tee_path=os.path.join(OUTPUTS_DIR, f"{job_id}.zip.part") if cache_key else None,
+                on_complete=lambda p: RESULT_CACHE.put(cache_key, p, "application/zip", zip_name, base_name),
+                cleanup=cleanup,
+            )
+        
         global current_job_id
         current_job_id = job_id
         final_path, final_name, content_type = perform_png_conversion(
-            in_path, base_name, scale, transparent, white_threshold
+            in_path, base_name, scale, transparent, white_threshold, workers
         )
+        if cache_key:
+            RESULT_CACHE.put(cache_key, final_path, content_type, final_name, base_name)
         
-        return send_download_memory(final_path, final_name, content_type)
+        return send_download_file(final_path, final_name, content_type)
         
     except Exception as e:
         app.logger.error(f"Sync conversion failed: {str(e)}")
         return jsonify({"error": str(e)}), 500
     finally:
-        # 정리
-        if os.path.exists(in_path):
+        # 정리 (스트리밍 응답이면 전송이 끝난 뒤 cleanup()이 입력 파일을 지움)
+        if not streaming and os.path.exists(in_path):
             try:
                 os.remove(in_path)
             except:
@@ -4,9 +4,10 @@ from werkzeug.exceptions import HTTPException
 import io, os, urllib.parse, tempfile, shutil, errno, logging
 from uuid import uuid4
 from concurrent.futures import ThreadPoolExecutor
-import fitz  # PyMuPDF
-from pptx import Presentation
-from pptx.util import Emu
+
+from page_renderer import resolve_workers
+from slide_builder import DEFAULT_JPEG_QUALITY, build_pptx, normalize_image_format
+from job_store import create_job_store
 
 # Adobe PDF Services SDK imports - v4.2.0 compatible
 try:
@@ -47,17 +48,14 @@ os.makedirs(UPLOADS_DIR, exist_ok=True)
 os.makedirs(OUTPUTS_DIR, exist_ok=True)
 
 executor = ThreadPoolExecutor(max_workers=2)
-JOBS = {}
+JOBS = create_job_store(BASE_DIR)
 
 def safe_base_name(filename: str) -> str:
     base = os.path.splitext(os.path.basename(filename or "output"))[0]
     return base.replace("/", "").replace("\\", "").strip() or "output"
 
 def set_progress(job_id, p, msg=None):
-    info = JOBS.setdefault(job_id, {})
-    info["progress"] = int(p)
-    if msg is not None:
-        info["message"] = msg
+    JOBS.set_progress(job_id, p, msg)
 
 def send_download_memory(path: str, download_name: str, ctype: str):
     if not path or not os.path.exists(path):
@@ -143,42 +141,25 @@ def perform_pptx_conversion_adobe(in_path: str, base_name: str):
     _export_via_adobe(in_path, "PPTX", final_path)
     return final_path, final_name, "application/vnd.openxmlformats-officedocument.presentationml.presentation"
 
-def perform_pptx_conversion(in_path: str, base_name: str, scale: float = 1.0, job_id: str = None):
+def perform_pptx_conversion(in_path: str, base_name: str, scale: float = 1.0, job_id: str = None, workers: int = 1,
+                            image_format: str = "png", quality: int = DEFAULT_JPEG_QUALITY):
     """
     PDF → PPTX (페이지당 슬라이드 1장, 전체 이미지 맞춤)
+    workers > 1이면 페이지 렌더링/인코딩을 프로세스 풀에 분배(슬라이드 순서는 유지)
+    image_format: "png"(기본) | "jpeg" (quality로 화질/용량 조절)
     """
-    with tempfile.TemporaryDirectory(dir=OUTPUTS_DIR) as tmp:
-        doc = fitz.open(in_path)
-        mat = fitz.Matrix(scale, scale)
-        prs = Presentation()
-        
-        # 첫 페이지 이미지 크기에 맞춰 슬라이드 크기(EMU) 설정
-        first = doc.load_page(0)
-        pix0 = first.get_pixmap(matrix=mat, alpha=False)
-        # 1 px ≈ 9525 EMU
-        prs.slide_width = Emu(pix0.width * 9525)
-        prs.slide_height = Emu(pix0.height * 9525)
-
-        for i in range(doc.page_count):
-            # job_id가 있을 때만 progress 업데이트 (비동기식에서만)
-            if job_id:
-                set_progress(job_id, 10 + int(80 * (i + 1) / doc.page_count), f"페이지 {i+1}/{doc.page_count} 처리 중")
-            page = doc.load_page(i)
-            pix = page.get_pixmap(matrix=mat, alpha=False)
-            img_path = os.path.join(tmp, f"{base_name}_{i+1:02d}.png")
-            pix.save(img_path)
-
-            blank = prs.slide_layouts[6]  # Blank
-            slide = prs.slides.add_slide(blank)
-            # 전체 채우기
-            slide.shapes.add_picture(img_path, Emu(0), Emu(0), width=prs.slide_width, height=prs.slide_height)
-
-        final_name = f"{base_name}.pptx"
-        final_path = os.path.join(OUTPUTS_DIR, final_name)
-        if os.path.exists(final_path): 
-            os.remove(final_path)
-        prs.save(final_path)
-        return final_path, final_name, "application/vnd.openxmlformats-officedocument.presentationml.presentation"
+    def on_slide(done, total):
+        # job_id가 있을 때만 progress 업데이트 (비동기식에서만)
+        if job_id:
+            set_progress(job_id, 10 + int(80 * done / total), f"페이지 {done}/{total} 처리 중")
+
+    final_name = f"{base_name}.pptx"
+    final_path = os.path.join(OUTPUTS_DIR, final_name)
+    if os.path.exists(final_path): 
+        os.remove(final_path)
+    build_pptx(in_path, final_path, scale=scale, image_format=image_format, quality=quality,
+               workers=workers, progress=on_slide)
+    return final_path, final_name, "application/vnd.openxmlformats-officedocument.presentationml.presentation"
 
 @app.get("/")
 def index():
@@ -216,6 +197,9 @@ def convert_async():
         return max(lo, min(hi, x))
 
     scale = clamp_num(request.form.get("scale","1.0"), 0.2, 2.0, 1.0, float)
+    workers = resolve_workers(clamp_num(request.form.get("workers", "1"), 1, 64, 1, int))
+    image_format = normalize_image_format(request.form.get("image_format", "png"))
+    jpeg_quality = clamp_num(request.form.get("jpeg_quality", DEFAULT_JPEG_QUALITY), 30, 95, DEFAULT_JPEG_QUALITY, int)
 
     JOBS[job_id] = {"status":"pending","progress":1,"message":"대기 중"}
     app.logger.info(f"[{job_id}] uploaded: {in_path}, base={base_name}, scale={scale}")
@@ -231,7 +215,8 @@ def convert_async():
         except Exception as e:
             app.logger.exception("Adobe export failed; fallback to image-based.")
             set_progress(job_id, 50, "이미지 기반 폴백 변환 중")
-            out_path, name, ctype = perform_pptx_conversion(in_path, base_name, scale=scale, job_id=job_id)
+            out_path, name, ctype = perform_pptx_conversion(in_path, base_name, scale=scale, job_id=job_id, workers=workers,
+                                                            image_format=image_format, quality=jpeg_quality)
         
         JOBS[job_id] = {"status":"done","path":out_path,"name":name,"ctype":ctype,"progress":100,"message":"완료"}
         
@@ -283,6 +268,10 @@ def convert_sync():
             return default
         return max(lo, min(hi, x))
     scale = clamp_num(request.form.get("scale","1.0"), 0.2, 2.0, 1.0, float)
+    workers = resolve_workers(clamp_num(request.form.get("workers", "1"), 1, 64, 1, int))
+    # 이미지 슬라이드 형식: png(기본, 무손실) | jpeg(jpeg_quality 30~95, 덱 크기 절감)
+    image_format = normalize_image_format(request.form.get("image_format", "png"))
+    jpeg_quality = clamp_num(request.form.get("jpeg_quality", DEFAULT_JPEG_QUALITY), 30, 95, DEFAULT_JPEG_QUALITY, int)
 
     try:
         try:
@@ -291,7 +280,8 @@ def convert_sync():
             else:
                 raise ImportError("Adobe SDK not available")
         except Exception:
-            out_path, name, ctype = perform_pptx_conversion(in_path, base_name, scale=scale, job_id=None)
+            out_path, name, ctype = perform_pptx_conversion(in_path, base_name, scale=scale, job_id=None, workers=workers,
+                                                            image_format=image_format, quality=jpeg_quality)
         
         return send_download_memory(out_path, name, ctype)
     finally:
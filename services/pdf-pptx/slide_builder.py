@@ -0,0 +1,63 @@
+"""
+PDF 페이지 → 이미지 슬라이드 빌더
+
+기존 perform_pptx_conversion은 슬라이드 크기를 정하려고 첫 페이지를 한 번 더 렌더링했고,
+페이지마다 PNG를 임시 파일로 쓴 뒤 add_picture가 그 파일을 다시 읽어 파싱했습니다.
+여기서는 슬라이드 크기를 렌더링 없이 page.rect에서 계산하고,
+워커가 인코딩한 이미지 바이트를 메모리에서 바로 add_picture에 넘깁니다.
+
+- 이미지 형식: PNG(무손실, 기본) 또는 JPEG(quality 지정, 사진/스캔 문서는 덱 크기가 크게 줄어듦)
+- 렌더링/인코딩은 page_renderer 프로세스 풀에서 병렬로 하고, 슬라이드는 항상 페이지 순서대로 추가
+"""
+import io
+
+import fitz  # PyMuPDF
+from pptx import Presentation
+from pptx.util import Emu
+
+from page_renderer import render_pages
+
+EMU_PER_PX = 9525  # 1 px ≈ 9525 EMU (96 DPI 기준)
+DEFAULT_JPEG_QUALITY = 85
+
+
+def normalize_image_format(fmt: str) -> str:
+    """요청 값 → "png" | "jpeg" (알 수 없는 값은 png)"""
+    fmt = (fmt or "png").strip().lower()
+    return "jpeg" if fmt in ("jpg", "jpeg") else "png"
+
+
+def slide_size(page, scale: float):
+    """페이지를 scale로 렌더링했을 때의 픽셀 크기 그대로 슬라이드 크기(EMU) 계산 (렌더링 없음)"""
+    irect = (page.rect * fitz.Matrix(scale, scale)).irect  # get_pixmap과 같은 반올림 규칙
+    return Emu(irect.width * EMU_PER_PX), Emu(irect.height * EMU_PER_PX)
+
+
+def build_pptx(in_path: str, out_path: str, scale: float = 1.0, image_format: str = "png",
+               quality: int = DEFAULT_JPEG_QUALITY, workers: int = 1, progress=None) -> str:
+    """
+    페이지당 슬라이드 1장(전체 이미지 맞춤)인 PPTX를 out_path에 저장
+
+    progress(done, total)는 슬라이드 하나를 추가할 때마다 호출됩니다.
+    """
+    image_format = normalize_image_format(image_format)
+    with fitz.open(in_path) as doc:
+        page_count = doc.page_count
+        # 첫 페이지 크기에 맞춰 슬라이드 크기 설정
+        width, height = slide_size(doc.load_page(0), scale)
+
+    prs = Presentation()
+    prs.slide_width = width
+    prs.slide_height = height
+    blank = prs.slide_layouts[6]  # Blank
+
+    for rendered in render_pages(in_path, range(1, page_count + 1), scale=scale, alpha=False,
+                                 workers=workers, fmt=image_format, quality=quality):
+        slide = prs.slides.add_slide(blank)
+        # 전체 채우기
+        slide.shapes.add_picture(io.BytesIO(rendered.data), Emu(0), Emu(0), width=width, height=height)
+        if progress:
+            progress(rendered.number, page_count)
+
+    prs.save(out_path)
+    return out_path
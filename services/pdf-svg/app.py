@@ -7,6 +7,9 @@ from flask import Flask, request, jsonify, send_file, redirect, send_from_direct
 from flask_cors import CORS
 from werkzeug.exceptions import HTTPException, NotFound, MethodNotAllowed
 import fitz  # PyMuPDF
+from chunked_upload import ChunkedUploadStore, UploadError, analyze_pdf, create_upload_blueprint
+from job_store import create_job_store
+from zip_stream import send_file_stream
 
 app = Flask(__name__, static_folder="templates", static_url_path="")
 logging.basicConfig(level=logging.INFO)
@@ -24,8 +27,8 @@ CORS(app, resources={
             "https://*.vercel.app"
         ],
         "expose_headers": ["Content-Disposition"],
-        "methods": ["GET", "POST", "OPTIONS"],
-        "allow_headers": ["Content-Type"]
+        "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+        "allow_headers": ["Content-Type", "Upload-Offset"]
     }
 })
 
@@ -48,7 +51,10 @@ os.makedirs(UPLOADS_DIR, exist_ok=True)
 os.makedirs(OUTPUTS_DIR, exist_ok=True)
 
 executor = ThreadPoolExecutor(max_workers=2)
-JOBS = {}  # job_id -> dict
+JOBS = create_job_store(BASE_DIR)  # job_id -> dict
+# 이어 올리기 업로드 (/upload/init → PUT /upload/<id>?offset= → /upload/<id>/complete → /convert-async에 upload_id)
+UPLOADS = ChunkedUploadStore(UPLOADS_DIR, kind="pdf", extensions={"pdf"}, max_mb=200, analyzer=analyze_pdf)
+app.register_blueprint(create_upload_blueprint(UPLOADS))
 
 def safe_move(src: str, dst: str):
     os.makedirs(os.path.dirname(dst), exist_ok=True)
@@ -85,13 +91,19 @@ def attach_download_headers(resp, download_name: str):
     resp.headers["Content-Disposition"] = f"attachment; filename*=UTF-8''{quoted}"
     return resp
 
+def claim_pdf_upload(upload_id: str):
+    """청크 업로드(/upload)로 올린 PDF 꺼내기 → (in_path, base_name). 암호 PDF는 변환 전에 거절"""
+    upload = UPLOADS.claim(upload_id)
+    if (upload["analysis"] or {}).get("encrypted"):
+        try: os.remove(upload["path"])
+        except: pass
+        raise UploadError("암호로 보호된 PDF는 변환할 수 없습니다.", 400)
+    return upload["path"], safe_base_name(upload["filename"])
+
 def set_progress(job_id, p, msg=None):
-    info = JOBS.setdefault(job_id, {})
-    info["progress"] = int(p)
-    if msg is not None:
-        info["message"] = msg
+    JOBS.set_progress(job_id, p, msg)
 
-def send_download_memory(path: str):
+def send_download_file(path: str):
     if not path or not os.path.exists(path):
         return jsonify({"error": "output file missing"}), 500
 
@@ -104,58 +116,41 @@ def send_download_memory(path: str):
     else:
         ctype = "application/octet-stream"
 
-    with open(path, "rb") as f:
-        data = f.read()
-    size = len(data)
-
-    resp = send_file(
-        io.BytesIO(data),
-        mimetype=ctype,
-        as_attachment=True,
-        download_name=name,
-        conditional=False
-    )
-    resp.direct_passthrough = False
-    resp.headers["Content-Length"] = str(size)
-    resp.headers["Cache-Control"] = "no-store"
-    resp.headers["Content-Disposition"] = (
-        f"attachment; filename*=UTF-8''{urllib.parse.quote(name)}"
-    )
-    return resp
+    return send_file_stream(path, name, ctype)
 
 def perform_svg_conversion(in_path, scale: float, base_name: str, job_id: str = None):
-    result_paths = []
-    with tempfile.TemporaryDirectory(dir=OUTPUTS_DIR) as tmp:
-        doc = fitz.open(in_path)
+    doc = fitz.open(in_path)
+    try:
         page_count = doc.page_count
         mat = fitz.Matrix(scale, scale)
-
-        for i in range(page_count):
-            if job_id:
-                set_progress(job_id, 10 + int(80*(i+1)/page_count), f"페이지 {i+1}/{page_count} 벡터 추출 중")
-            page = doc.load_page(i)
-            svg = page.get_svg_image(matrix=mat)
-            if not svg.lstrip().startswith("<"):
-                svg = '<?xml version="1.0" encoding="UTF-8"?>\n' + svg
-            out_p = os.path.join(tmp, f"{base_name}_{i+1:0{max(2,len(str(page_count)))}d}.svg")
-            with open(out_p, "w", encoding="utf-8") as f:
-                f.write(svg)
-            result_paths.append(out_p)
-
-        if len(result_paths) == 1:
+        pad = max(2, len(str(page_count)))
+
+        def iter_svgs():
+            for i in range(page_count):
+                if job_id:
+                    set_progress(job_id, 10 + int(80*(i+1)/page_count), f"페이지 {i+1}/{page_count} 벡터 추출 중")
+                svg = doc.load_page(i).get_svg_image(matrix=mat)
+                if not svg.lstrip().startswith("<"):
+                    svg = '<?xml version="1.0" encoding="UTF-8"?>\n' + svg
+                yield i, svg
+
+        if page_count == 1:
             final_name = f"{base_name}.svg"
             final_path = os.path.join(OUTPUTS_DIR, final_name)
-            if os.path.exists(final_path): os.remove(final_path)
-            safe_move(result_paths[0], final_path)
+            _, svg = next(iter_svgs())
+            with open(final_path, "w", encoding="utf-8") as f:
+                f.write(svg)
             return final_path, final_name, "image/svg+xml"
 
+        # 페이지를 임시 파일에 썼다가 다시 복사하지 않고 바로 ZIP에 기록 (SVG 텍스트는 압축 효과가 커서 DEFLATED 유지)
         final_name = f"{base_name}.zip"
         final_path = os.path.join(OUTPUTS_DIR, final_name)
-        if os.path.exists(final_path): os.remove(final_path)
         with zipfile.ZipFile(final_path, "w", zipfile.ZIP_DEFLATED) as zf:
-            for p in result_paths:
-                zf.write(p, arcname=os.path.basename(p))
+            for i, svg in iter_svgs():
+                zf.writestr(f"{base_name}_{i+1:0{pad}d}.svg", svg)
         return final_path, final_name, "application/zip"
+    finally:
+        doc.close()
 
 # 루트: web/index.html 서빙
 @app.get("/")
@@ -173,14 +168,21 @@ def health():
 
 @app.post("/convert-async")
 def convert_async():
-    f = request.files.get("file") or request.files.get("pdfFile")
-    if not f:
-        return jsonify({"error": "file field is required"}), 400
-
-    base_name = safe_base_name(f.filename)
     job_id = uuid4().hex
-    in_path = os.path.join(UPLOADS_DIR, f"{job_id}.pdf")
-    f.save(in_path)
+    upload_id = request.form.get("upload_id")
+    if upload_id:
+        # /upload 청크 업로드로 미리 올린 파일 사용
+        try:
+            in_path, base_name = claim_pdf_upload(upload_id)
+        except UploadError as e:
+            return jsonify({"error": str(e)}), e.status
+    else:
+        f = request.files.get("file") or request.files.get("pdfFile")
+        if not f:
+            return jsonify({"error": "file field is required"}), 400
+        base_name = safe_base_name(f.filename)
+        in_path = os.path.join(UPLOADS_DIR, f"{job_id}.pdf")
+        f.save(in_path)
     quality = request.form.get("quality", "medium")
     try:
         scale = float(request.form.get("scale", "1.0"))
@@ -221,7 +223,7 @@ def job_download(job_id):
     if not info:  return jsonify({"error":"job not found"}), 404
     if info.get("status") != "done":  return jsonify({"error":"not ready"}), 409
     path = info.get("path")
-    return send_download_memory(path)
+    return send_download_file(path)
 
 @app.post("/convert")
 def convert_compat():
@@ -0,0 +1,203 @@
+"""
+비동기 변환 작업 상태 저장소
+
+모듈 전역 JOBS = {} 는 계속 커지기만 하고, 재시작하면 사라지며, gunicorn 워커끼리 공유되지 않아
+/job/<id> 폴링이 다른 워커로 가면 404가 났습니다. 여기서는 같은 인터페이스의 저장소 두 가지를 제공합니다.
+
+- MemoryJobStore: 프로세스 내 저장, TTL 만료 + 최대 개수 제한
+- SQLiteJobStore: 파일 기반, 여러 프로세스/워커가 공유하고 재시작 후에도 유지
+
+환경 변수
+    JOB_STORE: "sqlite"(기본) | "memory"
+    JOB_STORE_PATH: SQLite 파일 경로 (기본: <서비스 폴더>/jobs.sqlite3)
+    JOB_TTL_SECONDS: 마지막 갱신 후 보관 시간 (기본: 3600)
+    JOB_MAX_ENTRIES: 최대 보관 작업 수, 넘으면 오래된 것부터 제거 (기본: 1000)
+
+dict처럼 JOBS[job_id] = {...}, JOBS.get(job_id), job_id in JOBS, del JOBS[job_id] 를 그대로 쓸 수 있고,
+반환되는 dict는 사본이므로 일부 필드 변경은 반드시 patch()/set_progress()로 해야 저장됩니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+class JobStore:
+    """공통 인터페이스 (dict 호환 메서드 포함)"""
+
+    def get(self, job_id, default=None):
+        raise NotImplementedError
+
+    def put(self, job_id, info: dict):
+        raise NotImplementedError
+
+    def patch(self, job_id, **fields):
+        """기존 작업 정보에 fields를 원자적으로 병합 (없으면 새로 생성)"""
+        raise NotImplementedError
+
+    def delete(self, job_id):
+        raise NotImplementedError
+
+    def set_progress(self, job_id, p, msg=None):
+        if job_id is None:
+            return
+        fields = {"progress": int(p)}
+        if msg is not None:
+            fields["message"] = msg
+        self.patch(job_id, **fields)
+
+    def __getitem__(self, job_id):
+        info = self.get(job_id)
+        if info is None:
+            raise KeyError(job_id)
+        return info
+
+    def __setitem__(self, job_id, info):
+        self.put(job_id, info)
+
+    def __delitem__(self, job_id):
+        self.delete(job_id)
+
+    def __contains__(self, job_id):
+        return self.get(job_id) is not None
+
+
+class MemoryJobStore(JobStore):
+    def __init__(self, ttl: float = 3600, max_entries: int = 1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._jobs = OrderedDict()  # job_id -> (갱신 시각, info), 오래된 순
+        self._lock = threading.Lock()
+
+    def _evict(self, now):
+        while self._jobs:
+            job_id, (ts, _) = next(iter(self._jobs.items()))
+            if now - ts > self.ttl or len(self._jobs) > self.max_entries:
+                self._jobs.popitem(last=False)
+            else:
+                break
+
+    def _store(self, job_id, info):
+        self._jobs[job_id] = (time.time(), info)
+        self._jobs.move_to_end(job_id)
+        self._evict(time.time())
+
+    def get(self, job_id, default=None):
+        with self._lock:
+            item = self._jobs.get(job_id)
+            if item is None or time.time() - item[0] > self.ttl:
+                return default
+            return dict(item[1])
+
+    def put(self, job_id, info: dict):
+        with self._lock:
+            self._store(job_id, dict(info))
+
+    def patch(self, job_id, **fields):
+        with self._lock:
+            item = self._jobs.get(job_id)
+            info = dict(item[1]) if item else {}
+            info.update(fields)
+            self._store(job_id, info)
+
+    def delete(self, job_id):
+        with self._lock:
+            self._jobs.pop(job_id, None)
+
+
+class SQLiteJobStore(JobStore):
+    """작업마다 JSON 한 줄. 갱신은 BEGIN IMMEDIATE 트랜잭션 안에서 읽기→병합→쓰기로 원자 처리"""
+
+    def __init__(self, path: str, ttl: float = 3600, max_entries: int = 1000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                " id TEXT PRIMARY KEY, data TEXT NOT NULL, updated REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS jobs_updated ON jobs(updated)")
+        finally:
+            conn.close()
+
+    def _connect(self):
+        # 연결은 요청마다 새로 열어 스레드/포크 간 공유 문제를 피함 (autocommit 모드)
+        return sqlite3.connect(self.path, timeout=10, isolation_level=None)
+
+    def _evict(self, conn, now):
+        conn.execute("DELETE FROM jobs WHERE updated < ?", (now - self.ttl,))
+        conn.execute(
+            "DELETE FROM jobs WHERE id IN ("
+            " SELECT id FROM jobs ORDER BY updated DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        )
+
+    def get(self, job_id, default=None):
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT data FROM jobs WHERE id = ? AND updated >= ?",
+                (str(job_id), time.time() - self.ttl),
+            ).fetchone()
+        finally:
+            conn.close()
+        return json.loads(row[0]) if row else default
+
+    def put(self, job_id, info: dict):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, data, updated) VALUES (?, ?, ?)",
+                (str(job_id), json.dumps(info, ensure_ascii=False), now),
+            )
+            self._evict(conn, now)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def patch(self, job_id, **fields):
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute("SELECT data FROM jobs WHERE id = ?", (str(job_id),)).fetchone()
+            info = json.loads(row[0]) if row else {}
+            info.update(fields)
+            conn.execute(
+                "INSERT OR REPLACE INTO jobs (id, data, updated) VALUES (?, ?, ?)",
+                (str(job_id), json.dumps(info, ensure_ascii=False), now),
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+    def delete(self, job_id):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM jobs WHERE id = ?", (str(job_id),))
+        finally:
+            conn.close()
+
+
+def create_job_store(base_dir: str) -> JobStore:
+    """환경 변수 설정에 맞는 작업 저장소 생성"""
+    ttl = float(os.environ.get("JOB_TTL_SECONDS", "3600"))
+    max_entries = int(os.environ.get("JOB_MAX_ENTRIES", "1000"))
+    if os.environ.get("JOB_STORE", "sqlite").lower() == "memory":
+        return MemoryJobStore(ttl=ttl, max_entries=max_entries)
+    path = os.environ.get("JOB_STORE_PATH") or os.path.join(base_dir, "jobs.sqlite3")
+    return SQLiteJobStore(path, ttl=ttl, max_entries=max_entries)
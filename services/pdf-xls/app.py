@@ -12,6 +12,9 @@ from openpyxl.styles import Font, Alignment
 from openpyxl.utils import get_column_letter
 from typing import Optional
 import re
+from job_store import create_job_store
+from table_grid import extract_spans, infer_grid
+from xlsx_stream import XLSX_STREAMING, has_extractable_text, stream_xlsx
 
 # Adobe PDF Services SDK imports - v4.2.0 compatible
 ADOBE_AVAILABLE = False
@@ -47,7 +50,7 @@ os.makedirs(UPLOADS_DIR, exist_ok=True)
 os.makedirs(OUTPUTS_DIR, exist_ok=True)
 
 executor = ThreadPoolExecutor(max_workers=2)
-JOBS = {}
+JOBS = create_job_store(BASE_DIR)
 current_job_id: Optional[str] = None
 
 def safe_base_name(filename: str) -> str:
@@ -55,10 +58,7 @@ def safe_base_name(filename: str) -> str:
     return base.replace("/", "").replace("\\", "").strip() or "output"
 
 def set_progress(job_id, p, msg=None):
-    info = JOBS.setdefault(job_id, {})
-    info["progress"] = int(p)
-    if msg is not None:
-        info["message"] = msg
+    JOBS.set_progress(job_id, p, msg)
 
 def send_download_memory(path: str, download_name: str, ctype: str):
     if not path or not os.path.exists(path):
@@ -228,99 +228,45 @@ def perform_xlsx_conversion_adobe_with_sheets(in_path: str, base_name: str):
     
     return final_path, final_name, ctype
 
-def has_extractable_text(page):
-    """PDF 페이지에서 추출 가능한 텍스트가 있는지 확인"""
-    text = page.get_text().strip()
-    # 텍스트가 있고, 단순히 공백이나 특수문자만이 아닌 경우
-    return len(text) > 10 and bool(re.search(r'[a-zA-Z가-힣0-9]', text))
-
 def extract_text_to_excel(page, ws):
-    """PDF 페이지에서 텍스트를 추출하여 Excel 셀에 배치"""
-    # 텍스트 블록 추출 (위치 정보 포함)
-    blocks = page.get_text("dict")["blocks"]
-    
-    # 텍스트 블록들을 y 좌표로 정렬 (위에서 아래로)
-    text_blocks = []
-    for block in blocks:
-        if "lines" in block:  # 텍스트 블록인 경우
-            for line in block["lines"]:
-                for span in line["spans"]:
-                    text = span["text"].strip()
-                    if text:
-                        text_blocks.append({
-                            "text": text,
-                            "x": span["bbox"][0],
-                            "y": span["bbox"][1],
-                            "font_size": span["size"]
-                        })
-    
-    # y 좌표로 정렬 후 x 좌표로 정렬
-    text_blocks.sort(key=lambda x: (x["y"], x["x"]))
-    
-    # 행별로 그룹화 (비슷한 y 좌표끼리)
-    rows = []
-    current_row = []
-    current_y = None
-    tolerance = 5  # y 좌표 허용 오차
-    
-    for block in text_blocks:
-        if current_y is None or abs(block["y"] - current_y) <= tolerance:
-            current_row.append(block)
-            current_y = block["y"] if current_y is None else current_y
-        else:
-            if current_row:
-                rows.append(current_row)
-            current_row = [block]
-            current_y = block["y"]
+    """PDF 페이지에서 텍스트를 추출하여 Excel 셀에 배치 (열 경계는 페이지 전체에서 한 번에 추론)"""
+    grid = infer_grid(extract_spans(page))
     
-    if current_row:
-        rows.append(current_row)
+    # 스타일 객체는 셀마다 만들지 않고 공유
+    title_font = Font(bold=True, size=12)
+    body_font = Font(size=10)
+    alignment = Alignment(wrap_text=True, vertical='top')
     
     # Excel에 텍스트 배치
-    for row_idx, row_blocks in enumerate(rows, 1):
-        # 행 내에서 x 좌표로 정렬
-        row_blocks.sort(key=lambda x: x["x"])
-        
-        # 열 위치 계산 (x 좌표 기반)
-        col_positions = {}
-        for i, block in enumerate(row_blocks):
-            # x 좌표를 기반으로 열 번호 결정
-            col_num = 1
-            for existing_x in sorted(col_positions.keys()):
-                if block["x"] > existing_x + 50:  # 50포인트 이상 차이나면 다음 열
-                    col_num += 1
-            
-            while col_num in col_positions.values():
-                col_num += 1
-            
-            col_positions[block["x"]] = col_num
-            
-            # 셀에 텍스트 입력
-            cell = ws.cell(row=row_idx, column=col_num)
-            cell.value = block["text"]
-            
+    for row_idx, cells in enumerate(grid.rows, 1):
+        for c in cells:
+            cell = ws.cell(row=row_idx, column=c.column, value=c.text)
             # 폰트 크기에 따른 스타일 적용
-            if block["font_size"] > 14:
-                cell.font = Font(bold=True, size=12)
-            else:
-                cell.font = Font(size=10)
-            
-            cell.alignment = Alignment(wrap_text=True, vertical='top')
+            cell.font = title_font if c.font_size > 14 else body_font
+            cell.alignment = alignment
     
-    # 열 너비 자동 조정
-    for column in ws.columns:
-        max_length = 0
-        column_letter = get_column_letter(column[0].column)
-        for cell in column:
-            if cell.value:
-                max_length = max(max_length, len(str(cell.value)))
-        adjusted_width = min(max_length + 2, 50)  # 최대 50자로 제한
-        ws.column_dimensions[column_letter].width = adjusted_width
+    # 열 너비 (배치하면서 계산한 값, 최대 50자로 제한)
+    for col_idx, width in enumerate(grid.col_widths, 1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
 
 def perform_xlsx_conversion(in_path: str, base_name: str, scale: float = 1.0):
     """
     PDF → XLSX (텍스트 추출 우선, 필요시 이미지 폴백)
+
+    XLSX_STREAMING(기본)이면 페이지를 워커 풀에서 분석하고 write-only 시트로 바로 기록해
+    페이지 수와 무관하게 메모리 사용량이 일정합니다.
     """
+    final_name = f"{base_name}.xlsx"
+    final_path = os.path.join(OUTPUTS_DIR, final_name)
+    if XLSX_STREAMING:
+        job_id = current_job_id
+        if os.path.exists(final_path):
+            os.remove(final_path)
+        stream_xlsx(in_path, final_path, scale=scale,
+                    progress=lambda done, total: set_progress(job_id, 10 + int(80 * done / total),
+                                                              f"페이지 {done}/{total} 처리 중"))
+        return final_path, final_name, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
     with tempfile.TemporaryDirectory(dir=OUTPUTS_DIR) as tmp:
         doc = fitz.open(in_path)
         mat = fitz.Matrix(scale, scale)
@@ -361,8 +307,6 @@ def perform_xlsx_conversion(in_path: str, base_name: str, scale: float = 1.0):
             xlimg = XLImage(img_path)
             ws.add_image(xlimg, "A1")
 
-        final_name = f"{base_name}.xlsx"
-        final_path = os.path.join(OUTPUTS_DIR, final_name)
         if os.path.exists(final_path): 
             os.remove(final_path)
         wb.save(final_path)
@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+표 격자 추론 벤치마크: 기존 행별 열 계산 vs table_grid 페이지 단위 군집화
+
+재무제표처럼 왼쪽 정렬 항목명 + 오른쪽 정렬 숫자 열이 빽빽한 페이지를 만들어
+두 구현으로 워크시트를 채우는 시간을 비교하고,
+각 숫자가 원래 열 번호와 같은 엑셀 열에 들어갔는지(열 일관성)도 확인합니다.
+끝으로 여러 숫자 열 위에 걸친 머리글("Year ended December 31, 2024 and 2023")이
+그 아래 숫자들을 한 셀로 합치지 않는지 회귀 확인을 합니다.
+
+사용법:
+    python bench_table_grid.py                       # 기본: 120행 x 12열, 5페이지
+    python bench_table_grid.py --rows 200 --cols 16 --pages 3
+"""
+import argparse
+import random
+import time
+
+import fitz
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Font
+from openpyxl.utils import get_column_letter
+
+from app import extract_text_to_excel
+
+
+def legacy_extract_text_to_excel(page, ws):
+    """변경 전 구현 (비교용)"""
+    blocks = page.get_text("dict")["blocks"]
+    text_blocks = []
+    for block in blocks:
+        if "lines" in block:
+            for line in block["lines"]:
+                for span in line["spans"]:
+                    text = span["text"].strip()
+                    if text:
+                        text_blocks.append({"text": text, "x": span["bbox"][0],
+                                            "y": span["bbox"][1], "font_size": span["size"]})
+    text_blocks.sort(key=lambda x: (x["y"], x["x"]))
+    rows, current_row, current_y, tolerance = [], [], None, 5
+    for block in text_blocks:
+        if current_y is None or abs(block["y"] - current_y) <= tolerance:
+            current_row.append(block)
+            current_y = block["y"] if current_y is None else current_y
+        else:
+            if current_row:
+                rows.append(current_row)
+            current_row = [block]
+            current_y = block["y"]
+    if current_row:
+        rows.append(current_row)
+    for row_idx, row_blocks in enumerate(rows, 1):
+        row_blocks.sort(key=lambda x: x["x"])
+        col_positions = {}
+        for block in row_blocks:
+            col_num = 1
+            for existing_x in sorted(col_positions.keys()):
+                if block["x"] > existing_x + 50:
+                    col_num += 1
+            while col_num in col_positions.values():
+                col_num += 1
+            col_positions[block["x"]] = col_num
+            cell = ws.cell(row=row_idx, column=col_num)
+            cell.value = block["text"]
+            cell.font = Font(bold=True, size=12) if block["font_size"] > 14 else Font(size=10)
+            cell.alignment = Alignment(wrap_text=True, vertical='top')
+    for column in ws.columns:
+        max_length = 0
+        column_letter = get_column_letter(column[0].column)
+        for cell in column:
+            if cell.value:
+                max_length = max(max_length, len(str(cell.value)))
+        ws.column_dimensions[column_letter].width = min(max_length + 2, 50)
+
+
+def make_statement(rows: int, cols: int, pages: int, seed: int = 7) -> fitz.Document:
+    """항목명 1열 + 숫자 cols열(오른쪽 정렬, 빈 칸 일부 포함)의 조밀한 표 PDF"""
+    rnd = random.Random(seed)
+    label_w, num_w, fs = 120.0, 62.0, 6.0
+    width = 40 + label_w + cols * num_w + 20
+    line_h = fs + 2.5
+    height = 60 + rows * line_h + 40
+    doc = fitz.open()
+    for p in range(pages):
+        page = doc.new_page(width=width, height=height)
+        page.insert_text((40, 40), f"Consolidated statement {p + 1}", fontsize=16)
+        for r in range(rows):
+            y = 60 + (r + 1) * line_h
+            page.insert_text((40, y), f"Account item {r + 1:04d}", fontsize=fs)
+            for c in range(cols):
+                if rnd.random() < 0.1:
+                    continue  # 빈 칸
+                text = f"C{c + 1}:{rnd.randint(0, 10 ** rnd.randint(1, 8)):,}"
+                tw = fitz.get_text_length(text, fontsize=fs)
+                right = 40 + label_w + (c + 1) * num_w - 4
+                page.insert_text((right - tw, y), text, fontsize=fs)
+    return doc
+
+
+def column_consistency(ws) -> float:
+    """'C<n>:' 값이 모두 같은 엑셀 열에 모였는지: 원래 열마다 가장 많이 쓰인 엑셀 열의 비율"""
+    seen = {}
+    for row in ws.iter_rows():
+        for cell in row:
+            v = cell.value
+            if isinstance(v, str) and v.startswith("C") and ":" in v:
+                # 한 셀에 여러 값이 합쳐졌으면 각각 셈
+                for part in v.split():
+                    key = part.split(":", 1)[0]
+                    seen.setdefault(key, []).append(cell.column)
+    if not seen:
+        return 0.0
+    hits = total = 0
+    for columns in seen.values():
+        hits += max(columns.count(c) for c in set(columns))
+        total += len(columns)
+    return hits / total
+
+
+def spanning_header_check(fn) -> bool:
+    """Note 열 옆에 두 숫자 열 위로 걸친 머리글이 있어도 숫자가 각자 다른 셀에 들어가는지"""
+    doc = fitz.open()
+    page = doc.new_page(width=420, height=160)
+    fs = 8.0
+
+    def right(text, x, y):
+        page.insert_text((x - fitz.get_text_length(text, fontsize=fs), y), text, fontsize=fs)
+
+    page.insert_text((40, 50), "Account", fontsize=fs)
+    page.insert_text((170, 50), "Note", fontsize=fs)
+    page.insert_text((215, 50), "Year ended December 31, 2024 and 2023", fontsize=fs)
+    for i, (label, values) in enumerate((("Cash", ("1,000", "900", "100")),
+                                         ("Receivables", ("12,500", "11,200", "1,300")))):
+        y = 70 + i * 12
+        page.insert_text((40, y), label, fontsize=fs)
+        for text, x in zip(values, (270, 320, 370)):
+            right(text, x, y)
+
+    ws = Workbook().active
+    fn(doc[0], ws)
+    for row in ws.iter_rows(min_row=2):
+        numbers = [c.value for c in row if isinstance(c.value, str) and c.value[:1].isdigit()]
+        if len(numbers) != 3 or any(" " in v for v in numbers):
+            return False
+    return True
+
+
+def run(fn, doc) -> tuple:
+    wb = Workbook()
+    ws = wb.active
+    elapsed = 0.0
+    consistency = []
+    for i, page in enumerate(doc):
+        if i:
+            ws = wb.create_sheet()
+        t0 = time.perf_counter()
+        fn(page, ws)
+        elapsed += time.perf_counter() - t0
+        consistency.append(column_consistency(ws))
+    return elapsed, sum(consistency) / len(consistency)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=120)
+    ap.add_argument("--cols", type=int, default=12)
+    ap.add_argument("--pages", type=int, default=5)
+    args = ap.parse_args()
+
+    doc = make_statement(args.rows, args.cols, args.pages)
+    spans = sum(len([s for b in pg.get_text("dict")["blocks"] for l in b.get("lines", ()) for s in l["spans"]])
+                for pg in doc)
+    print(f"{args.pages}페이지, 페이지당 {args.rows}행 x {args.cols + 1}열, span {spans}개")
+
+    for name, fn in (("legacy", legacy_extract_text_to_excel), ("table_grid", extract_text_to_excel)):
+        elapsed, consistency = run(fn, doc)
+        print(f"{name:>10}: {elapsed * 1000 / args.pages:8.1f} ms/page  열 일관성 {consistency * 100:5.1f}%  "
+              f"걸친 머리글 {'OK' if spanning_header_check(fn) else 'FAIL'}")
+
+
+if __name__ == "__main__":
+    main()
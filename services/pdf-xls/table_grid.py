@@ -0,0 +1,155 @@
+"""
+PDF 페이지 텍스트 → 표 격자(행/열) 추론
+
+기존 extract_text_to_excel은 행마다 col_positions를 다시 정렬하고
+`while col_num in col_positions.values()` 루프로 빈 열을 찾느라 행 길이에 대해 제곱 시간이 걸렸고,
+열 번호가 행마다 따로 정해져 같은 세로 열의 값이 행마다 다른 엑셀 열로 들어갔습니다.
+여기서는 페이지 전체의 span x 구간을 한 번에 1차원 군집화해 열 경계를 정하고,
+모든 행이 같은 열 경계를 쓰도록 배치합니다.
+
+1. 행: y 기준 정렬 후 허용 오차(row_tolerance) 안의 span을 한 행으로 묶음 (기존과 동일한 기준)
+2. 열: span이 2개 이상인 행들의 [x0, x1] 구간을 x0 순으로 훑으면서 겹치거나 col_gap 이내로 붙은 구간을 병합
+   (NumPy 누적 최대값으로 한 번에 계산, 왼쪽 정렬 텍스트와 오른쪽 정렬 숫자 열 모두 같은 군집으로 모임)
+   제목처럼 span이 하나뿐인 행, 그리고 "Year ended December 31, 2024 and 2023"처럼
+   다른 행의 셀 2개 이상 위에 걸친 span은 여러 열을 덮으므로 경계 계산에서 제외하고 x0로만 열을 찾음
+   (열 사이 빈 공간에서 시작하면 오른쪽 열로 붙임)
+3. 같은 행·열에 들어간 span은 x 순서대로 공백으로 이어 한 셀에 넣고, 열 너비는 배치하면서 바로 계산
+"""
+from typing import List, NamedTuple
+
+import numpy as np
+
+ROW_TOLERANCE = 5.0  # y 좌표 허용 오차 (pt)
+COL_GAP = 2.0        # 이 간격 이하로 붙은 x 구간은 같은 열 (pt)
+MAX_COL_WIDTH = 50   # 엑셀 열 너비 상한 (문자 수)
+
+
+class Span(NamedTuple):
+    text: str
+    x0: float
+    y0: float
+    x1: float
+    font_size: float
+
+
+class Cell(NamedTuple):
+    column: int  # 1부터 시작
+    text: str
+    font_size: float  # 셀에 합쳐진 span 중 가장 큰 글자 크기
+
+
+class TableGrid(NamedTuple):
+    rows: List[List[Cell]]   # 행 순서대로, 각 행은 열 순서대로 정렬된 셀
+    col_widths: List[int]    # 열 1..N의 엑셀 너비 (문자 수 + 여백, 최대 MAX_COL_WIDTH)
+
+
+def extract_spans(page) -> List[Span]:
+    """PyMuPDF 페이지에서 비어 있지 않은 텍스트 span 목록 추출"""
+    spans = []
+    for block in page.get_text("dict")["blocks"]:
+        for line in block.get("lines", ()):
+            for span in line["spans"]:
+                text = span["text"].strip()
+                if text:
+                    x0, y0, x1, _ = span["bbox"]
+                    spans.append(Span(text, x0, y0, x1, span["size"]))
+    return spans
+
+
+def _row_ids(ys: np.ndarray, tolerance: float) -> np.ndarray:
+    """y 오름차순 배열 → 행 번호 (행의 첫 span y에서 tolerance 이내면 같은 행)"""
+    ids = np.empty(len(ys), dtype=np.int64)
+    row = 0
+    anchor = ys[0]
+    for i, y in enumerate(ys.tolist()):
+        if y - anchor > tolerance:
+            row += 1
+            anchor = y
+        ids[i] = row
+    return ids
+
+
+def _column_bounds(x0: np.ndarray, x1: np.ndarray, gap: float):
+    """겹치거나 gap 이내로 붙은 [x0, x1] 구간을 병합한 군집들의 (시작 x, 끝 x) 배열 (오름차순)"""
+    order = np.argsort(x0, kind="stable")
+    sx0, sx1 = x0[order], x1[order]
+    reach = np.maximum.accumulate(sx1)  # 앞선 구간들이 닿는 가장 오른쪽 x
+    new_cluster = np.empty(len(sx0), dtype=bool)
+    new_cluster[0] = True
+    new_cluster[1:] = sx0[1:] > reach[:-1] + gap
+    last = np.append(np.flatnonzero(new_cluster)[1:] - 1, len(sx0) - 1)
+    return sx0[new_cluster], reach[last]
+
+
+def _spanning_mask(x0: np.ndarray, x1: np.ndarray, rows: np.ndarray, gap: float) -> np.ndarray:
+    """
+    다른 행의 이웃한 셀 2개 위에 함께 걸친 span (여러 열에 걸친 머리글 등)
+    행 안에서 이웃한 두 span 사이 틈 (왼쪽 끝 x1, 오른쪽 시작 x0)을 모아 두고,
+    [x0, x1]이 어떤 틈의 양쪽 span과 모두 겹치는지(x0 <= 틈 왼쪽, 틈 오른쪽 <= x1)를 한 번에 확인
+    같은 행의 틈은 span 자신이 끼어 있어 조건을 만족하지 않음
+    """
+    order = np.lexsort((x0, rows))
+    same_row = rows[order][1:] == rows[order][:-1]
+    gap_left = x1[order][:-1][same_row]
+    gap_right = x0[order][1:][same_row]
+    if not len(gap_left):
+        return np.zeros(len(x0), dtype=bool)
+    by_left = np.argsort(gap_left, kind="stable")
+    gap_left = gap_left[by_left]
+    # 틈 왼쪽 >= lo 인 틈들 중 가장 작은 틈 오른쪽 (뒤에서부터 누적 최소)
+    min_right = np.append(np.minimum.accumulate(gap_right[by_left][::-1])[::-1], np.inf)
+    lo, hi = x0 + gap, x1 - gap  # 맞닿은 정도의 겹침은 무시
+    return min_right[np.searchsorted(gap_left, lo, side="left")] <= hi
+
+
+def infer_grid(spans: List[Span], row_tolerance: float = ROW_TOLERANCE, col_gap: float = COL_GAP) -> TableGrid:
+    if not spans:
+        return TableGrid([], [])
+
+    x0 = np.fromiter((s.x0 for s in spans), dtype=np.float64, count=len(spans))
+    y0 = np.fromiter((s.y0 for s in spans), dtype=np.float64, count=len(spans))
+    x1 = np.fromiter((s.x1 for s in spans), dtype=np.float64, count=len(spans))
+
+    # 1. 행 묶기 (y, x 순 정렬)
+    order = np.lexsort((x0, y0))
+    rows = np.empty(len(spans), dtype=np.int64)
+    rows[order] = _row_ids(y0[order], row_tolerance)
+
+    # 2. 열 경계: span이 2개 이상인 행의 구간 중 여러 열에 걸친 span을 뺀 것만 사용 (없으면 모든 span 사용)
+    multi = np.bincount(rows)[rows] >= 2
+    if not multi.any():
+        multi[:] = True
+    basis = np.flatnonzero(multi)
+    basis = basis[~_spanning_mask(x0[basis], x1[basis], rows[basis], col_gap)]
+    if not len(basis):
+        basis = np.flatnonzero(multi)
+    starts, ends = _column_bounds(x0[basis], x1[basis], col_gap)
+    idx = np.clip(np.searchsorted(starts, x0, side="right") - 1, 0, None)
+    # 경계 계산에서 빠진 span이 열 사이 빈 공간에서 시작하면 다음 열로
+    idx += (x0 > ends[idx] + col_gap) & (idx < len(starts) - 1)
+    cols = idx + 1
+
+    # 3. 셀 배치 (행, 열, x 순) + 열 너비 계산
+    grid_rows: List[List[Cell]] = []
+    widths = [0] * int(cols.max())
+    cur_row = cur_col = None
+    texts, size = [], 0.0
+
+    def flush():
+        text = " ".join(texts)
+        grid_rows[-1].append(Cell(cur_col, text, size))
+        widths[cur_col - 1] = max(widths[cur_col - 1], len(text))
+
+    for i in np.lexsort((x0, cols, rows)).tolist():
+        r, c = int(rows[i]), int(cols[i])
+        if r != cur_row or c != cur_col:
+            if texts:
+                flush()
+            if r != cur_row:
+                grid_rows.append([])
+            cur_row, cur_col, texts, size = r, c, [], 0.0
+        texts.append(spans[i].text)
+        size = max(size, spans[i].font_size)
+    flush()
+
+    return TableGrid(grid_rows, [min(w + 2, MAX_COL_WIDTH) for w in widths])
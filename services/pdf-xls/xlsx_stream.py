@@ -0,0 +1,169 @@
+"""
+PDF → XLSX 스트리밍 내보내기
+
+기존 perform_xlsx_conversion은 모든 페이지의 셀(스타일 포함)을 메모리의 Workbook()에 쌓아 두었다가
+마지막에 wb.save로 한 번에 썼습니다. 500페이지 은행 거래내역은 이 단계에서 수 GB를 사용했습니다.
+여기서는 openpyxl write-only 워크시트로 페이지를 처리하는 즉시 행을 파일에 흘려 보냅니다.
+
+- 페이지 분석(텍스트 격자 추론 또는 이미지 폴백 렌더링)은 프로세스 풀에서 연속 구간 단위로 실행
+- 결과는 항상 페이지 순서대로 받아 시트에 쓰며, 처리 중인 구간은 워커 수 + 1개로 제한
+  (앞 페이지를 쓰기 전까지 뒤 페이지 결과가 메모리에 무한정 쌓이지 않음)
+- 글꼴(제목 12pt 굵게 / 본문 10pt), 줄바꿈·위쪽 정렬, 열 너비는 기존 extract_text_to_excel과 동일
+
+환경 변수
+    XLSX_STREAMING: "1"(기본) | "0" 이면 기존 메모리 Workbook 방식 사용
+    XLSX_MAX_WORKERS: 프로세스 풀 최대 워커 수 (기본: CPU 수, 최대 4)
+    XLSX_CHUNK_PAGES: 워커 1회 작업당 최대 페이지 수 (기본: 8)
+"""
+import multiprocessing
+import os
+import re
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from threading import Lock
+from typing import NamedTuple, Optional
+
+import fitz  # PyMuPDF
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.drawing.image import Image as XLImage
+from openpyxl.styles import Alignment, Font
+from openpyxl.utils import get_column_letter
+
+from table_grid import TableGrid, extract_spans, infer_grid
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        v = int(os.environ.get(key, "0"))
+    except ValueError:
+        v = 0
+    return v if v > 0 else default
+
+
+XLSX_STREAMING = os.environ.get("XLSX_STREAMING", "1").lower() not in ("0", "false", "off")
+XLSX_MAX_WORKERS = _env_int("XLSX_MAX_WORKERS", min(4, os.cpu_count() or 1))
+XLSX_CHUNK_PAGES = _env_int("XLSX_CHUNK_PAGES", 8)
+
+_pool = None
+_pool_lock = Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # Flask 스레드가 떠 있는 프로세스에서 fork하면 락 상태가 복제될 수 있어 spawn 사용
+            ctx = multiprocessing.get_context("spawn")
+            _pool = ProcessPoolExecutor(max_workers=XLSX_MAX_WORKERS, mp_context=ctx)
+        return _pool
+
+
+def has_extractable_text(page):
+    """PDF 페이지에서 추출 가능한 텍스트가 있는지 확인"""
+    text = page.get_text().strip()
+    # 텍스트가 있고, 단순히 공백이나 특수문자만이 아닌 경우
+    return len(text) > 10 and bool(re.search(r'[a-zA-Z가-힣0-9]', text))
+
+
+class PagePayload(NamedTuple):
+    number: int                    # 1부터 시작하는 페이지 번호
+    grid: Optional[TableGrid]      # 텍스트 페이지
+    png: Optional[bytes]           # 텍스트 추출이 안 되는 페이지의 이미지
+
+
+def analyze_page(page, number: int, scale: float) -> PagePayload:
+    """텍스트 격자 추론, 실패하거나 텍스트가 없으면 이미지로 폴백"""
+    if has_extractable_text(page):
+        try:
+            return PagePayload(number, infer_grid(extract_spans(page)), None)
+        except Exception:
+            pass
+    pix = page.get_pixmap(matrix=fitz.Matrix(scale, scale), alpha=False)
+    return PagePayload(number, None, pix.tobytes("png"))
+
+
+def _analyze_chunk(pdf_path: str, pages: list, scale: float) -> list:
+    """워커 프로세스에서 실행: 문서를 직접 열고 구간 내 페이지를 순서대로 분석"""
+    doc = fitz.open(pdf_path)
+    try:
+        return [analyze_page(doc.load_page(pno - 1), pno, scale) for pno in pages]
+    finally:
+        doc.close()
+
+
+def iter_page_payloads(pdf_path: str, page_count: int, scale: float = 1.0, workers: int = None):
+    """페이지 분석 결과를 페이지 순서대로 내보내는 제너레이터"""
+    workers = XLSX_MAX_WORKERS if workers is None else max(1, min(workers, XLSX_MAX_WORKERS))
+    pages = list(range(1, page_count + 1))
+    if workers <= 1 or page_count <= XLSX_CHUNK_PAGES:
+        doc = fitz.open(pdf_path)
+        try:
+            for pno in pages:
+                yield analyze_page(doc.load_page(pno - 1), pno, scale)
+        finally:
+            doc.close()
+        return
+
+    pool = _get_pool()
+    chunks = deque(pages[i:i + XLSX_CHUNK_PAGES] for i in range(0, page_count, XLSX_CHUNK_PAGES))
+    pending = deque()
+    try:
+        while chunks or pending:
+            while chunks and len(pending) <= workers:
+                pending.append(pool.submit(_analyze_chunk, pdf_path, chunks.popleft(), scale))
+            yield from pending.popleft().result()
+    finally:
+        for fut in pending:
+            fut.cancel()
+
+
+class _Styles:
+    """write-only 셀에 공유해서 붙이는 스타일 (extract_text_to_excel과 동일)"""
+    title_font = Font(bold=True, size=12)
+    body_font = Font(size=10)
+    alignment = Alignment(wrap_text=True, vertical='top')
+
+
+def write_grid(ws, grid: TableGrid):
+    # write-only 시트는 열 너비를 첫 행을 쓰기 전에 지정해야 함
+    for col_idx, width in enumerate(grid.col_widths, 1):
+        ws.column_dimensions[get_column_letter(col_idx)].width = width
+    for cells in grid.rows:
+        row = [None] * cells[-1].column
+        for c in cells:
+            cell = WriteOnlyCell(ws, value=c.text)
+            cell.font = _Styles.title_font if c.font_size > 14 else _Styles.body_font
+            cell.alignment = _Styles.alignment
+            row[c.column - 1] = cell
+        ws.append(row)
+
+
+def stream_xlsx(pdf_path: str, out_path: str, scale: float = 1.0, progress=None):
+    """
+    페이지마다 시트 하나(Page_01, Page_02, ...)를 write-only로 기록
+
+    progress(done, total)는 시트 하나를 다 쓸 때마다 호출됩니다.
+    """
+    with fitz.open(pdf_path) as doc:
+        page_count = doc.page_count
+
+    wb = Workbook(write_only=True)
+    with tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(out_path))) as tmp:
+        for payload in iter_page_payloads(pdf_path, page_count, scale):
+            ws = wb.create_sheet(title=f"Page_{payload.number:02d}")
+            if payload.grid is not None:
+                write_grid(ws, payload.grid)
+            else:
+                # 이미지는 저장 시점에 읽히므로 메모리 대신 임시 파일로 보관
+                img_path = os.path.join(tmp, f"{payload.number:04d}.png")
+                with open(img_path, "wb") as f:
+                    f.write(payload.png)
+                ws.add_image(XLImage(img_path), "A1")
+            if progress:
+                progress(payload.number, page_count)
+        if page_count == 0:
+            wb.create_sheet(title="Sheet")
+        wb.save(out_path)
+    return out_path
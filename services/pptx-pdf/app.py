@@ -1,7 +1,8 @@
 from flask import Flask, request, jsonify, send_file, make_response, render_template, redirect
 from flask_cors import CORS
-import os, io, sys, logging, subprocess, shlex, shutil
+import os, io, sys, logging
 from uuid import uuid4
+from lo_pool import create_pool, find_soffice
 from urllib.parse import quote
 import unicodedata
 
@@ -29,6 +30,9 @@ ALLOWED_EXTS = {".ppt", ".pptx"}
 
 SERVICE_NAME = os.getenv("SERVICE_DIR", "pptx-pdf")
 
+# 미리 띄워 둔 LibreOffice 리스너 풀 (요청마다 soffice 콜드 스타트 없음)
+LO_POOL = create_pool()
+
 def _accept_from_allowed():
     # ALLOWED_EXTS = {".ppt",".pptx"} 같은 세트가 서비스별로 이미 있습니다.
     return ",".join(sorted(ALLOWED_EXTS))
@@ -63,52 +67,11 @@ def _is_pdf(path: str) -> bool:
     except: return False
 
 def _find_soffice():
-    return shutil.which("soffice") or shutil.which("libreoffice") or "/usr/bin/soffice"
+    return find_soffice()
 
 def perform_libreoffice(in_path: str, out_pdf_path: str):
-    soffice = _find_soffice()
-    if not soffice: raise RuntimeError("LibreOffice not found")
-    outdir = os.path.dirname(out_pdf_path); os.makedirs(outdir, exist_ok=True)
-    ext = os.path.splitext(in_path)[1].lower()
-    
-    # PPT/PPTX 파일에 대해 올바른 필터 사용
-    if ext in ['.ppt', '.pptx']:
-        conv = "pdf"  # 간단한 pdf 필터 사용
-    else:
-        conv = "pdf"
-    
-    # 옵션 강화(헤드리스/복구/락/디폴트 비활성)
-    cmd = [
-        soffice, "--headless", "--invisible",
-        "--nologo", "--nofirststartwizard", "--norestore",
-        "--nolockcheck", "--nodefault",
-        "--convert-to", conv, "--outdir", outdir, in_path
-    ]
-    # 환경변수: HOME=/tmp (LO가 사용자 디렉터리 필요로 할 때 오류 예방)
-    env = os.environ.copy()
-    env.setdefault("HOME", "/tmp")
-    env.setdefault("SAL_USE_VCL", "svp")
-    env.setdefault("OOO_DISABLE_RECOVERY", "1")
-
-    logging.info("[LO] cmd=%s", " ".join(shlex.quote(x) for x in cmd))
-    p = subprocess.run(cmd, env=env, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-    logging.info("[LO] rc=%s", p.returncode)
-    if p.stdout: logging.info("[LO] stdout=%s", p.stdout[:4000])
-    if p.stderr: logging.warning("[LO] stderr=%s", p.stderr[:4000])
-
-    if p.returncode != 0:
-        raise RuntimeError(f"soffice rc={p.returncode}, err={p.stderr[:800]}")
-
-    produced = os.path.join(outdir, os.path.splitext(os.path.basename(in_path))[0] + ".pdf")
-    if not os.path.exists(produced):
-        raise RuntimeError(f"PDF not produced: {produced}")
-    
-    # out_pdf_path로 통일
-    if produced != out_pdf_path:
-        if os.path.exists(out_pdf_path): os.remove(out_pdf_path)
-        os.replace(produced, out_pdf_path)
-    
-
+    # PPT/PPTX는 문서 종류에 맞는 기본 pdf 필터 사용
+    LO_POOL.convert(in_path, out_pdf_path, convert_to="pdf")
 
 
 
@@ -127,6 +90,7 @@ def health():
         return jsonify({
             "status": "healthy",
             "service": "pptx-pdf",
+            "lo_pool": LO_POOL.stats(),
             "timestamp": os.getenv("RENDER_GIT_COMMIT", "unknown")
         })
     except Exception as e:
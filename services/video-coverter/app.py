@@ -13,6 +13,13 @@ from flask import Flask, render_template, request, jsonify, send_file, Response
 from werkzeug.utils import secure_filename
 from yt_dlp.version import __version__ as YDL_VERSION
 
+from chunked_upload import ChunkedUploadStore, UploadError, create_upload_blueprint
+from file_serving import send_download
+from encode_presets import (DEFAULT_ENCODERS, audio_encode_args, resolve_preset, scale_args,
+                            thread_args, video_encode_args)
+from media_probe import QUALITY_HEIGHTS, plan_stream_copy, probe_media
+from transcode_jobs import QueueFullError, TranscodeManager, run_ffmpeg
+
 app = Flask(__name__)
 
 # 환경변수 설정
@@ -60,12 +67,27 @@ os.makedirs(TEMP_FOLDER, exist_ok=True)
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
 app.config['OUTPUT_FOLDER'] = OUTPUT_FOLDER
 
+# 비동기 변환 작업 (/convert-async): ffmpeg 동시 실행 수는 TRANSCODE_WORKERS로 제한
+transcoder = TranscodeManager()
+
 # 허용된 파일 확장자
 # 지원되는 비디오 및 오디오 파일 확장자
 VIDEO_EXTENSIONS = {'mp4', 'mov', 'mkv', 'm4v', 'flv', 'divx', 'avi', 'mpg', 'mpeg', 'vob', '3gp', '3g2', 'wmv', 'asf', 'rm', 'rmvb', 'dat', 'dav', 'ogv', 'webm', 'dvr-ms', 'vro', 'mxf', 'mod', 'tod', 'mts', 'm2ts', 'tp', 'trp', 'ts', 'dv', 'wtv', 'tivo', 'nsv'}
 AUDIO_EXTENSIONS = {'mp3', 'wav', 'wma', 'm4a', 'm4b', 'm4r', 'ape', 'aac', 'ac3', 'mka', 'aif', 'aiff', 'aa', 'amr', 'flac', 'au', 'cue', 'mpa', 'ra', 'ram', 'ogg', 'mp2', 'opus', 'm4p'}
 ALLOWED_EXTENSIONS = VIDEO_EXTENSIONS | AUDIO_EXTENSIONS | {'pdf', 'png', 'jpg', 'jpeg', 'gif', 'bmp', 'tiff'}
 
+def _analyze_upload(path, complete):
+    """청크 업로드 조기 분석: 헤더가 앞에 있는 파일(mkv, faststart mp4 등)은 일부만 받아도 길이/스트림을 알 수 있음"""
+    info = probe_media(path)
+    if not info or not info['streams'] or not (complete or info['duration']):
+        return None  # 완료 후 다시 분석
+    return info
+
+# 이어 올리기 업로드 (/upload/init → PUT /upload/<id>?offset= → /upload/<id>/complete → /convert-async에 upload_id)
+chunked_uploads = ChunkedUploadStore(UPLOAD_FOLDER, kind='media', extensions=VIDEO_EXTENSIONS | AUDIO_EXTENSIONS,
+                                     max_mb=500, analyzer=_analyze_upload)
+app.register_blueprint(create_upload_blueprint(chunked_uploads))
+
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -82,61 +104,93 @@ def get_file_type(filename):
     else:
         return 'other'
 
-def convert_video_file(input_path, output_format, quality_options=None):
-    """FFmpeg를 사용하여 비디오 파일 변환"""
+def build_convert_command(input_path, output_format, quality_options=None):
+    """변환용 FFmpeg 명령어 구성 → (cmd, output_filename, output_path)"""
+    filename = os.path.basename(input_path)
+    name, _ = os.path.splitext(filename)
+    output_filename = f"{name}.{output_format}"
+    output_path = os.path.join(OUTPUT_FOLDER, output_filename)
+    quality_options = quality_options or {}
+    preset = resolve_preset(quality_options.get('preset'))
+    
+    # FFmpeg 명령어 구성 (작업당 스레드 수 제한: FFMPEG_THREADS)
+    cmd = ['ffmpeg'] + thread_args() + ['-i', input_path, '-y']
+    
+    # 품질 설정 적용
+    if output_format in ['mp4', 'avi', 'mkv', 'mov', 'wmv', 'm4v', 'flv', 'webm']:  # 비디오 형식
+        # 화면비 유지 (가로는 짝수로 자동 계산)
+        height = QUALITY_HEIGHTS.get(quality_options.get('video_quality'))
+        if height:
+            cmd.extend(scale_args(height, preset))
+        
+        # 코덱을 지정하지 않으면 형식별 기본 인코더 + 프리셋(CRF/preset/tune)
+        default_video, default_audio = DEFAULT_ENCODERS.get(output_format, (None, None))
+        video_codec = quality_options.get('video_codec') or default_video
+        if video_codec:
+            cmd.extend(video_encode_args(video_codec, preset, quality_options.get('tune')))
+        
+        audio_codec = quality_options.get('audio_codec') or default_audio
+        if audio_codec:
+            cmd.extend(audio_encode_args(audio_codec, preset, quality_options.get('audio_bitrate')))
+        
+        if output_format in ['mp4', 'm4v', 'mov']:
+            cmd.extend(['-movflags', '+faststart'])
+    
+    elif output_format in ['mp3', 'wav', 'aac', 'flac']:  # 오디오 형식
+        cmd.extend(['-vn'])  # 비디오 스트림 제거
+        if quality_options.get('audio_bitrate'):
+            cmd.extend(['-b:a', quality_options['audio_bitrate']])
+    
+    cmd.append(output_path)
+    return cmd, output_filename, output_path
+
+def build_remux_command(input_path, output_format, quality_options=None, media_info=None):
+    """
+    스트림이 출력 형식과 이미 호환되면 재인코딩 없이 -c copy로 옮기는 명령 구성
+    반환: (cmd, 사유) - 재인코딩이 필요하면 (None, 사유)
+    """
+    copy_args, reason = plan_stream_copy(media_info, output_format, quality_options)
+    if copy_args is None:
+        return None, reason
+    _, _, output_path = build_convert_command(input_path, output_format)
+    return ['ffmpeg', '-i', input_path, '-y'] + copy_args + [output_path], reason
+
+def convert_video_file(input_path, output_format, quality_options=None, media_info=None):
+    """FFmpeg를 사용하여 비디오 파일 변환 (동기 실행, 시간 제한 없음 - 긴 파일은 /convert-async 사용)"""
     try:
-        filename = os.path.basename(input_path)
-        name, _ = os.path.splitext(filename)
-        output_filename = f"{name}.{output_format}"
-        output_path = os.path.join(OUTPUT_FOLDER, output_filename)
-        
-        # FFmpeg 명령어 구성
-        cmd = ['ffmpeg', '-i', input_path, '-y']
-        
-        # 품질 설정 적용
-        if quality_options:
-            if output_format in ['mp4', 'avi', 'mkv', 'mov', 'wmv']:  # 비디오 형식
-                if quality_options.get('video_quality'):
-                    if quality_options['video_quality'] == '720p':
-                        cmd.extend(['-vf', 'scale=1280:720'])
-                    elif quality_options['video_quality'] == '480p':
-                        cmd.extend(['-vf', 'scale=854:480'])
-                    elif quality_options['video_quality'] == '360p':
-                        cmd.extend(['-vf', 'scale=640:360'])
-                
-                if quality_options.get('video_codec'):
-                    cmd.extend(['-c:v', quality_options['video_codec']])
-                
-                if quality_options.get('audio_codec'):
-                    cmd.extend(['-c:a', quality_options['audio_codec']])
-            
-            elif output_format in ['mp3', 'wav', 'aac', 'flac']:  # 오디오 형식
-                cmd.extend(['-vn'])  # 비디오 스트림 제거
-                if quality_options.get('audio_bitrate'):
-                    cmd.extend(['-b:a', quality_options['audio_bitrate']])
+        cmd, output_filename, output_path = build_convert_command(input_path, output_format, quality_options)
         
-        cmd.append(output_path)
+        # 코덱이 이미 맞으면 스트림 복사 먼저 시도, 실패하면 재인코딩
+        media_info = media_info or probe_media(input_path)
+        remux_cmd, reason = build_remux_command(input_path, output_format, quality_options, media_info)
+        duration = media_info['duration'] if media_info else None
+        if remux_cmd:
+            returncode, _ = run_ffmpeg(remux_cmd, duration)
+            if returncode == 0:
+                return {
+                    'success': True,
+                    'output_file': output_filename,
+                    'output_path': output_path,
+                    'mode': 'remux'
+                }
+            print(f"스트림 복사 실패, 재인코딩으로 전환: {reason}")
         
         # FFmpeg 실행
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=300)
+        returncode, stderr_tail = run_ffmpeg(cmd, duration)
         
-        if result.returncode == 0:
+        if returncode == 0:
             return {
                 'success': True,
                 'output_file': output_filename,
-                'output_path': output_path
+                'output_path': output_path,
+                'mode': 'transcode'
             }
         else:
             return {
                 'success': False,
-                'error': f'FFmpeg 오류: {result.stderr}'
+                'error': f'FFmpeg 오류: {stderr_tail}'
             }
             
-    except subprocess.TimeoutExpired:
-        return {
-            'success': False,
-            'error': '변환 시간이 초과되었습니다.'
-        }
     except Exception as e:
         return {
             'success': False,
@@ -534,21 +588,32 @@ def download_youtube_video(url, quality='medium', format_type='mp4'):
 def index():
     return render_template('index.html')
 
-@app.route('/convert', methods=['POST'])
-def convert_file():
-    """파일 업로드 및 변환 처리"""
-    try:
+def _save_convert_upload():
+    """
+    /convert, /convert-async 공통: 업로드 파일 검사/저장 및 변환 옵션 파싱
+    file 대신 upload_id를 주면 /upload(청크 업로드)로 미리 올린 파일을 사용 (조기 ffprobe 결과가 있으면 함께 반환)
+    반환: (input_path, output_format, quality_options, media_info, None) 또는 (None, None, None, None, 오류 메시지)
+    """
+    media_info = None
+    upload_id = request.form.get('upload_id')
+    if upload_id:
+        try:
+            upload = chunked_uploads.claim(upload_id)
+        except UploadError as e:
+            return None, None, None, None, str(e)
+        input_path, media_info = upload['path'], upload['analysis']
+    else:
         # 파일 업로드 확인
         if 'file' not in request.files:
-            return jsonify({'success': False, 'error': '파일이 선택되지 않았습니다.'})
+            return None, None, None, None, '파일이 선택되지 않았습니다.'
         
         file = request.files['file']
         if file.filename == '':
-            return jsonify({'success': False, 'error': '파일이 선택되지 않았습니다.'})
+            return None, None, None, None, '파일이 선택되지 않았습니다.'
         
         # 파일 유효성 검사
         if not allowed_file(file.filename):
-            return jsonify({'success': False, 'error': '지원되지 않는 파일 형식입니다.'})
+            return None, None, None, None, '지원되지 않는 파일 형식입니다.'
         
         # 파일 크기 검사 (500MB 제한)
         file.seek(0, 2)  # 파일 끝으로 이동
@@ -556,7 +621,7 @@ def convert_file():
         file.seek(0)  # 파일 시작으로 되돌리기
         
         if file_size > 500 * 1024 * 1024:  # 500MB
-            return jsonify({'success': False, 'error': '파일 크기가 500MB를 초과합니다.'})
+            return None, None, None, None, '파일 크기가 500MB를 초과합니다.'
         
         # 파일 저장
         filename = secure_filename(file.filename)
@@ -564,23 +629,38 @@ def convert_file():
         unique_filename = f"{timestamp}_{filename}"
         input_path = os.path.join(UPLOAD_FOLDER, unique_filename)
         file.save(input_path)
-        
-        # 변환 옵션 가져오기
-        output_format = request.form.get('format', 'mp4')
-        quality_options = {}
-        
-        # 품질 설정 파싱
-        if request.form.get('video_quality'):
-            quality_options['video_quality'] = request.form.get('video_quality')
-        if request.form.get('video_codec'):
-            quality_options['video_codec'] = request.form.get('video_codec')
-        if request.form.get('audio_codec'):
-            quality_options['audio_codec'] = request.form.get('audio_codec')
-        if request.form.get('audio_bitrate'):
-            quality_options['audio_bitrate'] = request.form.get('audio_bitrate')
+    
+    # 변환 옵션 가져오기
+    output_format = request.form.get('format', 'mp4')
+    quality_options = {}
+    
+    # 품질 설정 파싱
+    if request.form.get('video_quality'):
+        quality_options['video_quality'] = request.form.get('video_quality')
+    if request.form.get('video_codec'):
+        quality_options['video_codec'] = request.form.get('video_codec')
+    if request.form.get('audio_codec'):
+        quality_options['audio_codec'] = request.form.get('audio_codec')
+    if request.form.get('audio_bitrate'):
+        quality_options['audio_bitrate'] = request.form.get('audio_bitrate')
+    # 인코더 프리셋: fast / balanced / small (+ 선택적으로 x264 tune)
+    if request.form.get('preset'):
+        quality_options['preset'] = request.form.get('preset')
+    if request.form.get('tune'):
+        quality_options['tune'] = request.form.get('tune')
+    
+    return input_path, output_format, quality_options, media_info, None
+
+@app.route('/convert', methods=['POST'])
+def convert_file():
+    """파일 업로드 및 변환 처리"""
+    try:
+        input_path, output_format, quality_options, media_info, error = _save_convert_upload()
+        if error:
+            return jsonify({'success': False, 'error': error})
         
         # 파일 변환 실행
-        result = convert_video_file(input_path, output_format, quality_options)
+        result = convert_video_file(input_path, output_format, quality_options, media_info)
         
         # 임시 업로드 파일 삭제
         try:
@@ -593,7 +673,8 @@ def convert_file():
                 'success': True,
                 'message': '파일 변환이 완료되었습니다.',
                 'download_url': f'/download-file/{result["output_file"]}',
-                'filename': result['output_file']
+                'filename': result['output_file'],
+                'mode': result['mode']
             })
         else:
             return jsonify({'success': False, 'error': result['error']})
@@ -601,6 +682,65 @@ def convert_file():
     except Exception as e:
         return jsonify({'success': False, 'error': f'파일 처리 중 오류가 발생했습니다: {str(e)}'})
 
+@app.route('/convert-async', methods=['POST'])
+def convert_file_async():
+    """파일 업로드 후 변환 작업만 등록하고 job_id 반환 (진행률은 /job/<job_id>로 조회)"""
+    try:
+        input_path, output_format, quality_options, media_info, error = _save_convert_upload()
+        if error:
+            return jsonify({'success': False, 'error': error}), 400
+        
+        cmd, output_filename, output_path = build_convert_command(input_path, output_format, quality_options)
+        # 입력 분석: 길이(진행률 계산용) + 스트림 복사 가능 여부 (청크 업로드 중 이미 분석했으면 재사용)
+        media_info = media_info or probe_media(input_path)
+        remux_cmd, reason = build_remux_command(input_path, output_format, quality_options, media_info)
+        meta = {'format': output_format, 'mode': 'remux' if remux_cmd else 'transcode', 'reason': reason}
+        try:
+            if remux_cmd:
+                job_id = transcoder.submit(remux_cmd, output_path, input_path=input_path,
+                                           duration=media_info['duration'], meta=meta, fallback_cmd=cmd)
+            else:
+                job_id = transcoder.submit(cmd, output_path, input_path=input_path,
+                                           duration=media_info['duration'] if media_info else None, meta=meta)
+        except QueueFullError as e:
+            try:
+                os.remove(input_path)
+            except:
+                pass
+            return jsonify({'success': False, 'error': str(e)}), 429
+        
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'mode': meta['mode'],
+            'status_url': f'/job/{job_id}',
+            'cancel_url': f'/job/{job_id}/cancel'
+        }), 202
+            
+    except Exception as e:
+        return jsonify({'success': False, 'error': f'파일 처리 중 오류가 발생했습니다: {str(e)}'}), 500
+
+@app.route('/job/<job_id>')
+def convert_job_status(job_id):
+    """변환 작업 상태: status(queued/running/done/error/cancelled), progress(%), fps, speed, eta_seconds"""
+    info = transcoder.status(job_id)
+    if info is None:
+        return jsonify({'success': False, 'error': '작업을 찾을 수 없습니다.'}), 404
+    if info.get('fallback_used'):
+        info['mode'] = 'transcode'  # 스트림 복사 실패 후 재인코딩
+    if info['status'] == 'done':
+        info['download_url'] = f'/download-file/{info["output_file"]}'
+    return jsonify(info)
+
+@app.route('/job/<job_id>/cancel', methods=['POST'])
+def convert_job_cancel(job_id):
+    """변환 작업 취소 (실행 중이면 ffmpeg 프로세스 그룹 종료)"""
+    if transcoder.status(job_id) is None:
+        return jsonify({'success': False, 'error': '작업을 찾을 수 없습니다.'}), 404
+    if not transcoder.cancel(job_id):
+        return jsonify({'success': False, 'error': '이미 끝난 작업입니다.'}), 409
+    return jsonify({'success': True, 'job_id': job_id, 'status': 'cancelled'})
+
 @app.route('/download', methods=['POST'])
 def download():
     # 기존 다운로드 로직
@@ -775,7 +915,7 @@ def debug_cookies_content():
 
 @app.route('/download-file/<filename>')
 def download_file(filename):
-    """다운로드된 파일 전송 - 스트리밍 방식으로 개선"""
+    """다운로드된 파일 전송 - Range/If-Range/ETag 지원 (?inline=1 이면 브라우저에서 바로 재생)"""
     try:
         # .part 요청이 오면 최종 확장자로 매핑 시도
         if filename.endswith('.part'):
@@ -786,33 +926,12 @@ def download_file(filename):
                 filename = cand_mp4
             elif os.path.exists(os.path.join(OUTPUT_FOLDER, cand_mp3)):
                 filename = cand_mp3
-        
-        file_path = os.path.join(OUTPUT_FOLDER, filename)
-        
-        if not os.path.exists(file_path):
+
+        response = send_download(OUTPUT_FOLDER, filename, as_attachment=request.args.get('inline') != '1')
+        if response is None:
             return jsonify({'error': '파일을 찾을 수 없습니다.'}), 404
-        
-        # 스트리밍 방식으로 파일 전송
-        def generate():
-            with open(file_path, 'rb') as f:
-                while True:
-                    data = f.read(8192)  # 8KB씩 읽기
-                    if not data:
-                        break
-                    yield data
-        
-        file_size = os.path.getsize(file_path)
-        
-        return Response(
-            generate(),
-            mimetype='application/octet-stream',
-            headers={
-                'Content-Disposition': f'attachment; filename="{filename}"',
-                'Content-Length': str(file_size),
-                'Content-Type': 'application/octet-stream'
-            }
-        )
-        
+        return response
+
     except Exception as e:
         print(f"파일 전송 중 오류: {e}")
         return jsonify({'error': f'파일 전송 오류: {e}'}), 500
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+인코더 프리셋 벤치마크: 기존 명령(scale=1280:720, libx264 기본값) vs fast / balanced / small
+
+ffmpeg lavfi 소스(testsrc2 + sine)로 합성 테스트 클립을 만든 뒤 같은 입력을 각 설정으로 720p mp4로 변환해
+걸린 시간, 실시간 대비 속도, 출력 크기를 비교합니다.
+--jobs N 이면 같은 변환을 N개 동시에 돌려 작업당 스레드 상한(--threads)이 있을 때 총 처리 시간을 봅니다.
+
+사용법:
+    python bench_presets.py                                    # 기본: 1920x1080 30fps 20초 클립
+    python bench_presets.py --size 1280x720 --seconds 60 --jobs 2 --threads 2
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from encode_presets import ENCODE_PRESETS, FFMPEG_THREADS, audio_encode_args, scale_args, thread_args, video_encode_args
+from transcode_jobs import run_ffmpeg
+
+
+def make_clip(path: str, size: str, seconds: int, fps: int):
+    """움직이는 테스트 패턴 + 사인파 오디오 (무손실에 가까운 고화질 h264로 저장)"""
+    cmd = [
+        "ffmpeg", "-v", "error", "-y",
+        "-f", "lavfi", "-i", f"testsrc2=size={size}:rate={fps}",
+        "-f", "lavfi", "-i", "sine=frequency=440:sample_rate=48000",
+        "-t", str(seconds), "-c:v", "libx264", "-preset", "ultrafast", "-crf", "12",
+        "-c:a", "aac", "-b:a", "192k", "-shortest", path,
+    ]
+    subprocess.run(cmd, check=True)
+
+
+def legacy_command(src: str, dst: str) -> list:
+    """변경 전 build_convert_command (video_quality=720p)"""
+    return ["ffmpeg", "-i", src, "-y", "-vf", "scale=1280:720", dst]
+
+
+def preset_command(src: str, dst: str, preset: str, threads: int) -> list:
+    return (["ffmpeg"] + thread_args(threads) + ["-i", src, "-y"] + scale_args(720, preset)
+            + video_encode_args("libx264", preset, threads=threads) + audio_encode_args("aac", preset)
+            + ["-movflags", "+faststart", dst])
+
+
+def run_batch(make_cmd, out_dir: str, jobs: int) -> float:
+    """jobs개 동시 실행 → 전체 경과 시간"""
+    def one(i):
+        code, tail = run_ffmpeg(make_cmd(os.path.join(out_dir, f"out_{i}.mp4")))
+        if code != 0:
+            raise RuntimeError(tail)
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(one, range(jobs)))
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", default="1920x1080")
+    ap.add_argument("--seconds", type=int, default=20)
+    ap.add_argument("--fps", type=int, default=30)
+    ap.add_argument("--jobs", type=int, default=1, help="동시 변환 수")
+    ap.add_argument("--threads", type=int, default=FFMPEG_THREADS, help="작업당 스레드 수")
+    ap.add_argument("--skip-legacy", action="store_true")
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="bench_presets_")
+    try:
+        src = os.path.join(tmp, "clip.mp4")
+        make_clip(src, args.size, args.seconds, args.fps)
+        print(f"클립 {args.size} {args.fps}fps {args.seconds}초 ({os.path.getsize(src) / 1e6:.1f} MB), "
+              f"동시 {args.jobs}개, 작업당 스레드 {args.threads}, CPU {os.cpu_count()}")
+
+        cases = [] if args.skip_legacy else [("legacy", lambda dst: legacy_command(src, dst))]
+        cases += [(name, lambda dst, p=name: preset_command(src, dst, p, args.threads)) for name in ENCODE_PRESETS]
+
+        print(f"{'preset':<10} {'time(s)':>8} {'x realtime':>11} {'size(MB)':>9} {'resolution':>11}")
+        for name, make_cmd in cases:
+            out_dir = os.path.join(tmp, name)
+            os.makedirs(out_dir)
+            elapsed = run_batch(make_cmd, out_dir, args.jobs)
+            out = os.path.join(out_dir, "out_0.mp4")
+            probe = subprocess.run(
+                ["ffprobe", "-v", "error", "-select_streams", "v:0", "-show_entries", "stream=width,height",
+                 "-of", "csv=p=0:s=x", out],
+                capture_output=True, text=True,
+            )
+            resolution = probe.stdout.strip() or "?"
+            print(f"{name:<10} {elapsed:>8.2f} {args.seconds * args.jobs / elapsed:>10.2f}x "
+                  f"{os.path.getsize(out) / 1e6:>9.2f} {resolution:>11}")
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
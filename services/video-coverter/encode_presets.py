@@ -0,0 +1,118 @@
+"""
+인코더 프리셋(fast / balanced / small)과 작업당 스레드 상한
+
+기존 build_convert_command는 -vf scale=1280:720 처럼 가로세로를 고정해 화면비가 찌그러졌고,
+-preset/-crf/-threads 없이 ffmpeg 기본값(libx264 medium, 코어 전부 사용)으로 인코딩했습니다.
+동시에 여러 작업이 돌면 작업마다 모든 코어를 잡아 서로 밀어냈습니다.
+여기서는
+1. 프리셋 이름을 코덱별 CRF/preset/tune 값으로 바꾸고 (하드웨어 인코더 없이 x264/x265/VP9 소프트웨어 인코더만 사용),
+2. 해상도 변경은 scale=-2:<높이>로 화면비를 유지하며 (가로는 짝수로 맞춤),
+3. 작업당 스레드 수(-threads / -filter_threads)를 FFMPEG_THREADS로 제한해 TRANSCODE_WORKERS개 작업이 코어를 나눠 씁니다.
+
+환경 변수
+    ENCODE_PRESET: 기본 프리셋 (기본: balanced)
+    FFMPEG_THREADS: 작업당 스레드 수 (기본: CPU 수 / TRANSCODE_WORKERS, 최소 1)
+"""
+import os
+
+from transcode_jobs import TRANSCODE_WORKERS
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        v = int(os.environ.get(key, "0"))
+    except ValueError:
+        v = 0
+    return v if v > 0 else default
+
+
+# 코덱별 설정: x264/x265는 CRF + preset, VP9는 CRF + cpu-used (값이 클수록 빠름)
+ENCODE_PRESETS = {
+    "fast": {
+        "x264": {"crf": 23, "preset": "veryfast"},
+        "x265": {"crf": 28, "preset": "veryfast"},
+        "vp9": {"crf": 34, "cpu_used": 6},
+        "audio_bitrate": "128k",
+        "sws_flags": "bilinear",
+    },
+    "balanced": {
+        "x264": {"crf": 22, "preset": "faster"},
+        "x265": {"crf": 27, "preset": "faster"},
+        "vp9": {"crf": 32, "cpu_used": 4},
+        "audio_bitrate": "128k",
+        "sws_flags": "bicubic",
+    },
+    "small": {
+        "x264": {"crf": 28, "preset": "slow"},
+        "x265": {"crf": 32, "preset": "medium"},
+        "vp9": {"crf": 38, "cpu_used": 2},
+        "audio_bitrate": "96k",
+        "sws_flags": "lanczos",
+    },
+}
+
+# x264/x265 -tune 허용 값 (요청 값 그대로 명령줄에 들어가므로 목록으로 제한)
+X264_TUNES = {"film", "animation", "grain", "stillimage", "fastdecode", "zerolatency"}
+X265_TUNES = {"grain", "animation", "fastdecode", "zerolatency"}
+
+# 출력 형식별 기본 인코더 (여기 없는 형식은 ffmpeg 기본 인코더 사용)
+DEFAULT_ENCODERS = {
+    "mp4": ("libx264", "aac"),
+    "m4v": ("libx264", "aac"),
+    "mov": ("libx264", "aac"),
+    "mkv": ("libx264", "aac"),
+    "flv": ("libx264", "aac"),
+    "webm": ("libvpx-vp9", "libopus"),
+}
+
+_ENCODER_FAMILY = {"libx264": "x264", "libx265": "x265", "libvpx-vp9": "vp9"}
+
+DEFAULT_PRESET = os.environ.get("ENCODE_PRESET", "balanced").strip().lower()
+if DEFAULT_PRESET not in ENCODE_PRESETS:
+    DEFAULT_PRESET = "balanced"
+
+FFMPEG_THREADS = _env_int("FFMPEG_THREADS", max(1, (os.cpu_count() or 1) // TRANSCODE_WORKERS))
+
+
+def resolve_preset(name) -> str:
+    """프리셋 이름 정규화 (모르는 이름이면 기본 프리셋)"""
+    name = (name or "").strip().lower()
+    return name if name in ENCODE_PRESETS else DEFAULT_PRESET
+
+
+def thread_args(threads: int = None) -> list:
+    """입력 앞에 둘 스레드 인자 (디코더 + 필터 그래프)"""
+    n = str(threads or FFMPEG_THREADS)
+    return ["-threads", n, "-filter_threads", n]
+
+
+def scale_args(height: int, preset: str = None) -> list:
+    """화면비를 유지한 채 높이만 맞추는 스케일 필터 (가로는 짝수로 반올림)"""
+    flags = ENCODE_PRESETS[resolve_preset(preset)]["sws_flags"]
+    return ["-vf", f"scale=-2:{int(height)}:flags={flags}"]
+
+
+def video_encode_args(video_codec: str, preset: str = None, tune: str = None, threads: int = None) -> list:
+    """비디오 인코더 + 프리셋 인자. 프리셋을 모르는 인코더면 -c:v 와 스레드 수만"""
+    preset_cfg = ENCODE_PRESETS[resolve_preset(preset)]
+    n = str(threads or FFMPEG_THREADS)
+    args = ["-c:v", video_codec]
+    family = _ENCODER_FAMILY.get(video_codec)
+    if family in ("x264", "x265"):
+        cfg = preset_cfg[family]
+        args += ["-preset", cfg["preset"], "-crf", str(cfg["crf"]), "-pix_fmt", "yuv420p"]
+        tune = (tune or "").strip().lower()
+        if tune in (X264_TUNES if family == "x264" else X265_TUNES):
+            args += ["-tune", tune]
+        if family == "x265":
+            args += ["-x265-params", f"pools={n}:log-level=error", "-tag:v", "hvc1"]
+    elif family == "vp9":
+        cfg = preset_cfg["vp9"]
+        args += ["-crf", str(cfg["crf"]), "-b:v", "0", "-deadline", "good",
+                 "-cpu-used", str(cfg["cpu_used"]), "-row-mt", "1"]
+    return args + ["-threads", n]
+
+
+def audio_encode_args(audio_codec: str, preset: str = None, bitrate: str = None) -> list:
+    """오디오 인코더 + 비트레이트 (bitrate를 지정하지 않으면 프리셋 값)"""
+    return ["-c:a", audio_codec, "-b:a", bitrate or ENCODE_PRESETS[resolve_preset(preset)]["audio_bitrate"]]
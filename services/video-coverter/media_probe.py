@@ -0,0 +1,190 @@
+"""
+ffprobe 기반 입력 분석 + 스트림 복사(리먹스) 판단
+
+convert_video_file은 mkv(h264/aac)→mp4처럼 컨테이너만 바꾸면 되는 경우에도 항상 다시 인코딩했습니다.
+여기서는 ffprobe로 입력 스트림의 코덱/해상도를 읽고, 출력 형식이 그 코덱을 그대로 담을 수 있으며
+요청한 옵션(해상도 변경, 코덱 지정, 비트레이트, small 프리셋 - 서버 기본값 포함)이 재인코딩을 요구하지 않으면 -c copy 리먹스 인자를 만듭니다.
+리먹스는 디코딩/인코딩이 없어 디스크 읽기/쓰기 속도로 끝납니다(재인코딩 대비 수십~수백 배).
+mp4/mov 계열은 -movflags +faststart로 moov 박스를 앞으로 옮겨 다운로드 중에도 재생되게 합니다.
+
+ffprobe가 없거나 분석에 실패하면 None을 돌려주고 호출 측은 기존처럼 재인코딩합니다.
+
+환경 변수
+    FFPROBE_TIMEOUT: ffprobe 실행 제한 시간(초) (기본: 30)
+"""
+import json
+import os
+import subprocess
+
+from encode_presets import resolve_preset
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        v = int(os.environ.get(key, "0"))
+    except ValueError:
+        v = 0
+    return v if v > 0 else default
+
+
+FFPROBE_TIMEOUT = _env_int("FFPROBE_TIMEOUT", 30)
+
+_MP4_CODECS = {
+    "video": {"h264", "hevc", "mpeg4", "av1"},
+    "audio": {"aac", "mp3", "ac3", "eac3", "alac"},
+}
+
+# 비디오 출력 형식별로 -c copy 로 그대로 담을 수 있는 코덱 (None = 제한 없음)
+REMUX_CODECS = {
+    "mp4": _MP4_CODECS,
+    "m4v": _MP4_CODECS,
+    "mov": {
+        "video": {"h264", "hevc", "mpeg4", "prores", "mjpeg"},
+        "audio": {"aac", "mp3", "ac3", "alac", "pcm_s16le", "pcm_s24le"},
+    },
+    "mkv": {"video": None, "audio": None},
+    "webm": {"video": {"vp8", "vp9", "av1"}, "audio": {"vorbis", "opus"}},
+    "avi": {"video": {"mpeg4", "h264", "mjpeg", "msmpeg4v3"}, "audio": {"mp3", "ac3", "pcm_s16le"}},
+    "flv": {"video": {"h264", "flv1"}, "audio": {"aac", "mp3"}},
+}
+
+# 오디오 출력 형식별로 그대로 복사할 수 있는 코덱 (첫 번째 오디오 스트림만 사용)
+AUDIO_REMUX_CODECS = {
+    "mp3": {"mp3"},
+    "aac": {"aac"},
+    "m4a": {"aac", "alac"},
+    "flac": {"flac"},
+    "wav": {"pcm_s16le", "pcm_s24le", "pcm_s32le", "pcm_f32le", "pcm_u8"},
+    "ogg": {"vorbis", "opus", "flac"},
+    "opus": {"opus"},
+}
+
+FASTSTART_FORMATS = {"mp4", "m4v", "mov", "m4a"}
+
+# quality_options의 인코더 이름 → 결과 코덱 이름 (같으면 복사 가능)
+ENCODER_CODECS = {
+    "libx264": "h264", "h264": "h264",
+    "libx265": "hevc", "hevc": "hevc", "h265": "hevc",
+    "libvpx": "vp8", "vp8": "vp8",
+    "libvpx-vp9": "vp9", "vp9": "vp9",
+    "libaom-av1": "av1", "libsvtav1": "av1", "av1": "av1",
+    "mpeg4": "mpeg4",
+    "aac": "aac", "libfdk_aac": "aac",
+    "libmp3lame": "mp3", "mp3": "mp3",
+    "libopus": "opus", "opus": "opus",
+    "libvorbis": "vorbis", "vorbis": "vorbis",
+    "flac": "flac",
+}
+
+QUALITY_HEIGHTS = {"720p": 720, "480p": 480, "360p": 360}
+
+
+def probe_media(path: str):
+    """
+    ffprobe로 컨테이너/스트림 정보 조회
+    반환: {'format_name', 'duration', 'streams': [{'index', 'codec_type', 'codec_name', 'width', 'height', ...}]}
+          ffprobe가 없거나 실패하면 None
+    """
+    cmd = [
+        "ffprobe", "-v", "error",
+        "-show_entries",
+        "format=format_name,duration:stream=index,codec_type,codec_name,width,height,pix_fmt:stream_disposition=attached_pic",
+        "-of", "json", path,
+    ]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=FFPROBE_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    if result.returncode != 0:
+        return None
+    try:
+        data = json.loads(result.stdout or "{}")
+    except ValueError:
+        return None
+
+    fmt = data.get("format") or {}
+    try:
+        duration = float(fmt.get("duration"))
+    except (TypeError, ValueError):
+        duration = None
+    return {
+        "format_name": fmt.get("format_name"),
+        "duration": duration if duration and duration > 0 else None,
+        "streams": data.get("streams") or [],
+    }
+
+
+def _is_cover_art(stream: dict) -> bool:
+    return bool((stream.get("disposition") or {}).get("attached_pic"))
+
+
+def _codec_allowed(codec, allowed) -> bool:
+    return allowed is None or codec in allowed
+
+
+def _requested_codec(quality_options: dict, key: str):
+    """요청한 인코더의 결과 코덱 이름. 지정 안 함/copy면 None, 모르는 인코더면 빈 문자열(복사 불가)"""
+    encoder = (quality_options.get(key) or "").strip().lower()
+    if not encoder or encoder == "copy":
+        return None
+    return ENCODER_CODECS.get(encoder, "")
+
+
+def plan_stream_copy(info: dict, output_format: str, quality_options: dict = None):
+    """
+    리먹스로 충분한지 판단
+    반환: (ffmpeg 출력 인자 리스트, 사유) - 재인코딩이 필요하면 (None, 사유)
+    """
+    if not info:
+        return None, "분석 정보 없음"
+    output_format = (output_format or "").lower()
+    quality_options = quality_options or {}
+    # 폼에 preset이 없으면 서버 기본 프리셋(ENCODE_PRESET)으로 판단
+    if resolve_preset(quality_options.get("preset")) == "small":
+        return None, "용량 줄이기(small) 프리셋"
+    streams = info.get("streams") or []
+    audio = [s for s in streams if s.get("codec_type") == "audio"]
+
+    if output_format in AUDIO_REMUX_CODECS:
+        if quality_options.get("audio_bitrate"):
+            return None, "오디오 비트레이트 변경"
+        if not audio:
+            return None, "오디오 스트림 없음"
+        codec = audio[0].get("codec_name")
+        wanted = _requested_codec(quality_options, "audio_codec")
+        if codec not in AUDIO_REMUX_CODECS[output_format] or wanted not in (None, codec):
+            return None, f"{output_format}에 {codec} 복사 불가"
+        args = ["-map", "0:a:0", "-vn", "-c:a", "copy"]
+        if output_format in FASTSTART_FORMATS:
+            args += ["-movflags", "+faststart"]
+        return args, f"오디오 {codec} 복사"
+
+    allowed = REMUX_CODECS.get(output_format)
+    if allowed is None:
+        return None, f"{output_format} 형식은 리먹스 대상 아님"
+    video = [s for s in streams if s.get("codec_type") == "video" and not _is_cover_art(s)]
+    if not video and not audio:
+        return None, "비디오/오디오 스트림 없음"
+
+    target_height = QUALITY_HEIGHTS.get(quality_options.get("video_quality"))
+    wanted_video = _requested_codec(quality_options, "video_codec")
+    wanted_audio = _requested_codec(quality_options, "audio_codec")
+    for s in video:
+        codec = s.get("codec_name")
+        if not _codec_allowed(codec, allowed["video"]) or wanted_video not in (None, codec):
+            return None, f"{output_format}에 비디오 {codec} 복사 불가"
+        if target_height and s.get("height") != target_height:
+            return None, f"해상도 변경 ({s.get('height')}p → {target_height}p)"
+    for s in audio:
+        codec = s.get("codec_name")
+        if not _codec_allowed(codec, allowed["audio"]) or wanted_audio not in (None, codec):
+            return None, f"{output_format}에 오디오 {codec} 복사 불가"
+
+    # 0:V = 커버 이미지를 제외한 비디오, 자막/데이터 스트림은 컨테이너 호환 문제가 있어 제외
+    args = ["-map", "0:V?", "-map", "0:a?", "-c", "copy"]
+    if output_format in FASTSTART_FORMATS:
+        args += ["-movflags", "+faststart"]
+        if any(s.get("codec_name") == "hevc" for s in video):
+            args += ["-tag:v", "hvc1"]  # Apple 기기 재생 호환
+    codecs = "/".join(s.get("codec_name") or "?" for s in video + audio)
+    return args, f"{codecs} 스트림 복사"
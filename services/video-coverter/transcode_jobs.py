@@ -0,0 +1,390 @@
+"""
+FFmpeg 비동기 변환 작업 엔진
+
+기존 /convert는 요청 스레드 안에서 subprocess.run(..., timeout=300)으로 ffmpeg를 돌렸습니다.
+변환이 끝날 때까지 워커가 묶이고, 5분이 넘는 파일은 중간에 실패했으며, 클라이언트는 진행률을 알 수 없었습니다.
+여기서는
+1. TranscodeManager.submit()이 작업 ID를 바로 돌려주고 ffmpeg는 크기가 정해진 스레드 풀에서 실행,
+2. ffmpeg에 -progress pipe:1 을 붙여 out_time/fps/speed를 읽고 진행률(%)/fps/남은 시간(ETA)으로 변환,
+3. 취소 시 ffmpeg를 새 세션(프로세스 그룹)으로 띄워 두었다가 그룹 전체를 종료하고 중간 출력 파일을 지웁니다.
+4. fallback_cmd를 함께 주면 첫 명령(예: 스트림 복사)이 실패했을 때 그 명령(재인코딩)으로 한 번 더 실행합니다.
+변환 시간 제한은 두지 않습니다(취소로 중단).
+
+환경 변수
+    TRANSCODE_WORKERS: 동시에 실행할 ffmpeg 프로세스 수 (기본: 2)
+    TRANSCODE_MAX_QUEUED: 대기 + 실행 중 작업 최대 수, 넘으면 QueueFullError (기본: 16)
+    TRANSCODE_JOB_TTL: 끝난 작업 정보를 보관하는 시간(초) (기본: 3600)
+"""
+import os
+import re
+import signal
+import subprocess
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        v = int(os.environ.get(key, "0"))
+    except ValueError:
+        v = 0
+    return v if v > 0 else default
+
+
+TRANSCODE_WORKERS = _env_int("TRANSCODE_WORKERS", 2)
+TRANSCODE_MAX_QUEUED = _env_int("TRANSCODE_MAX_QUEUED", 16)
+TRANSCODE_JOB_TTL = _env_int("TRANSCODE_JOB_TTL", 3600)
+
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+_STDERR_TAIL_LINES = 40
+
+
+class QueueFullError(RuntimeError):
+    """대기열이 가득 차 작업을 받을 수 없음"""
+
+
+class JobCancelled(Exception):
+    """취소 요청으로 ffmpeg가 종료됨"""
+
+
+def _parse_seconds(value):
+    """'12.5' / '12.5x' / 'N/A' → float 또는 None"""
+    try:
+        return float(str(value).rstrip("x"))
+    except (TypeError, ValueError):
+        return None
+
+
+class FFmpegProgress:
+    """
+    -progress 출력(key=value 줄, progress=continue|end 로 한 블록 끝)을 누적해 진행 상태 계산
+    duration(초)을 모르면 percent/eta는 None
+    """
+
+    def __init__(self, duration: float = None):
+        self.duration = duration if duration and duration > 0 else None
+        self.started = time.time()
+        self.out_time = 0.0
+        self.fps = None
+        self.speed = None
+        self.done = False
+        self._block = {}
+
+    def feed(self, line: str) -> bool:
+        """한 줄 반영. 블록이 끝나 값이 갱신됐으면 True"""
+        key, sep, value = line.strip().partition("=")
+        if not sep:
+            return False
+        if key != "progress":
+            self._block[key] = value
+            return False
+
+        block, self._block = self._block, {}
+        # out_time_ms도 실제로는 마이크로초 단위 (ffmpeg 호환성 유지용 이름)
+        us = block.get("out_time_us", block.get("out_time_ms"))
+        if us is not None and _parse_seconds(us) is not None:
+            self.out_time = max(0.0, _parse_seconds(us) / 1_000_000)
+        fps = _parse_seconds(block.get("fps"))
+        if fps is not None:
+            self.fps = fps
+        speed = _parse_seconds(block.get("speed"))
+        if speed:
+            self.speed = speed
+        self.done = value == "end"
+        return True
+
+    @property
+    def percent(self):
+        if self.done:
+            return 100.0
+        if not self.duration:
+            return None
+        return round(min(99.9, self.out_time * 100.0 / self.duration), 1)
+
+    @property
+    def eta(self):
+        """남은 시간(초): speed(미디어 초/실제 초)가 있으면 그것으로, 없으면 경과 시간 비례"""
+        if self.done:
+            return 0.0
+        if not self.duration or self.out_time <= 0:
+            return None
+        remaining = max(0.0, self.duration - self.out_time)
+        if self.speed:
+            return round(remaining / self.speed, 1)
+        elapsed = time.time() - self.started
+        return round(elapsed * remaining / self.out_time, 1)
+
+    def snapshot(self) -> dict:
+        return {
+            "progress": self.percent,
+            "fps": self.fps,
+            "speed": self.speed,
+            "eta_seconds": self.eta,
+            "out_time": round(self.out_time, 2),
+            "duration": self.duration,
+        }
+
+
+def kill_process_group(proc: subprocess.Popen):
+    """ffmpeg와 그 자식까지 종료 (POSIX는 프로세스 그룹, 그 외는 프로세스만)"""
+    if proc.poll() is not None:
+        return
+    try:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_ffmpeg(cmd: list, duration: float = None, on_progress=None, on_start=None, cancel_event=None):
+    """
+    ffmpeg 명령 실행 (시간 제한 없음)
+
+    cmd: ['ffmpeg', ...] 형태. -progress pipe:1 -nostats 를 자동으로 붙임
+    duration: 입력 길이(초). 없으면 ffmpeg stderr의 Duration 줄에서 읽음
+    on_progress(snapshot): 진행 블록마다 호출
+    on_start(proc): 프로세스 시작 직후 호출 (취소용 핸들 보관)
+    cancel_event: set 되면 JobCancelled
+
+    반환: (returncode, stderr 마지막 줄들)
+    """
+    full_cmd = [cmd[0], "-hide_banner", "-nostats", "-progress", "pipe:1"] + list(cmd[1:])
+    popen_kwargs = {}
+    if os.name == "posix":
+        popen_kwargs["start_new_session"] = True  # 새 프로세스 그룹 → killpg로 한 번에 종료
+    proc = subprocess.Popen(
+        full_cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=True,
+        errors="replace",
+        bufsize=1,
+        **popen_kwargs,
+    )
+    progress = FFmpegProgress(duration)
+    tail = deque(maxlen=_STDERR_TAIL_LINES)
+
+    def drain_stderr():
+        # stderr를 읽지 않으면 파이프 버퍼가 차서 ffmpeg가 멈춤
+        for line in proc.stderr:
+            tail.append(line.rstrip())
+            if progress.duration is None:
+                m = _DURATION_RE.search(line)
+                if m:
+                    h, mnt, s = m.groups()
+                    progress.duration = int(h) * 3600 + int(mnt) * 60 + float(s) or None
+
+    stderr_thread = threading.Thread(target=drain_stderr, daemon=True)
+    stderr_thread.start()
+    try:
+        if on_start:
+            on_start(proc)
+        if cancel_event is not None and cancel_event.is_set():
+            kill_process_group(proc)
+        for line in proc.stdout:
+            if progress.feed(line) and on_progress:
+                on_progress(progress.snapshot())
+        returncode = proc.wait()
+    except BaseException:
+        kill_process_group(proc)
+        proc.wait()
+        raise
+    finally:
+        stderr_thread.join(timeout=5)
+        proc.stdout.close()
+        proc.stderr.close()
+
+    if cancel_event is not None and cancel_event.is_set():
+        raise JobCancelled()
+    return returncode, "\n".join(tail)
+
+
+class TranscodeJob:
+    def __init__(self, job_id: str, cmd: list, output_path: str, input_path: str = None,
+                 duration: float = None, meta: dict = None, fallback_cmd: list = None):
+        self.job_id = job_id
+        self.cmd = cmd
+        self.fallback_cmd = fallback_cmd
+        self.fallback_used = False
+        self.output_path = output_path
+        self.input_path = input_path
+        self.duration = duration
+        self.meta = dict(meta or {})
+        self.status = "queued"
+        self.progress = {"progress": 0.0}
+        self.error = None
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.cancel_event = threading.Event()
+        self.proc = None
+
+    def to_dict(self) -> dict:
+        end = self.finished or time.time()
+        info = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "elapsed": round(end - self.started, 1) if self.started else 0.0,
+            "output_file": os.path.basename(self.output_path) if self.status == "done" else None,
+            "error": self.error,
+        }
+        if self.fallback_cmd:
+            info["fallback_used"] = self.fallback_used
+        info.update(self.progress)
+        info.update(self.meta)
+        return info
+
+
+class TranscodeManager:
+    """
+    크기가 정해진 스레드 풀에서 ffmpeg 작업 실행 (스레드는 ffmpeg 종료를 기다리기만 하므로 GIL 경합 없음)
+
+        manager = TranscodeManager()
+        job_id = manager.submit(cmd, output_path, input_path=input_path)
+        manager.status(job_id)   # {'status': 'running', 'progress': 42.0, 'fps': 87.0, 'eta_seconds': 31.5, ...}
+        manager.cancel(job_id)
+    """
+
+    def __init__(self, max_workers: int = None, max_queued: int = None, job_ttl: int = None):
+        self.max_workers = max_workers or TRANSCODE_WORKERS
+        self.max_queued = max_queued or TRANSCODE_MAX_QUEUED
+        self.job_ttl = job_ttl or TRANSCODE_JOB_TTL
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ffmpeg")
+        self._jobs = {}
+        self._queue = deque()  # 대기 중 작업 ID (순번 계산용)
+        self._lock = threading.Lock()
+
+    def _prune(self, now: float):
+        expired = [jid for jid, job in self._jobs.items()
+                   if job.finished and now - job.finished > self.job_ttl]
+        for jid in expired:
+            del self._jobs[jid]
+
+    def submit(self, cmd: list, output_path: str, input_path: str = None, duration: float = None,
+               meta: dict = None, fallback_cmd: list = None) -> str:
+        """
+        작업 등록 후 ID 반환. input_path는 작업이 끝나면(성공/실패/취소) 삭제
+        fallback_cmd: cmd가 실패하면 중간 출력을 지우고 이 명령으로 한 번 더 실행
+        """
+        with self._lock:
+            self._prune(time.time())
+            active = sum(1 for job in self._jobs.values() if job.status in ("queued", "running"))
+            if active >= self.max_queued:
+                raise QueueFullError(f"변환 대기열이 가득 찼습니다 ({active}/{self.max_queued}).")
+            job = TranscodeJob(uuid.uuid4().hex, cmd, output_path, input_path, duration, meta, fallback_cmd)
+            self._jobs[job.job_id] = job
+            self._queue.append(job.job_id)
+        self._executor.submit(self._run, job)
+        return job.job_id
+
+    def status(self, job_id: str):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            info = job.to_dict()
+            if job.status == "queued":
+                info["queue_position"] = self._queue.index(job_id) + 1
+        return info
+
+    def cancel(self, job_id: str) -> bool:
+        """대기 중이면 바로 취소, 실행 중이면 ffmpeg 프로세스 그룹 종료. 이미 끝난 작업이면 False"""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.status not in ("queued", "running"):
+                return False
+            job.cancel_event.set()
+            proc = job.proc
+            if job.status == "queued":
+                self._finish(job, "cancelled")
+        if proc is not None:
+            kill_process_group(proc)
+        return True
+
+    def _finish(self, job: TranscodeJob, status: str, error: str = None):
+        """self._lock 보유 상태에서 호출"""
+        job.status = status
+        job.error = error
+        job.finished = time.time()
+        job.proc = None
+        try:
+            self._queue.remove(job.job_id)
+        except ValueError:
+            pass
+
+    def _set_proc(self, job: TranscodeJob, proc):
+        with self._lock:
+            job.proc = proc
+
+    def _set_progress(self, job: TranscodeJob, snapshot: dict):
+        with self._lock:
+            if snapshot.get("progress") is None:
+                snapshot["progress"] = job.progress.get("progress", 0.0)
+            job.progress = snapshot
+
+    def _run(self, job: TranscodeJob):
+        with self._lock:
+            if job.status != "queued":  # 대기 중 취소됨
+                self._remove(job.input_path)
+                return
+            job.status = "running"
+            job.started = time.time()
+            self._queue.remove(job.job_id)
+
+        status, error = "error", None
+        try:
+            returncode, stderr_tail = self._run_command(job, job.cmd)
+            if returncode != 0 and job.fallback_cmd:
+                self._remove(job.output_path)
+                with self._lock:
+                    job.fallback_used = True
+                    job.progress = {"progress": 0.0}
+                returncode, stderr_tail = self._run_command(job, job.fallback_cmd)
+            if returncode == 0:
+                status = "done"
+            else:
+                error = f"FFmpeg 오류: {stderr_tail}"
+        except JobCancelled:
+            status = "cancelled"
+        except Exception as e:
+            error = f"변환 중 오류가 발생했습니다: {e}"
+        finally:
+            self._remove(job.input_path)
+            if status != "done":
+                self._remove(job.output_path)  # 중간 출력 파일
+            with self._lock:
+                if status == "done":
+                    job.progress.update(progress=100.0, eta_seconds=0.0)
+                self._finish(job, status, error)
+
+    def _run_command(self, job: TranscodeJob, cmd: list):
+        return run_ffmpeg(
+            cmd,
+            duration=job.duration,
+            on_progress=lambda snap: self._set_progress(job, snap),
+            on_start=lambda proc: self._set_proc(job, proc),
+            cancel_event=job.cancel_event,
+        )
+
+    @staticmethod
+    def _remove(path: str):
+        if not path:
+            return
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def shutdown(self):
+        """실행 중인 작업을 모두 취소하고 풀 종료"""
+        with self._lock:
+            job_ids = [jid for jid, job in self._jobs.items() if job.status in ("queued", "running")]
+        for jid in job_ids:
+            self.cancel(jid)
+        self._executor.shutdown(wait=True)
@@ -1,7 +1,8 @@
 from flask import Flask, request, jsonify, send_file, make_response, render_template, redirect
 from flask_cors import CORS
-import os, io, sys, logging, subprocess, shlex
+import os, io, sys, logging
 from uuid import uuid4
+from lo_pool import create_pool, find_soffice
 from urllib.parse import quote
 import unicodedata
 
@@ -29,6 +30,9 @@ ALLOWED_EXTS = {".xls", ".xlsx"}
 
 SERVICE_NAME = os.getenv("SERVICE_DIR", "xls-pdf")
 
+# 미리 띄워 둔 LibreOffice 리스너 풀 (요청마다 soffice 콜드 스타트 없음)
+LO_POOL = create_pool()
+
 def _accept_from_allowed():
     # ALLOWED_EXTS = {".xls",".xlsx"} 같은 세트가 서비스별로 이미 있습니다.
     return ",".join(sorted(ALLOWED_EXTS))
@@ -63,45 +67,16 @@ def _is_pdf(path: str) -> bool:
 
 def _find_soffice():
     """Find LibreOffice soffice executable"""
-    import shutil
-    return shutil.which("soffice") or shutil.which("libreoffice") or "/usr/bin/soffice"
+    return find_soffice()
 
 def perform_libreoffice(in_path: str, out_pdf_path: str):
-    """Convert spreadsheet to PDF using LibreOffice"""
-    soffice = _find_soffice()
-    if not soffice:
-        raise RuntimeError("LibreOffice not found")
-    
-    outdir = os.path.dirname(out_pdf_path)
-    os.makedirs(outdir, exist_ok=True)
-    
+    """Convert spreadsheet to PDF on a warm LibreOffice listener (lo_pool)"""
     ext = os.path.splitext(in_path)[1].lower()
     filters = {
         ".xls": "calc_pdf_Export",
         ".xlsx": "calc_pdf_Export",
     }
-    conv = f"pdf:{filters.get(ext, 'pdf')}"
-    
-    # Use environment variable to set proper encoding for Windows
-    env = os.environ.copy()
-    env['LANG'] = 'en_US.UTF-8'
-    env['LC_ALL'] = 'en_US.UTF-8'
-    
-    cmd = f'{shlex.quote(soffice)} --headless --nologo --nofirststartwizard --convert-to {conv} --outdir {shlex.quote(outdir)} {shlex.quote(in_path)}'
-    logging.info(f"[LO] cmd={cmd}")
-    
-    p = subprocess.run(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, env=env)
-    if p.returncode != 0:
-        error_msg = p.stderr.decode("utf-8", "ignore").strip()
-        if not error_msg:
-            error_msg = p.stdout.decode("utf-8", "ignore").strip()
-        if not error_msg:
-            error_msg = f"LibreOffice conversion failed with return code {p.returncode}"
-        raise RuntimeError(error_msg)
-    
-    produced = os.path.join(outdir, os.path.splitext(os.path.basename(in_path))[0] + ".pdf")
-    if not os.path.exists(produced):
-        raise RuntimeError(f"PDF not produced: {produced}")
+    LO_POOL.convert(in_path, out_pdf_path, convert_to=f"pdf:{filters.get(ext, 'pdf')}")
 
 
 
@@ -120,6 +95,7 @@ def health():
         return jsonify({
             "status": "healthy",
             "service": "xls-pdf",
+            "lo_pool": LO_POOL.stats(),
             "timestamp": os.getenv("RENDER_GIT_COMMIT", "unknown")
         })
     except Exception as e:
@@ -0,0 +1,370 @@
+"""
+미리 띄워 둔 LibreOffice 리스너 풀
+
+기존 perform_libreoffice는 요청마다 `soffice --headless --convert-to`를 새로 실행해 매번 2~5초의 기동 비용이 들었고,
+동시 요청들이 같은 기본 사용자 프로필을 두고 충돌했습니다.
+여기서는 soffice 리스너 몇 개를 미리 띄워 두고 UNO로 변환을 맡깁니다.
+
+- 리스너마다 -env:UserInstallation 프로필을 따로 써서 잠금 충돌이 없음
+- LO_MAX_JOBS번 변환하면, 또는 크래시하면 바로 리스너를 재시작
+- 변환마다 제한 시간이 있고, 멈춘 리스너는 죽이고 다시 띄움
+- `uno` 모듈을 불러올 수 없으면(python3-uno 미설치) 작업마다 `soffice --convert-to` 프로세스를 하나씩 실행
+  (이 경우에도 슬롯별 프로필과 제한 시간은 그대로 적용)
+
+환경 변수
+    LO_POOL_SIZE: 리스너 수 (기본: 2)
+    LO_MAX_JOBS: 리스너 재시작 전까지 처리할 변환 수 (기본: 50)
+    LO_JOB_TIMEOUT: 변환당 제한 시간(초) (기본: 120)
+    LO_START_TIMEOUT: 리스너가 연결을 받을 때까지 기다리는 시간(초) (기본: 60)
+    LO_PROFILE_DIR: 리스너 프로필을 둘 상위 폴더 (기본: 시스템 임시 폴더)
+"""
+import atexit
+import logging
+import os
+import queue
+import shutil
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+log = logging.getLogger("lo_pool")
+
+# python:3.x-slim 이미지의 파이썬은 시스템 dist-packages를 보지 않으므로, python3-uno 설치 경로를 뒤에 덧붙여 시도
+_UNO_PATHS = ("/usr/lib/python3/dist-packages", "/usr/lib/libreoffice/program")
+
+try:
+    import uno
+except ImportError:
+    for _p in _UNO_PATHS:
+        if os.path.isdir(_p) and _p not in sys.path:
+            sys.path.append(_p)
+    try:
+        import uno
+    except ImportError:
+        uno = None
+
+if uno is not None:
+    from com.sun.star.beans import PropertyValue
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        v = int(os.environ.get(key, "0"))
+    except ValueError:
+        v = 0
+    return v if v > 0 else default
+
+
+def find_soffice():
+    return shutil.which("soffice") or shutil.which("libreoffice") or "/usr/bin/soffice"
+
+
+def _soffice_env():
+    env = os.environ.copy()
+    env.setdefault("HOME", "/tmp")  # LO가 사용자 디렉터리를 요구할 때 오류 예방
+    env.setdefault("LANG", "en_US.UTF-8")
+    env.setdefault("SAL_USE_VCL", "svp")
+    env.setdefault("OOO_DISABLE_RECOVERY", "1")
+    return env
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _props(**kwargs):
+    return tuple(PropertyValue(Name=k, Value=v) for k, v in kwargs.items())
+
+
+def _pdf_filter(doc) -> str:
+    if doc.supportsService("com.sun.star.sheet.SpreadsheetDocument"):
+        return "calc_pdf_Export"
+    if doc.supportsService("com.sun.star.presentation.PresentationDocument"):
+        return "impress_pdf_Export"
+    if doc.supportsService("com.sun.star.drawing.DrawingDocument"):
+        return "draw_pdf_Export"
+    return "writer_pdf_Export"
+
+
+def _kill_group(proc):
+    if proc is None or proc.poll() is not None:
+        return
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, AttributeError):
+        proc.kill()
+    try:
+        proc.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        pass
+
+
+class _Listener:
+    """프로필 폴더 하나에 묶인 soffice 프로세스 하나 (풀의 슬롯)"""
+
+    def __init__(self, slot: int, profile_dir: str):
+        self.slot = slot
+        self.profile_dir = profile_dir
+        self.proc = None
+        self.desktop = None
+        self.jobs = 0
+
+    @property
+    def profile_url(self) -> str:
+        return "file://" + os.path.abspath(self.profile_dir)
+
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.poll() is None and self.desktop is not None
+
+    def start(self, start_timeout: float):
+        port = _free_port()
+        cmd = [
+            find_soffice(), "--headless", "--invisible", "--nologo", "--nodefault",
+            "--norestore", "--nolockcheck", "--nofirststartwizard",
+            f"-env:UserInstallation={self.profile_url}",
+            f"--accept=socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext",
+        ]
+        self.proc = subprocess.Popen(cmd, env=_soffice_env(), stdout=subprocess.DEVNULL,
+                                     stderr=subprocess.DEVNULL, start_new_session=True)
+        local = uno.getComponentContext()
+        resolver = local.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local)
+        url = f"uno:socket,host=127.0.0.1,port={port};urp;StarOffice.ComponentContext"
+        deadline = time.monotonic() + start_timeout
+        while True:
+            try:
+                ctx = resolver.resolve(url)
+                self.desktop = ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+                break
+            except Exception:
+                if self.proc.poll() is not None or time.monotonic() > deadline:
+                    self.stop()
+                    raise RuntimeError(f"LibreOffice listener {self.slot} failed to start")
+                time.sleep(0.25)
+        self.jobs = 0
+        log.info("[LO] listener %d ready (pid=%d, port=%d)", self.slot, self.proc.pid, port)
+
+    def stop(self):
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass
+        self.desktop = None
+        if self.proc is not None:
+            try:
+                self.proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                _kill_group(self.proc)
+        self.proc = None
+
+    def reset_profile(self):
+        # 크래시 후에는 프로필이 손상됐을 수 있으므로 새로 만듦
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+        os.makedirs(self.profile_dir, exist_ok=True)
+
+    def convert_uno(self, in_path: str, out_pdf_path: str, filter_name=None):
+        doc = self.desktop.loadComponentFromURL(
+            uno.systemPathToFileUrl(os.path.abspath(in_path)), "_blank", 0,
+            _props(Hidden=True, ReadOnly=True, UpdateDocMode=0),
+        )
+        if doc is None:
+            raise RuntimeError("LibreOffice could not open the document")
+        try:
+            doc.storeToURL(uno.systemPathToFileUrl(os.path.abspath(out_pdf_path)),
+                           _props(FilterName=filter_name or _pdf_filter(doc)))
+        finally:
+            try:
+                doc.close(True)
+            except Exception:
+                doc.dispose()
+
+    def convert_cli(self, in_path: str, out_pdf_path: str, convert_to: str, timeout: float):
+        outdir = tempfile.mkdtemp(prefix="lo_out_", dir=os.path.dirname(os.path.abspath(out_pdf_path)))
+        cmd = [
+            find_soffice(), "--headless", "--invisible", "--nologo", "--nodefault",
+            "--norestore", "--nolockcheck", "--nofirststartwizard",
+            f"-env:UserInstallation={self.profile_url}",
+            "--convert-to", convert_to, "--outdir", outdir, in_path,
+        ]
+        try:
+            self.proc = subprocess.Popen(cmd, env=_soffice_env(), stdout=subprocess.PIPE,
+                                         stderr=subprocess.PIPE, start_new_session=True)
+            try:
+                _, err = self.proc.communicate(timeout=timeout)
+            except subprocess.TimeoutExpired:
+                _kill_group(self.proc)
+                raise TimeoutError(f"LibreOffice conversion timed out after {timeout:.0f}s")
+            if self.proc.returncode != 0:
+                msg = err.decode("utf-8", "ignore").strip()
+                raise RuntimeError(msg or f"LibreOffice conversion failed with return code {self.proc.returncode}")
+            produced = os.path.join(outdir, os.path.splitext(os.path.basename(in_path))[0] + ".pdf")
+            if not os.path.exists(produced):
+                raise RuntimeError(f"PDF not produced: {produced}")
+            os.replace(produced, out_pdf_path)
+        finally:
+            self.proc = None
+            shutil.rmtree(outdir, ignore_errors=True)
+
+
+class LibreOfficePool:
+    def __init__(self, size: int = 2, max_jobs: int = 50, job_timeout: float = 120,
+                 start_timeout: float = 60, profile_root=None):
+        self.size = size
+        self.max_jobs = max_jobs
+        self.job_timeout = job_timeout
+        self.start_timeout = start_timeout
+        self.use_uno = uno is not None
+        self.profile_root = profile_root or tempfile.mkdtemp(prefix="lo_pool_")
+        self._idle = queue.Queue()
+        self._listeners = []
+        for slot in range(size):
+            listener = _Listener(slot, os.path.join(self.profile_root, f"profile_{slot}"))
+            os.makedirs(listener.profile_dir, exist_ok=True)
+            self._listeners.append(listener)
+            self._idle.put(listener)
+        self.completed = 0
+        self.recycled = 0
+
+    def start_async(self):
+        """첫 요청부터 기동 비용이 없도록 모든 리스너를 백그라운드에서 미리 띄움"""
+        if not self.use_uno:
+            log.warning("[LO] python uno module not available; using one soffice process per job")
+            return
+        for _ in range(self.size):
+            try:
+                listener = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._restart_async(listener)
+
+    def _restart_async(self, listener):
+        # 기동이 끝난 뒤에야 idle 큐로 돌려보내므로 요청은 항상 준비된 리스너를 받음
+        def run():
+            try:
+                if not listener.alive():
+                    listener.start(self.start_timeout)
+            except Exception as e:
+                log.warning("[LO] listener %d failed to start: %s", listener.slot, e)
+            finally:
+                self._idle.put(listener)
+
+        threading.Thread(target=run, name=f"lo-start-{listener.slot}", daemon=True).start()
+
+    def _recycle(self, listener, crashed: bool):
+        if crashed:
+            _kill_group(listener.proc)
+            listener.desktop = None
+        listener.stop()
+        if crashed:
+            listener.reset_profile()
+        self.recycled += 1
+
+    def _run_with_timeout(self, listener, in_path, out_pdf_path, filter_name):
+        result = {}
+
+        def target():
+            try:
+                listener.convert_uno(in_path, out_pdf_path, filter_name)
+            except Exception as e:
+                result["error"] = e
+
+        t = threading.Thread(target=target, name=f"lo-job-{listener.slot}", daemon=True)
+        t.start()
+        t.join(self.job_timeout)
+        if t.is_alive():
+            # UNO 호출은 중단할 수 없으므로 프로세스를 죽여 호출을 끊음
+            _kill_group(listener.proc)
+            raise TimeoutError(f"LibreOffice conversion timed out after {self.job_timeout:.0f}s")
+        if "error" in result:
+            raise result["error"]
+
+    def convert(self, in_path: str, out_pdf_path: str, convert_to: str = "pdf"):
+        """
+        유휴 리스너에서 in_path를 PDF(out_pdf_path)로 변환
+
+        convert_to는 `--convert-to` 값("pdf" 또는 "pdf:<필터>")이며, UNO로 변환할 때
+        콜론 뒤 필터가 있으면 그대로 쓰고 없으면 문서 종류에 맞춰 고름
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(out_pdf_path)), exist_ok=True)
+        try:
+            listener = self._idle.get(timeout=self.job_timeout)
+        except queue.Empty:
+            raise TimeoutError("No LibreOffice listener became available")
+        try:
+            if not self.use_uno:
+                try:
+                    listener.convert_cli(in_path, out_pdf_path, convert_to, self.job_timeout)
+                except TimeoutError:
+                    listener.reset_profile()
+                    self.recycled += 1
+                    raise
+                self.completed += 1
+                return
+
+            if not listener.alive():
+                # 기동에 실패했거나 유휴 중에 죽은 리스너
+                if listener.proc is not None:
+                    log.warning("[LO] listener %d died, restarting", listener.slot)
+                    self._recycle(listener, crashed=True)
+                listener.start(self.start_timeout)
+            filter_name = convert_to.split(":", 1)[1] if ":" in convert_to else None
+            started = time.monotonic()
+            try:
+                self._run_with_timeout(listener, in_path, out_pdf_path, filter_name)
+            except Exception:
+                if not (listener.proc and listener.proc.poll() is None):
+                    self._recycle(listener, crashed=True)
+                raise
+            listener.jobs += 1
+            self.completed += 1
+            log.info("[LO] listener %d converted %s in %.2fs", listener.slot,
+                     os.path.basename(in_path), time.monotonic() - started)
+            if listener.jobs >= self.max_jobs:
+                # 장시간 사용 시 메모리 누수를 막기 위해 주기적으로 재시작
+                self._recycle(listener, crashed=False)
+        finally:
+            if self.use_uno and not listener.alive():
+                self._restart_async(listener)
+            else:
+                self._idle.put(listener)
+        if not os.path.exists(out_pdf_path):
+            raise RuntimeError(f"PDF not produced: {out_pdf_path}")
+
+    def stats(self) -> dict:
+        return {
+            "mode": "uno" if self.use_uno else "cli",
+            "size": self.size,
+            "idle": self._idle.qsize(),
+            "ready": sum(1 for x in self._listeners if x.alive()) if self.use_uno else None,
+            "completed": self.completed,
+            "recycled": self.recycled,
+        }
+
+    def shutdown(self):
+        for listener in self._listeners:
+            listener.stop()
+        shutil.rmtree(self.profile_root, ignore_errors=True)
+
+
+def create_pool() -> LibreOfficePool:
+    """환경 변수로 풀을 만들고 리스너 기동 시작"""
+    profile_root = os.environ.get("LO_PROFILE_DIR")
+    if profile_root:
+        os.makedirs(profile_root, exist_ok=True)
+        profile_root = tempfile.mkdtemp(prefix="lo_pool_", dir=profile_root)
+    pool = LibreOfficePool(
+        size=_env_int("LO_POOL_SIZE", 2),
+        max_jobs=_env_int("LO_MAX_JOBS", 50),
+        job_timeout=_env_int("LO_JOB_TIMEOUT", 120),
+        start_timeout=_env_int("LO_START_TIMEOUT", 60),
+        profile_root=profile_root,
+    )
+    pool.start_async()
+    atexit.register(pool.shutdown)
+    return pool
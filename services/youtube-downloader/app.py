@@ -12,6 +12,8 @@ from flask import Flask, render_template, request, jsonify, send_file, Response
 from werkzeug.utils import secure_filename
 from yt_dlp.version import __version__ as YDL_VERSION
 
+from file_serving import send_download
+
 app = Flask(__name__)
 
 # 환경변수 설정
@@ -635,7 +637,7 @@ def debug_cookies_content():
 
 @app.route('/download-file/<filename>')
 def download_file(filename):
-    """다운로드된 파일 전송 - 스트리밍 방식으로 개선"""
+    """다운로드된 파일 전송 - Range/If-Range/ETag 지원 (?inline=1 이면 브라우저에서 바로 재생)"""
     try:
         # .part 요청이 오면 최종 확장자로 매핑 시도
         if filename.endswith('.part'):
@@ -646,33 +648,12 @@ def download_file(filename):
                 filename = cand_mp4
             elif os.path.exists(os.path.join(OUTPUT_FOLDER, cand_mp3)):
                 filename = cand_mp3
-        
-        file_path = os.path.join(OUTPUT_FOLDER, filename)
-        
-        if not os.path.exists(file_path):
+
+        response = send_download(OUTPUT_FOLDER, filename, as_attachment=request.args.get('inline') != '1')
+        if response is None:
             return jsonify({'error': '파일을 찾을 수 없습니다.'}), 404
-        
-        # 스트리밍 방식으로 파일 전송
-        def generate():
-            with open(file_path, 'rb') as f:
-                while True:
-                    data = f.read(8192)  # 8KB씩 읽기
-                    if not data:
-                        break
-                    yield data
-        
-        file_size = os.path.getsize(file_path)
-        
-        return Response(
-            generate(),
-            mimetype='application/octet-stream',
-            headers={
-                'Content-Disposition': f'attachment; filename="{filename}"',
-                'Content-Length': str(file_size),
-                'Content-Type': 'application/octet-stream'
-            }
-        )
-        
+        return response
+
     except Exception as e:
         print(f"파일 전송 중 오류: {e}")
         return jsonify({'error': f'파일 전송 오류: {e}'}), 500
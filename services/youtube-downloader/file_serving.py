@@ -0,0 +1,112 @@
+"""
+결과 파일 다운로드 전송 (Range / If-Range / ETag 지원, 프록시 위임)
+
+기존 download_file은 8KB씩 읽는 파이썬 제너레이터로 파일 전체를 보냈습니다.
+Range를 지원하지 않아 동영상 탐색(seek)이나 이어받기 때마다 파일 전체를 다시 보냈고,
+다운로드 하나가 끝날 때까지 워커 스레드 하나를 붙잡았습니다.
+여기서는
+1. 기본: werkzeug 조건부 응답으로 Range(206) / If-Range / If-None-Match(304) / 잘못된 범위(416)를 처리하고,
+   큰 버퍼(DOWNLOAD_BUFFER_KB)로 읽습니다. 전체 파일 요청은 wsgi.file_wrapper(gunicorn은 sendfile(2))로 넘기고,
+   Range 요청은 seek 가능한 werkzeug FileWrapper로 감싸 범위 시작 위치로 바로 이동합니다.
+   (gunicorn의 file_wrapper는 seek을 지원하지 않아 범위 앞부분을 전부 읽어 버리게 됨)
+2. DOWNLOAD_ACCEL=nginx: 본문 없이 X-Accel-Redirect만 돌려주고 nginx가 파일을 직접 보냅니다.
+   nginx에 internal location이 있어야 합니다. 예)
+       location /protected-downloads/ { internal; alias /app/downloads/; }
+3. DOWNLOAD_ACCEL=sendfile: X-Sendfile 헤더로 Apache(mod_xsendfile)/lighttpd에 위임합니다.
+프록시 위임 시 Range/ETag 처리는 프록시가 맡습니다.
+
+환경 변수
+    DOWNLOAD_ACCEL: "" (기본, 직접 전송) | nginx | sendfile
+    DOWNLOAD_ACCEL_PREFIX: X-Accel-Redirect 경로 접두사 (기본: /protected-downloads/)
+    DOWNLOAD_BUFFER_KB: 직접 전송 시 읽기 버퍼 크기 KB (기본: 1024)
+    DOWNLOAD_MAX_AGE: Cache-Control max-age 초 (기본: 0 → no-cache, ETag로 재검증)
+"""
+import mimetypes
+import os
+import unicodedata
+from urllib.parse import quote
+
+from flask import Response, request
+from werkzeug.exceptions import HTTPException
+from werkzeug.security import safe_join
+from werkzeug.wsgi import FileWrapper, wrap_file
+
+
+def _env_int(key: str, default: int) -> int:
+    try:
+        v = int(os.environ.get(key, "0"))
+    except ValueError:
+        v = 0
+    return v if v > 0 else default
+
+
+DOWNLOAD_ACCEL = os.environ.get("DOWNLOAD_ACCEL", "").strip().lower()
+DOWNLOAD_ACCEL_PREFIX = "/" + os.environ.get("DOWNLOAD_ACCEL_PREFIX", "/protected-downloads/").strip("/") + "/"
+DOWNLOAD_BUFFER_SIZE = _env_int("DOWNLOAD_BUFFER_KB", 1024) * 1024
+DOWNLOAD_MAX_AGE = _env_int("DOWNLOAD_MAX_AGE", 0)
+
+
+def content_disposition(filename: str, as_attachment: bool = True) -> str:
+    """한글 등 비 ASCII 파일명은 ASCII 대체 이름 + filename*(RFC 5987)로 함께 표기"""
+    kind = "attachment" if as_attachment else "inline"
+    try:
+        filename.encode("ascii")
+    except UnicodeEncodeError:
+        fallback = unicodedata.normalize("NFKD", filename).encode("ascii", "ignore").decode("ascii")
+        fallback = fallback.replace('"', "").replace("\\", "") or "download"
+        return f"{kind}; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+    return f'{kind}; filename="{filename}"'
+
+
+def _file_etag(st: os.stat_result) -> str:
+    return f"{st.st_mtime_ns:x}-{st.st_size:x}"
+
+
+def send_download(directory: str, filename: str, as_attachment: bool = True, download_name: str = None):
+    """
+    directory 안의 filename 전송 응답
+    반환: Response (Range 요청이면 206, 캐시 일치면 304, 범위 오류면 416 포함)
+          파일이 없거나 directory 밖을 가리키면 None
+    """
+    path = safe_join(directory, filename)
+    if path is None or not os.path.isfile(path):
+        return None
+
+    st = os.stat(path)
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    headers = {"Content-Disposition": content_disposition(download_name or filename, as_attachment)}
+
+    if DOWNLOAD_ACCEL == "nginx":
+        headers["X-Accel-Redirect"] = DOWNLOAD_ACCEL_PREFIX + quote(filename)
+        return Response(mimetype=mimetype, headers=headers)
+    if DOWNLOAD_ACCEL == "sendfile":
+        headers["X-Sendfile"] = os.path.abspath(path)
+        return Response(mimetype=mimetype, headers=headers)
+
+    f = open(path, "rb")
+    try:
+        if request.range:
+            body = FileWrapper(f, DOWNLOAD_BUFFER_SIZE)
+        else:
+            body = wrap_file(request.environ, f, buffer_size=DOWNLOAD_BUFFER_SIZE)
+        rv = Response(
+            body,
+            mimetype=mimetype,
+            headers=headers,
+            direct_passthrough=True,
+        )
+        rv.content_length = st.st_size
+        rv.last_modified = int(st.st_mtime)
+        rv.set_etag(_file_etag(st))
+        if DOWNLOAD_MAX_AGE:
+            rv.cache_control.max_age = DOWNLOAD_MAX_AGE
+        else:
+            rv.cache_control.no_cache = True
+        return rv.make_conditional(request.environ, accept_ranges=True, complete_length=st.st_size)
+    except HTTPException as e:
+        # 416 Range Not Satisfiable
+        f.close()
+        return e.get_response(request.environ)
+    except Exception:
+        f.close()
+        raise